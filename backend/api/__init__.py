@@ -1,3 +1,4 @@
+from backend.api.admin_stats import router as admin_stats_router
 from backend.api.docx import router as docx_router
 from backend.api.export import router as export_router
 from backend.api.llm import router as llm_router
@@ -15,6 +16,7 @@ from backend.api.token_stats import router as token_stats_router
 from backend.api.xlsx import router as xlsx_router
 
 __all__ = [
+    "admin_stats_router",
     "docx_router",
     "llm_router",
     "layouts_router",
@@ -0,0 +1,89 @@
+"""
+Admin Statistics API
+
+Read-only counters of the process-wide caches, limiters and worker pools.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from backend.services.learning_sink import sink_stats
+from backend.services.llm_deadline import hedge_stats
+from backend.services.llm_http import client_stats
+from backend.services.llm_limiter import limiter_stats
+from backend.services.llm_scheduler import scheduler_stats
+from backend.services.llm_singleflight import coalesce_stats
+from backend.services.ocr_cache import ocr_cache
+from backend.services.ocr_gate import ocr_gate_stats as get_ocr_gate_stats
+from backend.services.ocr_pool import ocr_pool_stats as get_ocr_pool_stats
+from backend.services.ollama_manager import ollama_stats as get_ollama_stats
+from backend.services.translation_cache import cache
+
+router = APIRouter(prefix="/api/admin")
+
+
+@router.get("/cache-stats")
+def cache_stats() -> dict:
+    """Hit/miss/eviction counters of the two-tier translation cache."""
+    return cache.stats()
+
+
+@router.get("/learning-sink-stats")
+def learning_sink_stats() -> list[dict]:
+    """Buffered/written/dropped counters of the learning-event writers."""
+    return sink_stats()
+
+
+@router.get("/llm-concurrency-stats")
+def llm_concurrency_stats() -> list[dict]:
+    """Current adaptive concurrency limit, in-flight calls and backoffs per model."""
+    return limiter_stats()
+
+
+@router.get("/llm-scheduler-stats")
+def llm_scheduler_stats() -> list[dict]:
+    """Queue depth, in-flight chunks and wait times per model."""
+    return scheduler_stats()
+
+
+@router.get("/llm-coalesce-stats")
+def llm_coalesce_stats() -> dict:
+    """Chunk requests led, coalesced onto an identical one, and in flight."""
+    return coalesce_stats()
+
+
+@router.get("/llm-latency-stats")
+def llm_latency_stats() -> list[dict]:
+    """Chunk latency percentiles and hedged requests per model."""
+    return hedge_stats()
+
+
+@router.get("/ollama-stats")
+def ollama_stats() -> list[dict]:
+    """Per-endpoint load, resident model and model switches of Ollama backends."""
+    return get_ollama_stats()
+
+
+@router.get("/llm-http-stats")
+def llm_http_stats() -> dict:
+    """Pooled LLM HTTP clients currently open."""
+    return client_stats()
+
+
+@router.get("/ocr-cache-stats")
+def ocr_cache_stats() -> dict:
+    """Size and hit/miss counters of the content-addressed OCR cache."""
+    return ocr_cache.stats()
+
+
+@router.get("/ocr-gate-stats")
+def ocr_gate_stats() -> dict:
+    """Images the pre-OCR text-presence check skipped and the time saved."""
+    return get_ocr_gate_stats()
+
+
+@router.get("/ocr-pool-stats")
+def ocr_pool_stats() -> dict:
+    """Image OCR pool size, limits and job counters."""
+    return get_ocr_pool_stats()
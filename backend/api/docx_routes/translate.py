@@ -9,6 +9,7 @@ from backend.api.pptx_translate import TranslateRequest
 from backend.contracts import coerce_blocks
 from backend.services.correction_mode import apply_correction_mode, prepare_blocks_for_correction
 from backend.services.language_detect import resolve_source_language
+from backend.services.llm_deadline import Deadline
 from backend.services.translate_llm import translate_blocks_async
 
 router = APIRouter()
@@ -38,6 +39,7 @@ async def docx_translate_stream(
     scope_id = request.scope_id
     domain = request.domain
     category = request.category
+    deadline = Deadline.after(request.deadline_seconds)
 
     try:
         if isinstance(blocks, str):
@@ -120,6 +122,7 @@ async def docx_translate_stream(
                     category=category,
                     param_overrides=param_overrides,
                     on_progress=progress_cb,
+                    deadline=deadline,
                 )
             )
 
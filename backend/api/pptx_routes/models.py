@@ -26,3 +26,4 @@ class TranslateRequest(BaseModel):
     domain: str | None = None
     category: str | None = None
     layout_params: str | dict | None = None
+    deadline_seconds: float | None = None  # whole job; LLM_JOB_DEADLINE when unset
@@ -10,6 +10,7 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
 from backend.services.correction_mode import apply_correction_mode
+from backend.services.llm_deadline import Deadline
 from backend.services.translate_llm import (
     translate_blocks_async as translate_pptx_blocks_async,
 )
@@ -55,6 +56,8 @@ async def pptx_translate_stream(  # noqa: C901
     domain = request.domain
     category = request.category
     layout_params = request.layout_params
+    # Started on arrival, so parsing and queueing count against the budget.
+    deadline = Deadline.after(request.deadline_seconds)
 
     # Parse layout_params if it's a string
     parsed_params = {}
@@ -149,6 +152,7 @@ async def pptx_translate_stream(  # noqa: C901
                     param_overrides={**param_overrides, "refresh": refresh},
                     on_progress=progress_cb,
                     mode=mode,
+                    deadline=deadline,
                 )
             )
 
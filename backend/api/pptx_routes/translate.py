@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 
 from backend.config import settings
 from backend.services.correction_mode import apply_correction_mode
+from backend.services.llm_deadline import Deadline
 from backend.services.llm_errors import (
     build_connection_refused_message,
     is_connection_refused,
@@ -51,6 +52,7 @@ async def pptx_translate(
     scope_id = request.scope_id
     domain = request.domain
     category = request.category
+    deadline = Deadline.after(request.deadline_seconds)
 
     blocks_data = _parse_blocks(blocks, "translate")
 
@@ -84,6 +86,7 @@ async def pptx_translate(
             domain=domain,
             category=category,
             param_overrides={**param_overrides, "refresh": refresh},
+            deadline=deadline,
         )
     except Exception as exc:
         if provider == "ollama" and is_connection_refused(exc):
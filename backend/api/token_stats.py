@@ -11,6 +11,7 @@ from fastapi import APIRouter
 from backend.services.token_tracker import (
     estimate_tokens,
     get_all_time_stats,
+    get_compaction_stats,
     get_session_stats,
     record_usage,
 )
@@ -21,7 +22,11 @@ router = APIRouter(prefix="/api/token-stats")
 @router.get("")
 async def get_token_stats() -> dict:
     """Get token usage statistics."""
-    return {"session": get_session_stats(), "all_time": get_all_time_stats()}
+    return {
+        "session": get_session_stats(),
+        "all_time": get_all_time_stats(),
+        "prompt_compaction": get_compaction_stats(),
+    }
 
 
 @router.post("/record")
@@ -19,12 +19,23 @@ class Settings(BaseSettings):
     ollama_num_ctx: int | None = None
     ollama_num_thread: int | None = None
     ollama_force_gpu: bool = False
+    ollama_endpoints: str | None = None  # comma-separated base URLs; defaults to ollama_base_url
+    ollama_endpoint_max_in_flight: int = 4  # requests per endpoint (match OLLAMA_NUM_PARALLEL)
+    ollama_endpoint_retry: float = 30.0  # seconds an unreachable endpoint is skipped
+    ollama_keep_alive: str = "10m"  # sent with every request ("30m", seconds, or -1)
+    ollama_pin_model: bool = True  # keep ollama_model loaded with ollama_pinned_keep_alive
+    ollama_pinned_keep_alive: str = "-1"
+    ollama_model_exclusive: bool = True  # one model at a time per endpoint (no swapping)
+    ollama_model_batch: int = 8  # admissions before yielding the endpoint to another model
+    ollama_preload_model: bool = False  # load ollama_model on startup
 
     # Gemini Configuration
     gemini_api_key: str | None = None
     gemini_model: str = "gemini-1.5-flash"
     gemini_base_url: str = "https://generativelanguage.googleapis.com/v1beta"
     gemini_timeout: int = 180
+    gemini_context_cache: bool = False  # cache the prompt prefix as Gemini cachedContents
+    gemini_context_cache_ttl: int = 600  # seconds a cached prefix lives
 
     # OpenAI Configuration
     openai_api_key: str | None = None
@@ -35,6 +46,9 @@ class Settings(BaseSettings):
     # Translation Settings
     source_language: str = "auto"
     llm_context_strategy: str = "none"
+    llm_compact_prompt: bool = True  # send {id, text} blocks and only matching terms
+    llm_stream_responses: bool = True  # stream completions and push blocks as they finish
+    llm_context_token_budget: int = 1500  # estimated tokens of context per chunk, 0 for unbounded
     llm_glossary_path: str | None = None
     llm_fallback_on_error: bool = False
 
@@ -43,13 +57,49 @@ class Settings(BaseSettings):
 
     # Performance / Rate Limiting
     llm_single_request: bool = False
-    llm_chunk_size: int = 10
+    llm_chunk_size: int = 10  # fixed chunk size when the token planner is off
+    llm_chunk_planner: bool = True  # pack chunks by estimated tokens (chunk_planner)
+    llm_chunk_max_blocks: int = 40  # block cap per planned chunk
+    llm_chunk_prompt_tokens: int = 0  # 0 for the per-model default
+    llm_chunk_completion_tokens: int = 0  # 0 for the per-model default
     llm_max_retries: int = 2
     llm_retry_backoff: float = 0.8
     llm_retry_max_backoff: float = 8.0
     llm_chunk_delay: float = 0.0
-    llm_max_concurrency: int = 0  # 0 for auto
+    llm_max_concurrency: int = 0  # 0 for auto; caps the adaptive limit, or fixes it when off
+    llm_adaptive_concurrency: bool = True  # AIMD limit per provider/model, shared by all jobs
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 16
+    llm_latency_tolerance: float = 1.5  # grow only while latency/block <= best seen x this
+    llm_scheduler_quantum: int = 10  # blocks of credit per job per round-robin turn
     llm_request_timeout: int = 180
+    llm_coalesce_requests: bool = True  # identical in-flight chunks share one LLM call
+    llm_job_deadline: int = 0  # seconds for a whole translate job, 0 for none
+    llm_chunk_requeues: int = 1  # times a timed-out chunk is re-queued before giving up
+    llm_hedge_requests: bool = False  # duplicate chunks still running after the p95 latency
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_samples: int = 20  # chunk latencies needed before hedging starts
+    llm_hedge_provider: str | None = None  # hedge on this provider instead of a duplicate
+    llm_hedge_model: str | None = None
+
+    # Shared LLM HTTP connection pools
+    llm_http_max_connections: int = 20  # per (provider, base_url)
+    llm_http_max_keepalive: int = 10
+    llm_http_keepalive_expiry: float = 30.0  # seconds
+    llm_http2: bool = True  # used for HTTPS providers when the h2 package is installed
+
+    # Translation Cache
+    translation_cache_memory_items: int = 4096
+    translation_cache_max_rows: int = 200_000  # 0 for unbounded
+    translation_cache_max_bytes: int = 256 * 1024 * 1024  # 0 for unbounded
+    translation_cache_ttl_days: int = 90  # 0 to disable TTL eviction
+    translation_cache_evict_interval: int = 500  # rows written between eviction passes
+
+    # Learning events / TM hit counts (buffered background writer)
+    learning_sink_max_pending: int = 10_000
+    learning_sink_batch_size: int = 200
+    learning_sink_flush_interval: float = 2.0  # seconds
+    learning_sink_block_on_full: bool = False  # drop (and count) events when full
 
     model_config = SettingsConfigDict(
         env_file=".env",
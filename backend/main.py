@@ -24,6 +24,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from backend.api import (
+    admin_stats_router,
     docx_router,
     export_router,
     layouts_router,
@@ -59,6 +60,14 @@ async def lifespan(app: FastAPI):
     cleanup_task = asyncio.create_task(cleanup_exports_task())
     stats_task = asyncio.create_task(learning_stats_task())
     tasks = [cleanup_task, stats_task]
+    from backend.config import settings
+
+    if settings.ollama_preload_model:
+        from backend.services.ollama_manager import get_ollama_manager
+
+        tasks.append(
+            asyncio.create_task(get_ollama_manager().preload(settings.ollama_model))
+        )
 
     try:
         yield
@@ -66,6 +75,15 @@ async def lifespan(app: FastAPI):
         for task in tasks:
             task.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
+        from backend.services.learning_sink import drain_all
+
+        await asyncio.to_thread(drain_all)
+        from backend.services.llm_http import aclose_all
+
+        await aclose_all()
+        from backend.services.ocr_pool import reset_ocr_pool
+
+        await asyncio.to_thread(reset_ocr_pool)
 
 
 app = FastAPI(lifespan=lifespan)
@@ -93,6 +111,7 @@ app.include_router(pdf_router)
 app.include_router(ocr_settings_router)
 app.include_router(style_router)
 app.include_router(export_router)
+app.include_router(admin_stats_router)
 
 # Mount thumbnails as static files
 # Use absolute path to ensure correct resolution in Docker
@@ -141,6 +160,11 @@ async def reset_cache():
     except Exception:
         pass
 
+    # 5. Clean OCR result cache
+    from backend.services.ocr_cache import ocr_cache
+
+    ocr_cache.clear()
+
     return {"status": "success", "deleted_files": count}
 
 
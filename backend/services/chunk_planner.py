@@ -0,0 +1,155 @@
+"""Token-budget chunk planning for LLM translation.
+
+A fixed block count per chunk sends ten table cells and ten 800-character
+note blocks the same way: the first wastes round trips, the second can blow
+the model's context or output limit. :func:`plan_chunks` instead packs the
+pending blocks, in document order, against a per-model prompt and completion
+token budget (estimated with :func:`token_tracker.estimate_tokens`). Blocks
+of the same slide are kept together whenever the slide fits, so neighbouring
+text shares a chunk.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from backend.config import settings
+from backend.services.token_tracker import estimate_tokens
+
+Chunk = list[tuple[int, dict]]
+
+# Budgets (prompt, completion) for the blocks of one chunk, leaving room for
+# the system prompt, instructions, terms and context. Matched by substring
+# like token_tracker.COST_PER_MILLION_TOKENS; the first match wins.
+MODEL_TOKEN_BUDGETS = {
+    "gpt-4o": (16_000, 12_000),
+    "gpt-4-turbo": (16_000, 3_000),
+    "gpt-4": (4_000, 3_000),
+    "gpt-3.5": (6_000, 3_000),
+    "gemini-1.5-pro": (32_000, 6_000),
+    "gemini": (24_000, 6_000),
+    "default": (6_000, 3_000),
+}
+# Ollama's default context window; prompt and completion share it.
+OLLAMA_DEFAULT_CTX = 4096
+
+# JSON framing per block ({"id": n, "text": ...}) on each side.
+BLOCK_OVERHEAD_TOKENS = 12
+# Translations are usually longer than their source in tokens (CJK, VI).
+COMPLETION_RATIO = 1.3
+
+
+def token_budget(provider: str, model: str | None) -> tuple[int, int]:
+    """Return the (prompt, completion) token budget for one chunk's blocks."""
+    if provider == "ollama":
+        num_ctx = settings.ollama_num_ctx or OLLAMA_DEFAULT_CTX
+        prompt, completion = int(num_ctx * 0.4), int(num_ctx * 0.4)
+    else:
+        model_key = (model or "").lower()
+        for key, budget in MODEL_TOKEN_BUDGETS.items():
+            if key in model_key:
+                prompt, completion = budget
+                break
+        else:
+            prompt, completion = MODEL_TOKEN_BUDGETS["default"]
+    return (
+        settings.llm_chunk_prompt_tokens or prompt,
+        settings.llm_chunk_completion_tokens or completion,
+    )
+
+
+def _slide_groups(pending: Iterable[tuple[int, dict]]) -> list[Chunk]:
+    """Split pending blocks into runs sharing a slide_index."""
+    groups: list[Chunk] = []
+    last_slide = object()
+    for item in pending:
+        slide = item[1].get("slide_index")
+        if groups and slide is not None and slide == last_slide:
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+        last_slide = slide
+    return groups
+
+
+class _Packer:
+    def __init__(self, prompt_budget: int, completion_budget: int, max_blocks: int, provider: str):
+        self.prompt_budget = prompt_budget
+        self.completion_budget = completion_budget
+        self.max_blocks = max_blocks
+        self.provider = provider
+        self.chunks: list[Chunk] = []
+        self.current: Chunk = []
+        self.prompt = 0
+        self.completion = 0
+
+    def cost(self, item: tuple[int, dict]) -> tuple[int, int]:
+        tokens = estimate_tokens(item[1].get("source_text") or "", self.provider)
+        return (
+            tokens + BLOCK_OVERHEAD_TOKENS,
+            int(tokens * COMPLETION_RATIO) + BLOCK_OVERHEAD_TOKENS,
+        )
+
+    def fits(self, count: int, prompt: int, completion: int) -> bool:
+        return (
+            len(self.current) + count <= self.max_blocks
+            and self.prompt + prompt <= self.prompt_budget
+            and self.completion + completion <= self.completion_budget
+        )
+
+    def close(self) -> None:
+        if self.current:
+            self.chunks.append(self.current)
+        self.current = []
+        self.prompt = 0
+        self.completion = 0
+
+    def add(self, item: tuple[int, dict], prompt: int, completion: int) -> None:
+        # An oversized block still goes out, alone in its chunk.
+        if self.current and not self.fits(1, prompt, completion):
+            self.close()
+        self.current.append(item)
+        self.prompt += prompt
+        self.completion += completion
+
+    def add_group(self, group: Chunk) -> None:
+        costs = [self.cost(item) for item in group]
+        prompt = sum(c[0] for c in costs)
+        completion = sum(c[1] for c in costs)
+        if not self.fits(len(group), prompt, completion):
+            whole = len(group) <= self.max_blocks
+            whole = whole and prompt <= self.prompt_budget
+            whole = whole and completion <= self.completion_budget
+            if whole:
+                # Start the slide in a fresh chunk rather than splitting it.
+                self.close()
+        for item, (item_prompt, item_completion) in zip(group, costs, strict=True):
+            self.add(item, item_prompt, item_completion)
+
+
+def plan_chunks(
+    pending: list[tuple[int, dict]],
+    params: dict[str, Any],
+    provider: str,
+    model: str | None = None,
+) -> list[Chunk]:
+    """Pack pending blocks into variable-size chunks by estimated tokens.
+
+    ``params["max_blocks"]`` caps the blocks per chunk (an explicit
+    ``chunk_size`` override, or ``llm_chunk_max_blocks``); with
+    ``single_request`` only the token budget applies.
+    """
+    if not pending:
+        return []
+    prompt_budget, completion_budget = token_budget(provider, model)
+    context_budget = params.get("context_token_budget") or 0
+    if params.get("context_strategy", "none") != "none" and context_budget:
+        # Context blocks ride along with every chunk.
+        prompt_budget = max(prompt_budget - context_budget, prompt_budget // 4)
+    max_blocks = len(pending) if params.get("single_request") else params["max_blocks"]
+    packer = _Packer(prompt_budget, completion_budget, max(1, max_blocks), provider)
+    for group in _slide_groups(pending):
+        packer.add_group(group)
+    packer.close()
+    return packer.chunks
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from io import BytesIO
-import zipfile
 
 from docx import Document
 
@@ -13,9 +12,30 @@ from backend.services.extract_utils import (
     is_technical_terms_only,
     sanitize_extracted_text,
 )
-from backend.services.image_ocr import extract_image_text_blocks
 from backend.services.language_detect import detect_document_languages
 from backend.services.ocr_lang import resolve_ocr_lang_from_doc_lang
+from backend.services.ocr_pool import media_ocr_jobs, run_ocr_jobs
+
+
+def _inline_image_jobs(doc) -> list[dict]:
+    jobs = []
+    for idx, shape in enumerate(doc.inline_shapes):
+        try:
+            r_id = shape._inline.graphic.graphicData.pic.blipFill.blip.embed  # noqa: SLF001
+            part = doc.part.related_parts.get(r_id)
+            if not part:
+                continue
+            jobs.append(
+                {
+                    "image_bytes": part.blob,
+                    "slide_index": -1,
+                    "shape_id": f"docx-image-{idx}",
+                    "image_part": str(part.partname),
+                }
+            )
+        except Exception:
+            continue
+    return jobs
 
 
 def extract_blocks(docx_path: str | bytes, preferred_lang: str | None = None) -> dict:
@@ -74,52 +94,14 @@ def extract_blocks(docx_path: str | bytes, preferred_lang: str | None = None) ->
     doc_lang = preferred_lang or (detect_document_languages(blocks).get("primary") if blocks else None)
     ocr_lang = resolve_ocr_lang_from_doc_lang(doc_lang)
 
-    # 3. Extract Images (inline shapes)
-    for idx, shape in enumerate(doc.inline_shapes):
-        try:
-            r_id = shape._inline.graphic.graphicData.pic.blipFill.blip.embed  # noqa: SLF001
-            part = doc.part.related_parts.get(r_id)
-            if not part:
-                continue
-            image_part = str(part.partname)
-            image_bytes = part.blob
-            blocks.extend(
-                extract_image_text_blocks(
-                    image_bytes,
-                    slide_index=-1,
-                    shape_id=f"docx-image-{idx}",
-                    image_part=image_part,
-                    source="docx",
-                    ocr_lang=ocr_lang,
-                )
-            )
-        except Exception:
-            continue
-
-    # 4. Fallback: scan media parts directly
-    try:
-        if isinstance(docx_path, (str, bytes)):
-            docx_fs_path = docx_path if isinstance(docx_path, str) else None
-            if docx_fs_path:
-                with zipfile.ZipFile(docx_fs_path, "r") as zf:
-                    media_files = [n for n in zf.namelist() if n.startswith("word/media/")]
-                    for idx, name in enumerate(media_files):
-                        try:
-                            image_bytes = zf.read(name)
-                        except Exception:
-                            continue
-                        blocks.extend(
-                            extract_image_text_blocks(
-                                image_bytes,
-                                slide_index=-1,
-                                shape_id=f"docx-media-{idx}",
-                                image_part=name,
-                                source="docx",
-                                ocr_lang=ocr_lang,
-                            )
-                        )
-    except Exception:
-        pass
+    # 3. Extract Images (inline shapes), then media parts they do not cover
+    ocr_jobs = _inline_image_jobs(doc)
+    if isinstance(docx_path, str):
+        processed = {job["image_part"].lstrip("/") for job in ocr_jobs}
+        ocr_jobs += media_ocr_jobs(docx_path, "word/media/", "docx-media", processed)
+    ocr_jobs = [{**job, "source": "docx", "ocr_lang": ocr_lang} for job in ocr_jobs]
+    for image_blocks in run_ocr_jobs(ocr_jobs):
+        blocks.extend(image_blocks)
 
     return {
         "blocks": blocks,
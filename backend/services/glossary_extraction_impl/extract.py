@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import os
 
+from backend.config import settings
 from backend.services.llm_clients import (
     GeminiTranslator,
     MockTranslator,
@@ -57,9 +58,10 @@ def extract_glossary_terms(  # noqa: C901
                 model=model or os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
             )
         elif resolved_provider == "ollama":
+            # Same default model as translation, so Ollama does not swap models.
             client = OllamaTranslator(
-                model=model or os.getenv("OLLAMA_MODEL", "llama3.1"),
-                base_url=base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+                model=model or settings.ollama_model,
+                base_url=base_url or settings.ollama_base_url,
             )
         else:
             client = MockTranslator()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import logging
+import time
 from io import BytesIO
 
 from PIL import Image
@@ -20,6 +21,8 @@ from backend.services.extract_utils import (
     is_technical_terms_only,
     sanitize_extracted_text,
 )
+from backend.services.ocr_cache import image_digest, ocr_cache, pil_digest
+from backend.services.ocr_gate import record_ocr, should_ocr
 from backend.services.ocr_lang import map_source_lang_to_tesseract
 
 LOGGER = logging.getLogger(__name__)
@@ -128,11 +131,18 @@ def _group_tesseract_lines(ocr_data: dict) -> list[dict]:
     return results
 
 
-def _ocr_pil_image(image: Image.Image, lang: str, cfg: dict) -> list[dict]:
-    engine = _resolve_engine(cfg)
+def _ocr_pil_image(
+    image: Image.Image, lang: str, cfg: dict, engine: str | None = None
+) -> tuple[list[dict], str]:
+    """OCR lines of ``image`` and the engine that produced them.
+
+    The engine differs from the requested one when PaddleOCR failed and
+    Tesseract stood in.
+    """
+    engine = engine or _resolve_engine(cfg)
     if engine == "paddle":
         try:
-            return [
+            lines = [
                 {
                     "text": line.get("text", ""),
                     "left": int(line.get("x0", 0)),
@@ -144,6 +154,7 @@ def _ocr_pil_image(image: Image.Image, lang: str, cfg: dict) -> list[dict]:
                 for line in paddle_ocr_image(image, lang)
                 if line.get("text")
             ]
+            return lines, engine
         except Exception as exc:
             LOGGER.warning("PaddleOCR failed, falling back to tesseract: %s", exc)
             engine = "tesseract"
@@ -169,6 +180,22 @@ def _ocr_pil_image(image: Image.Image, lang: str, cfg: dict) -> list[dict]:
                 "engine": "tesseract",
             }
         )
+    return lines, "tesseract"
+
+
+def _ocr_cached(image: Image.Image, digest: str, lang: str, cfg: dict) -> list[dict]:
+    if not should_ocr(image):
+        return []
+    engine = _resolve_engine(cfg)
+    key = ocr_cache.make_key(digest, engine, lang, cfg)
+    lines = ocr_cache.get(key)
+    if lines is None:
+        started = time.perf_counter()
+        lines, used_engine = _ocr_pil_image(image, lang, cfg, engine)
+        record_ocr(image, time.perf_counter() - started)
+        # A fallback result (even an empty one) does not belong under this key.
+        if used_engine == engine:
+            ocr_cache.set(key, lines, engine, lang)
     return lines
 
 
@@ -198,7 +225,7 @@ def extract_image_text_blocks(
     lang = ocr_lang or _get_image_ocr_lang()
     cfg = get_ocr_config()
     blocks: list[dict] = []
-    for line in _ocr_pil_image(image, lang, cfg):
+    for line in _ocr_cached(image, image_digest(image_bytes), lang, cfg):
         text = sanitize_extracted_text(line.get("text"))
         if (
             not text
@@ -260,7 +287,7 @@ def extract_image_text_blocks_from_pil(
     scale_x = page_width / float(width) if width else 1.0
     scale_y = page_height / float(height) if height else 1.0
 
-    for idx, line in enumerate(_ocr_pil_image(image, lang, cfg)):
+    for idx, line in enumerate(_ocr_cached(image, pil_digest(image), lang, cfg)):
         text = sanitize_extracted_text(line.get("text"))
         if (
             not text
@@ -0,0 +1,207 @@
+"""Buffered background writer for learning events and TM hit counts.
+
+Lookups and ingest run on the translation hot path, so instead of opening a
+connection and committing one row per event they hand events to a
+:class:`LearningEventSink`. The sink keeps a bounded in-memory buffer, coalesces
+hit counts per entry (N hits on entry X become one ``hit_count + N``), and a
+daemon thread flushes everything with one batched write per table when the
+buffer reaches ``batch_size`` or ``flush_interval`` seconds pass.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from backend.config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+_SINKS: list[LearningEventSink] = []
+_SINKS_LOCK = threading.Lock()
+
+
+class LearningEventSink:
+    def __init__(
+        self,
+        name: str,
+        events_writer: Callable[[list[dict]], None],
+        hits_writer: Callable[[dict[int, int]], None],
+        max_pending: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        block_on_full: bool | None = None,
+    ):
+        self.name = name
+        self._events_writer = events_writer
+        self._hits_writer = hits_writer
+        self.max_pending = max_pending or settings.learning_sink_max_pending
+        self.batch_size = batch_size or settings.learning_sink_batch_size
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.learning_sink_flush_interval
+        )
+        self.block_on_full = (
+            block_on_full if block_on_full is not None else settings.learning_sink_block_on_full
+        )
+        self._events: list[dict] = []
+        self._hits: Counter[int] = Counter()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._stats = {
+            "events_written": 0,
+            "hits_written": 0,
+            "dropped": 0,
+            "blocked": 0,
+            "flushes": 0,
+            "write_errors": 0,
+            "last_flush_ms": 0.0,
+        }
+        with _SINKS_LOCK:
+            _SINKS.append(self)
+
+    def _pending(self) -> int:
+        return len(self._events) + len(self._hits)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"learning-sink-{self.name}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _admit(self) -> bool:
+        """Wait for room in the buffer (caller holds ``_cond``)."""
+        if self._pending() < self.max_pending:
+            return True
+        if self.block_on_full:
+            self._stats["blocked"] += 1
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: self._pending() < self.max_pending,
+                timeout=max(self.flush_interval, 1.0),
+            )
+            if self._pending() < self.max_pending:
+                return True
+        self._stats["dropped"] += 1
+        return False
+
+    def emit(self, event_type: str, **fields) -> None:
+        """Queue one learning event; fields match ``_record_learning_event``."""
+        with self._cond:
+            self._ensure_worker()
+            if not self._admit():
+                return
+            self._events.append({"event_type": event_type, **fields})
+            if len(self._events) >= self.batch_size:
+                self._cond.notify_all()
+
+    def emit_many(self, events: list[dict]) -> None:
+        for event in events:
+            self.emit(**event)
+
+    def add_hit(self, entry_id: int | None, count: int = 1) -> None:
+        if not entry_id:
+            return
+        with self._cond:
+            self._ensure_worker()
+            if entry_id not in self._hits and not self._admit():
+                return
+            self._hits[entry_id] += count
+
+    def add_hits(self, entry_ids: list[int | None]) -> None:
+        for entry_id in entry_ids:
+            self.add_hit(entry_id)
+
+    def flush(self) -> None:
+        """Write everything buffered so far on the calling thread."""
+        with self._flush_lock:
+            with self._cond:
+                events, self._events = self._events, []
+                hits, self._hits = self._hits, Counter()
+                self._cond.notify_all()
+            if not events and not hits:
+                return
+            started = time.perf_counter()
+            # Write each table on its own so one failure does not drop the other.
+            if hits and self._write("hits", self._hits_writer, dict(hits)):
+                self._stats["hits_written"] += sum(hits.values())
+            if events and self._write("events", self._events_writer, events):
+                self._stats["events_written"] += len(events)
+            self._stats["flushes"] += 1
+            self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _write(self, kind: str, writer: Callable, batch) -> bool:
+        try:
+            writer(batch)
+        except Exception:
+            LOGGER.exception("Learning sink %s flush of %s failed", self.name, kind)
+            self._stats["write_errors"] += 1
+            return False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or self._pending() >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def drain(self, timeout: float = 5.0) -> None:
+        """Stop the worker thread and flush whatever is left."""
+        thread = self._thread
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending_events = len(self._events)
+            pending_hits = len(self._hits)
+        return {
+            "name": self.name,
+            **self._stats,
+            "pending_events": pending_events,
+            "pending_hits": pending_hits,
+            "max_pending": self.max_pending,
+        }
+
+
+def drain_all(timeout: float = 5.0) -> None:
+    """Flush every sink; called from the FastAPI lifespan and at exit."""
+    with _SINKS_LOCK:
+        sinks = list(_SINKS)
+    for sink in sinks:
+        sink.drain(timeout)
+
+
+def flush_all() -> None:
+    with _SINKS_LOCK:
+        sinks = list(_SINKS)
+    for sink in sinks:
+        sink.flush()
+
+
+def sink_stats() -> list[dict]:
+    with _SINKS_LOCK:
+        return [sink.stats() for sink in _SINKS]
+
+
+atexit.register(drain_all)
@@ -6,24 +6,71 @@ error handling for Gemini's REST API.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import threading
+import time
 from collections.abc import Iterable
 
 import httpx
 
 from backend.config import settings
 from backend.services.llm_client_base import load_contract_example
-from backend.services.llm_contract import validate_contract
-from backend.services.llm_prompt import build_prompt
+from backend.services.llm_contract import expand_compact_contract, validate_contract
+from backend.services.llm_http import get_async_client, get_client
+from backend.services.llm_prompt import build_prompt_parts
+from backend.services.llm_singleflight import SingleFlight
+from backend.services.llm_stream import DeltaCallback, iter_sse_data, raise_for_stream_status
 from backend.services.llm_utils import safe_json_loads
+from backend.services.prompt_store import get_prompt
+from backend.services.token_tracker import record_usage
 
 LOGGER = logging.getLogger(__name__)
 
+# Explicit cached contents by (base_url, model, prefix hash): the resource
+# name, or None when the prefix could not be cached (e.g. it is below the
+# model's minimum size), and when the entry expires.
+_CONTENT_CACHES: dict[tuple[str, str, str], tuple[str | None, float]] = {}
+_CONTENT_CACHE_LOCK = threading.Lock()
+# Concurrent chunks of one job create the cached content once.
+_content_flights = SingleFlight()
+
+
+def _lookup_content(key: tuple[str, str, str]) -> tuple[bool, str | None]:
+    with _CONTENT_CACHE_LOCK:
+        entry = _CONTENT_CACHES.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            _CONTENT_CACHES.pop(key, None)
+            return False, None
+        return True, entry[0]
+
+
+def _remember_content(key: tuple[str, str, str], name: str | None) -> str | None:
+    ttl = settings.gemini_context_cache_ttl
+    # Stop using a cached content a little before Gemini expires it.
+    lifetime = max(ttl - 30, ttl / 2)
+    with _CONTENT_CACHE_LOCK:
+        _CONTENT_CACHES[key] = (name, time.monotonic() + lifetime)
+    return name
+
+
+def _forget_content(key: tuple[str, str, str]) -> None:
+    with _CONTENT_CACHE_LOCK:
+        _CONTENT_CACHES.pop(key, None)
+
+
+def reset_content_caches() -> None:
+    """Forget every cached content name (tests and settings reloads)."""
+    with _CONTENT_CACHE_LOCK:
+        _CONTENT_CACHES.clear()
+
 
 class GeminiTranslator:
     """Translator using Google Gemini's REST API."""
 
+    supports_streaming = True
+
     def __init__(self, api_key: str, base_url: str, model: str) -> None:
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
@@ -40,28 +87,19 @@ class GeminiTranslator:
         mode: str = "direct",
     ) -> dict:
         """Translate blocks using Gemini API (Synchronous)."""
-        contract_example = load_contract_example()
-        prompt = build_prompt(
+        blocks = list(blocks)
+        prefix, suffix = self._prompt_parts(
             blocks,
             target_language,
-            contract_example,
             context,
             preferred_terms,
             placeholder_tokens,
             language_hint,
-            mode=mode,
+            mode,
         )
-
-        system_message = self._get_system_message()
-        full_prompt = f"{system_message}\n\n[TASK START]\n{prompt}"
-
-        payload = {
-            "contents": [{"role": "user", "parts": [{"text": full_prompt}]}],
-            "generationConfig": {
-                "temperature": 0,
-                "responseMimeType": "application/json",
-            },
-        }
+        cache_key = self._content_key(prefix)
+        cached = self._cached_content(cache_key, prefix)
+        payload = self._build_payload(prefix, suffix, cached)
 
         timeout = settings.gemini_timeout
         url = (
@@ -70,16 +108,18 @@ class GeminiTranslator:
         )
 
         try:
-            with httpx.Client(timeout=timeout) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                response_data = response.json()
+            client = get_client("gemini", self.base_url)
+            response = client.post(url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            response_data = response.json()
         except httpx.HTTPStatusError as exc:
+            if cached:
+                _forget_content(cache_key)
             self._handle_http_error(exc)
         except httpx.RequestError as exc:
             raise ValueError(f"Gemini API 連線錯誤: {exc}") from exc
 
-        return self._process_response(response_data)
+        return self._process_response(response_data, blocks, target_language)
 
     async def translate_async(
         self,
@@ -90,30 +130,26 @@ class GeminiTranslator:
         placeholder_tokens: list[str] | None = None,
         language_hint: str | None = None,
         mode: str = "direct",
+        on_delta: DeltaCallback | None = None,
     ) -> dict:
-        """Translate blocks using Gemini API (Asynchronous)."""
-        contract_example = load_contract_example()
-        prompt = build_prompt(
+        """Translate blocks using Gemini API (Asynchronous).
+
+        With ``on_delta`` the response is streamed (``streamGenerateContent``)
+        and each text delta is passed on as it arrives.
+        """
+        blocks = list(blocks)
+        prefix, suffix = self._prompt_parts(
             blocks,
             target_language,
-            contract_example,
             context,
             preferred_terms,
             placeholder_tokens,
             language_hint,
-            mode=mode,
+            mode,
         )
-
-        system_message = self._get_system_message()
-        full_prompt = f"{system_message}\n\n[TASK START]\n{prompt}"
-
-        payload = {
-            "contents": [{"role": "user", "parts": [{"text": full_prompt}]}],
-            "generationConfig": {
-                "temperature": 0,
-                "responseMimeType": "application/json",
-            },
-        }
+        cache_key = self._content_key(prefix)
+        cached = await self._cached_content_async(cache_key, prefix)
+        payload = self._build_payload(prefix, suffix, cached)
 
         timeout = settings.gemini_timeout
         url = (
@@ -122,19 +158,170 @@ class GeminiTranslator:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(url, json=payload)
+            if on_delta is not None:
+                response_data = await self._stream_generate(payload, on_delta)
+            else:
+                client = get_async_client("gemini", self.base_url)
+                response = await client.post(url, json=payload, timeout=timeout)
                 response.raise_for_status()
                 response_data = response.json()
         except httpx.HTTPStatusError as exc:
+            if cached:
+                _forget_content(cache_key)
             self._handle_http_error(exc)
         except httpx.RequestError as exc:
             raise ValueError(f"Gemini API 連線錯誤: {exc}") from exc
 
-        return self._process_response(response_data)
+        return self._process_response(response_data, blocks, target_language)
+
+    def _prompt_parts(
+        self,
+        blocks: list[dict],
+        target_language: str,
+        context: dict | None,
+        preferred_terms: list[tuple[str, str]] | None,
+        placeholder_tokens: list[str] | None,
+        language_hint: str | None,
+        mode: str,
+    ) -> tuple[str, str]:
+        """(system message + job-wide prompt prefix, per-chunk suffix)."""
+        prefix, suffix = build_prompt_parts(
+            blocks,
+            target_language,
+            load_contract_example(),
+            context,
+            preferred_terms,
+            placeholder_tokens,
+            language_hint,
+            mode=mode,
+            provider="google",
+        )
+        return f"{self._get_system_message()}\n\n[TASK START]\n{prefix}", suffix
+
+    def _build_payload(self, prefix: str, suffix: str, cached: str | None) -> dict:
+        generation_config = {
+            "temperature": 0,
+            "responseMimeType": "application/json",
+        }
+        if cached:
+            # The cached content holds the prefix; only the chunk is sent.
+            return {
+                "cachedContent": cached,
+                "contents": [{"role": "user", "parts": [{"text": suffix}]}],
+                "generationConfig": generation_config,
+            }
+        return {
+            "contents": [{"role": "user", "parts": [{"text": prefix + suffix}]}],
+            "generationConfig": generation_config,
+        }
+
+    # -- explicit context caching ------------------------------------------
+
+    def _content_key(self, prefix: str) -> tuple[str, str, str]:
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        return self.base_url, self.model, digest
+
+    def _content_request(self, prefix: str) -> tuple[str, dict]:
+        url = f"{self.base_url}/cachedContents?key={self.api_key}"
+        body = {
+            "model": f"models/{self.model}",
+            "contents": [{"role": "user", "parts": [{"text": prefix}]}],
+            "ttl": f"{settings.gemini_context_cache_ttl}s",
+        }
+        return url, body
+
+    def _cached_content(self, key: tuple[str, str, str], prefix: str) -> str | None:
+        """Name of the cached content holding ``prefix``, created on first use."""
+        if not settings.gemini_context_cache:
+            return None
+        hit, name = _lookup_content(key)
+        if hit:
+            return name
+
+        def create() -> str | None:
+            hit, name = _lookup_content(key)
+            if hit:
+                return name
+            url, body = self._content_request(prefix)
+            try:
+                client = get_client("gemini", self.base_url)
+                response = client.post(url, json=body, timeout=settings.gemini_timeout)
+                response.raise_for_status()
+                name = response.json().get("name")
+            except httpx.HTTPError as exc:
+                LOGGER.info("Gemini context cache unavailable, sending full prompt: %s", exc)
+                name = None
+            return _remember_content(key, name)
+
+        name, _ = _content_flights.do("|".join(key), create)
+        return name
+
+    async def _cached_content_async(
+        self, key: tuple[str, str, str], prefix: str
+    ) -> str | None:
+        if not settings.gemini_context_cache:
+            return None
+        hit, name = _lookup_content(key)
+        if hit:
+            return name
+
+        async def create() -> str | None:
+            hit, name = _lookup_content(key)
+            if hit:
+                return name
+            url, body = self._content_request(prefix)
+            try:
+                client = get_async_client("gemini", self.base_url)
+                response = await client.post(
+                    url, json=body, timeout=settings.gemini_timeout
+                )
+                response.raise_for_status()
+                name = response.json().get("name")
+            except httpx.HTTPError as exc:
+                LOGGER.info("Gemini context cache unavailable, sending full prompt: %s", exc)
+                name = None
+            return _remember_content(key, name)
+
+        name, _ = await _content_flights.do_async("|".join(key), create)
+        return name
 
-    def _process_response(self, response_data: dict) -> dict:
+    async def _stream_generate(self, payload: dict, on_delta: DeltaCallback) -> dict:
+        """Stream ``streamGenerateContent`` and fold the events into one response."""
+        url = (
+            f"{self.base_url}/models/{self.model}:streamGenerateContent"
+            f"?alt=sse&key={self.api_key}"
+        )
+        parts: list[str] = []
+        merged: dict = {}
+        candidate: dict = {}
+        client = get_async_client("gemini", self.base_url)
+        async with client.stream(
+            "POST", url, json=payload, timeout=settings.gemini_timeout
+        ) as response:
+            await raise_for_stream_status(response)
+            async for event in iter_sse_data(response):
+                if "promptFeedback" in event:
+                    merged["promptFeedback"] = event["promptFeedback"]
+                if "usageMetadata" in event:
+                    merged["usageMetadata"] = event["usageMetadata"]
+                for item in event.get("candidates") or []:
+                    if item.get("finishReason"):
+                        candidate["finishReason"] = item["finishReason"]
+                    for part in (item.get("content") or {}).get("parts") or []:
+                        text = part.get("text")
+                        if text:
+                            parts.append(text)
+                            await on_delta(text)
+        if parts or candidate:
+            candidate["content"] = {"parts": [{"text": "".join(parts)}]}
+            merged["candidates"] = [candidate]
+        return merged
+
+    def _process_response(
+        self, response_data: dict, blocks: list[dict], target_language: str
+    ) -> dict:
         """Extract and validate translation from Gemini response."""
+        self._record_usage(response_data.get("usageMetadata"))
         self._check_prompt_feedback(response_data)
         self._check_candidates(response_data)
 
@@ -148,10 +335,28 @@ class GeminiTranslator:
         if not content:
             raise ValueError("Gemini 回應內容為空。請檢查 API 設定或稍後再試。")
 
-        result = safe_json_loads(content)
+        result = expand_compact_contract(safe_json_loads(content), blocks, target_language)
         validate_contract(result)
         return result
 
+    def _get_system_message(self) -> str:
+        try:
+            return get_prompt("system_message")
+        except FileNotFoundError:
+            return "你是負責翻譯 PPTX 文字區塊的助手。只回傳 JSON，且必須符合既定 schema。"
+
+    def _record_usage(self, usage: dict | None) -> None:
+        if not usage:
+            return
+        record_usage(
+            provider="gemini",
+            model=self.model,
+            prompt_tokens=usage.get("promptTokenCount", 0),
+            completion_tokens=usage.get("candidatesTokenCount", 0),
+            # Implicit (prefix) and explicit context-cache hits.
+            cached_tokens=usage.get("cachedContentTokenCount", 0),
+        )
+
     def _handle_http_error(self, exc: httpx.HTTPStatusError) -> None:
         """Handle HTTP errors from Gemini API."""
         response = exc.response
@@ -227,10 +432,10 @@ class GeminiTranslator:
             f"{self.base_url}/models/{self.model}:generateContent"
             f"?key={self.api_key}"
         )
-        with httpx.Client(timeout=settings.gemini_timeout) as client:
-            response = client.post(url, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
+        client = get_client("gemini", self.base_url)
+        response = client.post(url, json=payload, timeout=settings.gemini_timeout)
+        response.raise_for_status()
+        response_data = response.json()
         parts = (
             response_data.get("candidates", [])[0]
             .get("content", {})
@@ -248,12 +453,10 @@ class GeminiTranslator:
             f"{self.base_url}/models/{self.model}:generateContent"
             f"?key={self.api_key}"
         )
-        async with httpx.AsyncClient(
-            timeout=settings.gemini_timeout
-        ) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
+        client = get_async_client("gemini", self.base_url)
+        response = await client.post(url, json=payload, timeout=settings.gemini_timeout)
+        response.raise_for_status()
+        response_data = response.json()
         parts = (
             response_data.get("candidates", [])[0]
             .get("content", {})
@@ -7,15 +7,18 @@ for interacting with locally running Ollama instances.
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 
 import httpx
 
 from backend.config import settings
 from backend.services.llm_client_base import load_contract_example
-from backend.services.llm_contract import validate_contract
+from backend.services.llm_contract import expand_compact_contract, validate_contract
+from backend.services.llm_http import get_async_client, get_client
 from backend.services.llm_prompt import build_prompt
+from backend.services.llm_stream import DeltaCallback, iter_ndjson, raise_for_stream_status
 from backend.services.llm_utils import safe_json_loads
+from backend.services.ollama_manager import get_ollama_manager
 from backend.services.prompt_store import get_prompt
 from backend.services.token_tracker import record_usage
 
@@ -48,34 +51,40 @@ def build_ollama_options() -> dict:
 class OllamaTranslator:
     """Translator using locally running Ollama instance."""
 
+    supports_streaming = True
+
     def __init__(self, model: str, base_url: str) -> None:
         self.model = model
         self.base_url = base_url.rstrip("/")
         self._async_client: httpx.AsyncClient | None = None
 
-    def set_async_client(self, client: httpx.AsyncClient) -> None:
-        """Set an external async client for connection pooling."""
+    def set_async_client(self, client: httpx.AsyncClient | None) -> None:
+        """Override the shared pooled client (mainly for tests)."""
         self._async_client = client
 
     def _post(self, endpoint: str, payload: dict) -> dict:
         """Make POST request to Ollama API (Synchronous)."""
-        url = f"{self.base_url}{endpoint}"
+        manager = get_ollama_manager(self.base_url)
+        payload = {**payload, "keep_alive": manager.keep_alive(self.model)}
         try:
-            with httpx.Client(timeout=settings.ollama_timeout) as client:
-                response = client.post(url, json=payload)
+            with manager.lease(self.model) as base_url:
+                client = get_client("ollama", base_url)
+                response = client.post(
+                    f"{base_url}{endpoint}", json=payload, timeout=settings.ollama_timeout
+                )
                 response.raise_for_status()
                 data = response.json()
 
-                # Record usage
-                if "prompt_eval_count" in data or "eval_count" in data:
-                    record_usage(
-                        provider="ollama",
-                        model=self.model,
-                        prompt_tokens=data.get("prompt_eval_count", 0),
-                        completion_tokens=data.get("eval_count", 0),
-                    )
+            # Record usage
+            if "prompt_eval_count" in data or "eval_count" in data:
+                record_usage(
+                    provider="ollama",
+                    model=self.model,
+                    prompt_tokens=data.get("prompt_eval_count", 0),
+                    completion_tokens=data.get("eval_count", 0),
+                )
 
-                return data
+            return data
         except httpx.HTTPStatusError as exc:
             raise ValueError(
                 f"Ollama API 錯誤 ({exc.response.status_code}): "
@@ -86,23 +95,16 @@ class OllamaTranslator:
 
     async def _post_async(self, endpoint: str, payload: dict) -> dict:
         """Make POST request to Ollama API (Asynchronous)."""
-        url = f"{self.base_url}{endpoint}"
+        manager = get_ollama_manager(self.base_url)
+        payload = {**payload, "keep_alive": manager.keep_alive(self.model)}
         try:
-            if self._async_client is not None:
-                response = await self._async_client.post(
-                    url,
-                    json=payload,
-                    timeout=settings.ollama_timeout,
+            async with manager.lease_async(self.model) as base_url:
+                client = self._async_client or get_async_client("ollama", base_url)
+                response = await client.post(
+                    f"{base_url}{endpoint}", json=payload, timeout=settings.ollama_timeout
                 )
                 response.raise_for_status()
                 data = response.json()
-            else:
-                async with httpx.AsyncClient(
-                    timeout=settings.ollama_timeout
-                ) as client:
-                    response = await client.post(url, json=payload)
-                    response.raise_for_status()
-                    data = response.json()
 
             # Record usage
             if "prompt_eval_count" in data or "eval_count" in data:
@@ -122,6 +124,54 @@ class OllamaTranslator:
         except httpx.RequestError as exc:
             raise ValueError(f"無法連線至 Ollama ({self.base_url}): {exc}") from exc
 
+    async def _stream_async(
+        self,
+        endpoint: str,
+        payload: dict,
+        on_delta: DeltaCallback,
+        extract: Callable[[dict], str],
+    ) -> str:
+        """POST with ``stream: true``; feed each text delta to ``on_delta``."""
+        manager = get_ollama_manager(self.base_url)
+        payload = {**payload, "stream": True, "keep_alive": manager.keep_alive(self.model)}
+        parts: list[str] = []
+        final: dict = {}
+        try:
+            async with manager.lease_async(self.model) as base_url:
+                client = self._async_client or get_async_client("ollama", base_url)
+                async with client.stream(
+                    "POST",
+                    f"{base_url}{endpoint}",
+                    json=payload,
+                    timeout=settings.ollama_timeout,
+                ) as response:
+                    await raise_for_stream_status(response)
+                    async for data in iter_ndjson(response):
+                        if data.get("error"):
+                            raise ValueError(f"Ollama 串流錯誤: {data['error']}")
+                        text = extract(data)
+                        if text:
+                            parts.append(text)
+                            await on_delta(text)
+                        if data.get("done"):
+                            final = data
+        except httpx.HTTPStatusError as exc:
+            raise ValueError(
+                f"Ollama API 錯誤 ({exc.response.status_code}): "
+                f"{exc.response.reason_phrase}"
+            ) from exc
+        except httpx.RequestError as exc:
+            raise ValueError(f"無法連線至 Ollama ({self.base_url}): {exc}") from exc
+
+        if "prompt_eval_count" in final or "eval_count" in final:
+            record_usage(
+                provider="ollama",
+                model=self.model,
+                prompt_tokens=final.get("prompt_eval_count", 0),
+                completion_tokens=final.get("eval_count", 0),
+            )
+        return "".join(parts)
+
     def translate(
         self,
         blocks: Iterable[dict],
@@ -133,6 +183,7 @@ class OllamaTranslator:
         mode: str = "direct",
     ) -> dict:
         """Translate blocks using Ollama API (Synchronous)."""
+        blocks = list(blocks)
         contract_example = load_contract_example()
         prompt = build_prompt(
             blocks,
@@ -143,6 +194,7 @@ class OllamaTranslator:
             placeholder_tokens,
             language_hint,
             mode=mode,
+            provider="ollama",
         )
 
         system_message = self._get_system_message()
@@ -166,7 +218,7 @@ class OllamaTranslator:
         if not content:
             raise ValueError("Ollama 回傳內容為空 (/api/chat)")
 
-        result = safe_json_loads(content)
+        result = expand_compact_contract(safe_json_loads(content), blocks, target_language)
         validate_contract(result)
         return result
 
@@ -179,8 +231,14 @@ class OllamaTranslator:
         placeholder_tokens: list[str] | None = None,
         language_hint: str | None = None,
         mode: str = "direct",
+        on_delta: DeltaCallback | None = None,
     ) -> dict:
-        """Translate blocks using Ollama API (Asynchronous)."""
+        """Translate blocks using Ollama API (Asynchronous).
+
+        With ``on_delta`` the response is streamed and each text delta is
+        passed on as it arrives.
+        """
+        blocks = list(blocks)
         contract_example = load_contract_example()
         prompt = build_prompt(
             blocks,
@@ -191,6 +249,7 @@ class OllamaTranslator:
             placeholder_tokens,
             language_hint,
             mode=mode,
+            provider="ollama",
         )
 
         system_message = self._get_system_message()
@@ -208,13 +267,21 @@ class OllamaTranslator:
         if options:
             payload["options"] = options
 
-        response_data = await self._post_async("/api/chat", payload)
-        content = response_data.get("message", {}).get("content", "")
+        if on_delta is not None:
+            content = await self._stream_async(
+                "/api/chat",
+                payload,
+                on_delta,
+                lambda data: data.get("message", {}).get("content", ""),
+            )
+        else:
+            response_data = await self._post_async("/api/chat", payload)
+            content = response_data.get("message", {}).get("content", "")
 
         if not content:
             raise ValueError("Ollama 回傳內容為空 (/api/chat)")
 
-        result = safe_json_loads(content)
+        result = expand_compact_contract(safe_json_loads(content), blocks, target_language)
         validate_contract(result)
         return result
 
@@ -240,7 +307,11 @@ class OllamaTranslator:
             raise ValueError("Ollama 回傳內容為空 (/api/generate)")
         return content
 
-    async def translate_plain_async(self, prompt: str) -> str:
+    async def translate_plain_async(
+        self,
+        prompt: str,
+        on_delta: DeltaCallback | None = None,
+    ) -> str:
         """Translate using plain text prompt (Asynchronous)."""
         payload = {
             "model": self.model,
@@ -250,8 +321,16 @@ class OllamaTranslator:
         options = build_ollama_options()
         if options:
             payload["options"] = options
-        response_data = await self._post_async("/api/generate", payload)
-        content = response_data.get("response", "")
+        if on_delta is not None:
+            content = await self._stream_async(
+                "/api/generate",
+                payload,
+                on_delta,
+                lambda data: data.get("response", ""),
+            )
+        else:
+            response_data = await self._post_async("/api/generate", payload)
+            content = response_data.get("response", "")
         if not content:
             raise ValueError("Ollama 回傳內容為空 (/api/generate)")
         return content
@@ -10,15 +10,15 @@ import json
 import logging
 from collections.abc import Iterable
 
-import httpx
-
 from backend.config import settings
 from backend.services.llm_client_base import (
     TranslationConfig,
     load_contract_example,
 )
-from backend.services.llm_contract import validate_contract
+from backend.services.llm_contract import expand_compact_contract, validate_contract
+from backend.services.llm_http import get_async_client, get_client
 from backend.services.llm_prompt import build_prompt
+from backend.services.llm_stream import DeltaCallback, iter_sse_data, raise_for_stream_status
 from backend.services.prompt_store import get_prompt
 from backend.services.token_tracker import record_usage
 
@@ -28,6 +28,8 @@ LOGGER = logging.getLogger(__name__)
 class OpenAITranslator:
     """Translator using OpenAI's chat completions API."""
 
+    supports_streaming = True
+
     def __init__(self, config: TranslationConfig) -> None:
         self.config = config
 
@@ -42,6 +44,7 @@ class OpenAITranslator:
         mode: str = "direct",
     ) -> dict:
         """Translate blocks using OpenAI API (Synchronous)."""
+        blocks = list(blocks)
         contract_example = load_contract_example()
         prompt = build_prompt(
             blocks,
@@ -52,6 +55,7 @@ class OpenAITranslator:
             placeholder_tokens,
             language_hint,
             mode=mode,
+            provider="openai",
         )
 
         system_message = self._get_system_message()
@@ -71,23 +75,19 @@ class OpenAITranslator:
         }
         url = f"{self.config.base_url}/chat/completions"
 
-        with httpx.Client(timeout=settings.openai_timeout) as client:
-            response = client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            response_data = response.json()
+        client = get_client("openai", self.config.base_url)
+        response = client.post(
+            url, json=payload, headers=headers, timeout=settings.openai_timeout
+        )
+        response.raise_for_status()
+        response_data = response.json()
 
         # Record usage
         if "usage" in response_data:
-            usage = response_data["usage"]
-            record_usage(
-                provider="openai",
-                model=self.config.model,
-                prompt_tokens=usage.get("prompt_tokens", 0),
-                completion_tokens=usage.get("completion_tokens", 0),
-            )
+            self._record_usage(response_data["usage"])
 
         content = response_data["choices"][0]["message"]["content"]
-        result = json.loads(content)
+        result = expand_compact_contract(json.loads(content), blocks, target_language)
         validate_contract(result)
         return result
 
@@ -100,8 +100,14 @@ class OpenAITranslator:
         placeholder_tokens: list[str] | None = None,
         language_hint: str | None = None,
         mode: str = "direct",
+        on_delta: DeltaCallback | None = None,
     ) -> dict:
-        """Translate blocks using OpenAI API (Asynchronous)."""
+        """Translate blocks using OpenAI API (Asynchronous).
+
+        With ``on_delta`` the completion is streamed and each content delta
+        is passed on as it arrives.
+        """
+        blocks = list(blocks)
         contract_example = load_contract_example()
         prompt = build_prompt(
             blocks,
@@ -112,6 +118,7 @@ class OpenAITranslator:
             placeholder_tokens,
             language_hint,
             mode=mode,
+            provider="openai",
         )
 
         system_message = self._get_system_message()
@@ -131,28 +138,64 @@ class OpenAITranslator:
         }
         url = f"{self.config.base_url}/chat/completions"
 
-        async with httpx.AsyncClient(
-            timeout=settings.openai_timeout
-        ) as client:
-            response = await client.post(url, json=payload, headers=headers)
+        if on_delta is not None:
+            content, usage = await self._stream_chat(url, payload, headers, on_delta)
+            response_data = {"usage": usage} if usage else {}
+        else:
+            client = get_async_client("openai", self.config.base_url)
+            response = await client.post(
+                url, json=payload, headers=headers, timeout=settings.openai_timeout
+            )
             response.raise_for_status()
             response_data = response.json()
+            content = response_data["choices"][0]["message"]["content"]
 
         # Record usage
         if "usage" in response_data:
-            usage = response_data["usage"]
-            record_usage(
-                provider="openai",
-                model=self.config.model,
-                prompt_tokens=usage.get("prompt_tokens", 0),
-                completion_tokens=usage.get("completion_tokens", 0),
-            )
+            self._record_usage(response_data["usage"])
 
-        content = response_data["choices"][0]["message"]["content"]
-        result = json.loads(content)
+        result = expand_compact_contract(json.loads(content), blocks, target_language)
         validate_contract(result)
         return result
 
+    async def _stream_chat(
+        self,
+        url: str,
+        payload: dict,
+        headers: dict,
+        on_delta: DeltaCallback,
+    ) -> tuple[str, dict | None]:
+        """Stream a chat completion; returns (content, usage)."""
+        payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        parts: list[str] = []
+        usage = None
+        client = get_async_client("openai", self.config.base_url)
+        async with client.stream(
+            "POST", url, json=payload, headers=headers, timeout=settings.openai_timeout
+        ) as response:
+            await raise_for_stream_status(response)
+            async for event in iter_sse_data(response):
+                usage = event.get("usage") or usage
+                for choice in event.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        parts.append(text)
+                        await on_delta(text)
+        return "".join(parts), usage
+
+    def _record_usage(self, usage: dict) -> None:
+        # The system message and the prompt prefix are byte-stable across a
+        # job's chunks, so OpenAI's automatic prefix caching serves them;
+        # the cached share is reported in prompt_tokens_details.
+        details = usage.get("prompt_tokens_details") or {}
+        record_usage(
+            provider="openai",
+            model=self.config.model,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            cached_tokens=details.get("cached_tokens") or 0,
+        )
+
     def _get_system_message(self) -> str:
         try:
             return get_prompt("system_message")
@@ -178,10 +221,12 @@ class OpenAITranslator:
             "Content-Type": "application/json",
         }
         url = f"{self.config.base_url}/chat/completions"
-        with httpx.Client(timeout=settings.openai_timeout) as client:
-            response = client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            response_data = response.json()
+        client = get_client("openai", self.config.base_url)
+        response = client.post(
+            url, json=payload, headers=headers, timeout=settings.openai_timeout
+        )
+        response.raise_for_status()
+        response_data = response.json()
         return response_data["choices"][0]["message"]["content"]
 
     async def complete_async(
@@ -207,10 +252,10 @@ class OpenAITranslator:
             "Content-Type": "application/json",
         }
         url = f"{self.config.base_url}/chat/completions"
-        async with httpx.AsyncClient(
-            timeout=settings.openai_timeout
-        ) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            response_data = response.json()
+        client = get_async_client("openai", self.config.base_url)
+        response = await client.post(
+            url, json=payload, headers=headers, timeout=settings.openai_timeout
+        )
+        response.raise_for_status()
+        response_data = response.json()
         return response_data["choices"][0]["message"]["content"]
@@ -1,64 +1,123 @@
 from __future__ import annotations
 
-def build_context(  # noqa: C901
-    strategy: str,
-    all_blocks: list[dict],
-    chunk_blocks: list[dict],
-) -> dict | None:
-    if strategy == "none":
-        return None
+from backend.services.token_tracker import estimate_tokens
 
-    blocks_by_slide: dict[int, list[dict]] = {}
-    for block in all_blocks:
-        slide_index = block.get("slide_index")
-        if slide_index is None:
-            continue
-        blocks_by_slide.setdefault(slide_index, []).append(block)
-
-    chunk_slides = sorted(
-        {
-            block.get("slide_index")
-            for block in chunk_blocks
-            if block.get("slide_index") is not None
-        }
-    )
-    total_slides = max(blocks_by_slide.keys()) + 1 if blocks_by_slide else 0
-
-    if strategy == "neighbor":
-        context_blocks = []
-        for slide_index in chunk_slides:
-            for neighbor in (slide_index - 1, slide_index, slide_index + 1):
-                context_blocks.extend(blocks_by_slide.get(neighbor, []))
-        return {
-            "strategy": "neighbor",
-            "context_blocks": context_blocks,
-            "current_slides": chunk_slides,
-            "total_slides": total_slides,
-        }
+# Slides whose blocks make up the "deck" strategy's summary context.
+DECK_SUMMARY_SLIDES = 2
 
-    if strategy == "title-only":
-        title_blocks = []
-        for slide_index in chunk_slides:
-            slide_blocks = blocks_by_slide.get(slide_index, [])
-            if slide_blocks:
-                # Try to pick a block that looks like a title (usually first).
-                title_blocks.append(slide_blocks[0])
-        return {
-            "strategy": "title-only",
-            "context_blocks": title_blocks,
-            "current_slides": chunk_slides,
-            "total_slides": total_slides,
+
+def _guess_title(slide_blocks: list[dict]) -> dict:
+    # Prefer the first real text block; fall back to the slide's first block.
+    for block in slide_blocks:
+        if block.get("block_type") != "image_text" and (block.get("source_text") or "").strip():
+            return block
+    return slide_blocks[0]
+
+
+class DocumentContextIndex:
+    """Per-document lookup tables for :func:`build_context`.
+
+    Built once per translation job so building a chunk's context only touches
+    the chunk's slides. ``token_budget`` (0 = unbounded) caps the estimated
+    size of the context blocks sent with each chunk.
+    """
+
+    def __init__(
+        self,
+        blocks: list[dict],
+        token_budget: int = 0,
+        provider: str = "default",
+    ):
+        self.token_budget = max(0, token_budget)
+        self.provider = provider
+        self.blocks_by_slide: dict[int, list[dict]] = {}
+        for block in blocks:
+            slide_index = block.get("slide_index")
+            if slide_index is None:
+                continue
+            self.blocks_by_slide.setdefault(slide_index, []).append(block)
+        self.total_slides = max(self.blocks_by_slide) + 1 if self.blocks_by_slide else 0
+        self.titles = {
+            slide_index: _guess_title(slide_blocks)
+            for slide_index, slide_blocks in self.blocks_by_slide.items()
         }
+        self.deck_blocks = [
+            block
+            for slide_index in sorted(self.blocks_by_slide)[:DECK_SUMMARY_SLIDES]
+            for block in self.blocks_by_slide[slide_index]
+        ]
+        self._tokens: dict[int, int] = {}
+
+    def _block_tokens(self, block: dict) -> int:
+        key = id(block)
+        tokens = self._tokens.get(key)
+        if tokens is None:
+            tokens = estimate_tokens(block.get("source_text") or "", self.provider)
+            self._tokens[key] = tokens
+        return tokens
+
+    def trim(self, blocks: list[dict]) -> list[dict]:
+        """Keep leading blocks while they fit in the token budget."""
+        if not self.token_budget:
+            return blocks
+        kept = []
+        used = 0
+        for block in blocks:
+            used += self._block_tokens(block)
+            if used > self.token_budget:
+                break
+            kept.append(block)
+        return kept
+
+    def build(self, strategy: str, chunk_blocks: list[dict]) -> dict | None:
+        if strategy not in ("neighbor", "title-only", "deck"):
+            return None
+
+        chunk_slides = sorted(
+            {
+                block.get("slide_index")
+                for block in chunk_blocks
+                if block.get("slide_index") is not None
+            }
+        )
+
+        if strategy == "neighbor":
+            # Adjacent chunk slides share neighbors; include each slide once.
+            slides = dict.fromkeys(
+                neighbor
+                for slide_index in chunk_slides
+                for neighbor in (slide_index - 1, slide_index, slide_index + 1)
+            )
+            context_blocks = [
+                block
+                for slide_index in slides
+                for block in self.blocks_by_slide.get(slide_index, [])
+            ]
+        elif strategy == "title-only":
+            context_blocks = [
+                self.titles[slide_index]
+                for slide_index in chunk_slides
+                if slide_index in self.titles
+            ]
+        else:
+            context_blocks = self.deck_blocks
 
-    if strategy == "deck":
-        deck_blocks = []
-        for slide_index in sorted(blocks_by_slide.keys())[:2]:
-            deck_blocks.extend(blocks_by_slide.get(slide_index, []))
         return {
-            "strategy": "deck",
-            "context_blocks": deck_blocks,
+            "strategy": strategy,
+            "context_blocks": self.trim(context_blocks),
             "current_slides": chunk_slides,
-            "total_slides": total_slides,
+            "total_slides": self.total_slides,
         }
 
-    return None
+
+def build_context(
+    strategy: str,
+    all_blocks: list[dict],
+    chunk_blocks: list[dict],
+    index: DocumentContextIndex | None = None,
+) -> dict | None:
+    if strategy == "none":
+        return None
+    if index is None:
+        index = DocumentContextIndex(all_blocks)
+    return index.build(strategy, chunk_blocks)
@@ -36,6 +36,35 @@ def build_contract(
     }
 
 
+def expand_compact_contract(
+    result: dict,
+    blocks: list[dict],
+    target_language: str,
+) -> dict:
+    """Map a compact ``{id, translated_text}`` response back onto ``blocks``.
+
+    Full-schema responses are returned unchanged.
+    """
+    items = result.get("blocks") if isinstance(result, dict) else None
+    if not isinstance(items, list) or not items:
+        return result
+    if not all(isinstance(item, dict) and "id" in item for item in items):
+        return result
+    if all("source_text" in item for item in items):
+        return result
+    by_id: dict[int, str] = {}
+    for item in items:
+        try:
+            by_id[int(item["id"])] = item.get("translated_text") or ""
+        except (TypeError, ValueError):
+            return result
+    missing = [index for index in range(len(blocks)) if index not in by_id]
+    if missing:
+        raise ValueError(f"Missing block ids in LLM response: {missing}")
+    translated_texts = [by_id[index] for index in range(len(blocks))]
+    return build_contract(blocks, target_language, translated_texts)
+
+
 def validate_contract(result: dict) -> None:
     if "blocks" not in result:
         raise ValueError("Missing blocks in LLM response")
@@ -0,0 +1,170 @@
+"""Deadline budgets and hedged requests for LLM chunk tasks.
+
+A job carries one :class:`Deadline` from the request down to every chunk;
+each LLM request gets ``min(llm_request_timeout, time left)``, counted from
+when it holds its limiter slot, so a job asked to finish in 120s never
+waits 180s on a single chunk, and queueing behind other jobs is not
+mistaken for a slow backend. A chunk whose
+attempt times out is re-queued (see ``process_chunk_async``) instead of
+silently leaving its blocks untranslated.
+
+With hedging on, a chunk still running after the backend's observed p95
+latency gets a second request, on the same translator or a fallback
+provider, and the first to succeed wins; the other is cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from backend.config import settings
+
+T = TypeVar("T")
+
+# Chunk latencies kept per (provider, model) for the percentile.
+LATENCY_WINDOW = 200
+
+
+class Deadline:
+    """Absolute ``time.monotonic()`` deadline; ``None`` means unbounded."""
+
+    __slots__ = ("at",)
+
+    def __init__(self, at: float | None = None):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: float | None) -> Deadline:
+        if not seconds or seconds <= 0:
+            return cls()
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float | None:
+        if self.at is None:
+            return None
+        return max(self.at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for one attempt: ``cap``, shortened to the time left."""
+        remaining = self.remaining()
+        return cap if remaining is None else min(cap, remaining)
+
+
+class LatencyTracker:
+    """Rolling chunk latencies of one backend, and hedge counters."""
+
+    def __init__(self, name: str, window: int = LATENCY_WINDOW):
+        self.name = name
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._stats = {"hedged": 0, "hedge_wins": 0}
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))
+        return samples[rank]
+
+    def hedge_delay(self) -> float | None:
+        """Seconds before hedging, or ``None`` until enough samples exist."""
+        with self._lock:
+            enough = len(self._samples) >= settings.llm_hedge_min_samples
+        if not enough:
+            return None
+        return self.percentile(settings.llm_hedge_percentile)
+
+    def stats(self) -> dict:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        with self._lock:
+            return {
+                "name": self.name,
+                "samples": len(self._samples),
+                "p50": round(p50, 3) if p50 is not None else None,
+                "p95": round(p95, 3) if p95 is not None else None,
+                **self._stats,
+            }
+
+
+async def _first_success(first: asyncio.Task, second: asyncio.Task) -> tuple[Any, bool]:
+    pending = {first, second}
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task.result(), task is second
+    # Both failed: report the primary's error.
+    raise first.exception()
+
+
+async def hedged(
+    primary: Callable[[], Awaitable[T]],
+    hedge: Callable[[], Awaitable[T]] | None = None,
+    delay: float | None = None,
+    tracker: LatencyTracker | None = None,
+) -> tuple[T, bool]:
+    """Run ``primary``; after ``delay`` also run ``hedge``, first success wins.
+
+    Returns ``(result, hedge_won)``. Whichever request loses (or both, when
+    the caller is cancelled) is cancelled.
+    """
+    first = asyncio.ensure_future(primary())
+    second = None
+    try:
+        if hedge is None or delay is None:
+            return await first, False
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result(), False
+        second = asyncio.ensure_future(hedge())
+        if tracker is not None:
+            tracker.count("hedged")
+        result, hedge_won = await _first_success(first, second)
+        if hedge_won and tracker is not None:
+            tracker.count("hedge_wins")
+        return result, hedge_won
+    finally:
+        for task in (first, second):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+_TRACKERS: dict[tuple[str, str], LatencyTracker] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_latency_tracker(provider: str, model: str | None = None) -> LatencyTracker:
+    key = (provider or "default", model or "default")
+    with _REGISTRY_LOCK:
+        tracker = _TRACKERS.get(key)
+        if tracker is None:
+            tracker = LatencyTracker(f"{key[0]}:{key[1]}")
+            _TRACKERS[key] = tracker
+        return tracker
+
+
+def hedge_stats() -> list[dict]:
+    with _REGISTRY_LOCK:
+        trackers = list(_TRACKERS.values())
+    return [tracker.stats() for tracker in trackers]
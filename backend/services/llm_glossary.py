@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import csv
 
+from backend.services.term_matcher import TermMatcher, as_matcher
+
+
 def load_glossary(path: str | None) -> list[tuple[str, str]]:
     if not path:
         return []
@@ -18,8 +21,7 @@ def load_glossary(path: str | None) -> list[tuple[str, str]]:
     return entries
 
 
-def apply_glossary(text: str, glossary: list[tuple[str, str]]) -> str:
-    updated = text
-    for source, target in glossary:
-        updated = updated.replace(source, target)
-    return updated
+def apply_glossary(text: str, glossary: TermMatcher | list[tuple[str, str]]) -> str:
+    if not text or not glossary:
+        return text
+    return as_matcher(glossary, ignore_case=False).substitute(text)
@@ -0,0 +1,135 @@
+"""Process-wide pooled HTTP clients for LLM providers.
+
+Translators used to open a fresh ``httpx.Client`` (and TLS handshake) per
+chunk. Clients are now kept per (provider, base_url) so connections are
+reused across chunks and jobs. Async clients are bound to the event loop
+they were created on, so they are additionally keyed by loop. HTTP/2 is used
+for HTTPS endpoints when the optional ``h2`` package is installed; Ollama
+and plain-HTTP endpoints stay on HTTP/1.1 keep-alive.
+
+Timeouts are passed per request by the callers, since each provider has its
+own setting. :func:`aclose_all` is called from the FastAPI lifespan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+
+import httpx
+
+from backend.config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+ClientKey = tuple[str, str]
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_CLIENTS: dict[ClientKey, httpx.Client] = {}
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[ClientKey, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+_LOCK = threading.Lock()
+
+
+def _key(provider: str, base_url: str) -> ClientKey:
+    return provider.lower(), base_url.rstrip("/")
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive,
+        keepalive_expiry=settings.llm_http_keepalive_expiry,
+    )
+
+
+def use_http2(provider: str, base_url: str) -> bool:
+    """HTTP/2 needs TLS (no h2c in httpx) and the optional h2 package."""
+    return (
+        settings.llm_http2
+        and _HTTP2_AVAILABLE
+        and provider.lower() != "ollama"
+        and base_url.startswith("https://")
+    )
+
+
+def _client_options(provider: str, base_url: str) -> dict:
+    return {
+        "http2": use_http2(provider, base_url),
+        "limits": _limits(),
+        "timeout": httpx.Timeout(settings.llm_request_timeout, connect=10.0),
+    }
+
+
+def get_client(provider: str, base_url: str) -> httpx.Client:
+    """Return the shared sync client for ``(provider, base_url)``."""
+    key = _key(provider, base_url)
+    with _LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_options(*key))
+            _CLIENTS[key] = client
+        return client
+
+
+def get_async_client(provider: str, base_url: str) -> httpx.AsyncClient:
+    """Return the shared async client for ``(provider, base_url)`` on this loop."""
+    key = _key(provider, base_url)
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        clients = _ASYNC_CLIENTS.get(loop)
+        if clients is None:
+            clients = {}
+            _ASYNC_CLIENTS[loop] = clients
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_options(*key))
+            clients[key] = client
+        return client
+
+
+def close_all() -> None:
+    """Close every sync client; async clients are left to :func:`aclose_all`."""
+    with _LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            LOGGER.exception("Failed to close LLM HTTP client")
+
+
+async def aclose_all() -> None:
+    """Close the sync clients and the async clients owned by the running loop.
+
+    Async clients created on other (already finished) loops cannot be awaited
+    from here; they are dropped together with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        clients = list((_ASYNC_CLIENTS.pop(loop, None) or {}).values())
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            LOGGER.exception("Failed to close LLM HTTP client")
+    await asyncio.to_thread(close_all)
+
+
+def client_stats() -> dict:
+    with _LOCK:
+        sync_keys = [list(key) for key in _CLIENTS]
+        async_count = sum(len(clients) for clients in _ASYNC_CLIENTS.values())
+    return {
+        "http2_available": _HTTP2_AVAILABLE,
+        "sync_clients": sync_keys,
+        "async_clients": async_count,
+        "max_connections": settings.llm_http_max_connections,
+        "max_keepalive": settings.llm_http_max_keepalive,
+    }
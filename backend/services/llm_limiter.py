@@ -0,0 +1,359 @@
+"""Process-wide adaptive concurrency limits for LLM calls.
+
+One :class:`AdaptiveLimiter` is shared per (provider, model) by every job in
+the process, sync or async, so two users translating at once split the same
+budget instead of each getting their own semaphore. The limit follows AIMD:
+
+* a healthy call (latency per block within ``latency_tolerance`` of the best
+  seen) adds ``1 / limit``, i.e. about +1 per round of ``limit`` calls;
+* a 429, a 5xx or a timeout halves the limit, at most once per cooldown so a
+  burst of failures from the same round only counts once;
+* a ``Retry-After`` header pauses new calls until it expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from urllib.error import HTTPError
+
+import httpx
+
+from backend.config import settings
+
+# Latency above this multiple of the best observed latency shrinks the limit.
+SLOW_FACTOR = 3.0
+SLOW_DECREASE = 0.75
+# The best-latency baseline drifts toward recent samples so it cannot stick.
+BASELINE_DRIFT = 0.02
+MIN_COOLDOWN = 1.0
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def _iter_chain(exc: BaseException | None) -> Iterator[BaseException]:
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def failure_signal(exc: BaseException) -> tuple[bool, float | None]:
+    """Return (overloaded, retry_after seconds) for an LLM call failure.
+
+    Clients wrap transport errors in ``ValueError``, so the cause chain is
+    searched for the underlying HTTP status or timeout.
+    """
+    for item in _iter_chain(exc):
+        if isinstance(item, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)):
+            return True, None
+        status = None
+        headers = None
+        if isinstance(item, httpx.HTTPStatusError):
+            status = item.response.status_code
+            headers = item.response.headers
+        elif isinstance(item, HTTPError):
+            status = item.code
+            headers = item.headers
+        if status is not None:
+            overloaded = status == 429 or status >= 500
+            retry_after = _parse_retry_after(headers.get("Retry-After")) if headers else None
+            return overloaded, retry_after if overloaded else None
+    return False, None
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "event")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None):
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = threading.Event() if loop is None else None
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+            return
+
+        def _set() -> None:
+            if not self.future.done():
+                self.future.set_result(None)
+
+        self.loop.call_soon_threadsafe(_set)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit shared by sync threads and any event loop."""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_tolerance: float = 1.5,
+        adaptive: bool = True,
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.adaptive = adaptive
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._baseline: float | None = None
+        self._call_time = 0.0
+        self._last_decrease = 0.0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._recent: deque[bool] = deque(maxlen=50)
+        self._stats = {"successes": 0, "overloads": 0, "decreases": 0, "retry_after_waits": 0}
+
+    # -- admission -------------------------------------------------------
+
+    def _can_start(self) -> bool:
+        return self.in_flight < int(self.limit) and time.monotonic() >= self.blocked_until
+
+    def _try_start(self, waiter: _Waiter | None = None) -> bool:
+        """Take a slot if allowed; FIFO unless ``waiter`` is at the head."""
+        if self._waiters and (waiter is None or self._waiters[0] is not waiter):
+            return False
+        if not self._can_start():
+            return False
+        if waiter is not None:
+            self._waiters.popleft()
+        self.in_flight += 1
+        return True
+
+    def _wake_next(self) -> None:
+        # Caller holds the lock.
+        if self._waiters and self._can_start():
+            self._waiters[0].wake()
+
+    def _wait_time(self) -> float | None:
+        remaining = self.blocked_until - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def acquire(self) -> None:
+        waiter = None
+        while True:
+            with self._lock:
+                if self._try_start(waiter):
+                    self._wake_next()
+                    return
+                if waiter is None:
+                    waiter = _Waiter()
+                    self._waiters.append(waiter)
+                    if self._try_start(waiter):
+                        self._wake_next()
+                        return
+                timeout = self._wait_time()
+                waiter.event.clear()
+            waiter.event.wait(timeout)
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = None
+        try:
+            while True:
+                with self._lock:
+                    if waiter is None:
+                        if self._try_start():
+                            return
+                        waiter = _Waiter(loop)
+                        self._waiters.append(waiter)
+                    if self._try_start(waiter):
+                        self._wake_next()
+                        return
+                    timeout = self._wait_time()
+                    if waiter.future.done():
+                        waiter.future = loop.create_future()
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._lock:
+                if waiter is not None and waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self._wake_next()
+            raise
+
+    # -- feedback --------------------------------------------------------
+
+    def release(
+        self,
+        duration: float | None = None,
+        cost: int = 1,
+        exc: BaseException | None = None,
+    ) -> None:
+        """Free a slot and feed back the call's outcome.
+
+        ``duration`` is the wall time of a successful call; it is divided by
+        ``cost`` (blocks sent) so chunks of different sizes compare fairly.
+        """
+        now = time.monotonic()
+        with self._lock:
+            # Only grow a limit that is actually being used.
+            busy = bool(self._waiters) or self.in_flight >= self.limit / 2
+            self.in_flight = max(0, self.in_flight - 1)
+            if exc is not None:
+                overloaded, retry_after = failure_signal(exc)
+                if overloaded:
+                    self._on_overload(now, retry_after)
+            elif duration is not None:
+                self._call_time += (duration - self._call_time) * 0.2
+                self._on_success(now, duration / max(cost, 1), busy)
+            self._wake_next()
+
+    def _decrease(self, now: float, factor: float) -> None:
+        # Calls failing within one call time come from the same round.
+        cooldown = max(self._call_time, MIN_COOLDOWN)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self._stats["decreases"] += 1
+
+    def _on_overload(self, now: float, retry_after: float | None) -> None:
+        self._stats["overloads"] += 1
+        self._recent.append(False)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            self._stats["retry_after_waits"] += 1
+        if self.adaptive:
+            self._decrease(now, 0.5)
+
+    def _on_success(self, now: float, latency: float, busy: bool) -> None:
+        self._stats["successes"] += 1
+        self._recent.append(True)
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            self._baseline += (latency - self._baseline) * BASELINE_DRIFT
+        if not self.adaptive:
+            return
+        if latency > self._baseline * SLOW_FACTOR:
+            self._decrease(now, SLOW_DECREASE)
+            return
+        healthy = latency <= self._baseline * self.latency_tolerance
+        if busy and healthy and self.error_rate() < 0.1:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def error_rate(self) -> float:
+        if not self._recent:
+            return 0.0
+        return self._recent.count(False) / len(self._recent)
+
+    # -- context managers -----------------------------------------------
+
+    @contextmanager
+    def slot(self, cost: int = 1) -> Iterator[None]:
+        self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            self.release(exc=exc)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release(time.monotonic() - started, cost)
+
+    @asynccontextmanager
+    async def slot_async(self, cost: int = 1) -> AsyncIterator[None]:
+        await self.acquire_async()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            self.release(exc=exc)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the job's wait_for expired): free the slot only.
+            self.release()
+            raise
+        self.release(time.monotonic() - started, cost)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "adaptive": self.adaptive,
+                "error_rate": round(self.error_rate(), 3),
+                "baseline_latency": round(self._baseline, 3) if self._baseline else None,
+                "blocked_for": round(max(self.blocked_until - time.monotonic(), 0.0), 2),
+                **self._stats,
+            }
+
+
+_LIMITERS: dict[tuple[str, str], AdaptiveLimiter] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _initial_limit(provider: str) -> int:
+    # The old fixed defaults are a safe starting point.
+    return 1 if provider == "ollama" else 5
+
+
+def get_limiter(provider: str, model: str | None = None) -> AdaptiveLimiter:
+    """Return the shared limiter for ``(provider, model)``."""
+    key = (provider or "default", model or "default")
+    with _REGISTRY_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            cap = settings.llm_max_concurrency
+            adaptive = settings.llm_adaptive_concurrency
+            if adaptive:
+                initial = _initial_limit(key[0])
+                max_limit = cap if cap > 0 else settings.llm_concurrency_max
+            else:
+                initial = cap if cap > 0 else _initial_limit(key[0])
+                max_limit = initial
+            limiter = AdaptiveLimiter(
+                name=f"{key[0]}:{key[1]}",
+                initial=min(initial, max_limit),
+                min_limit=min(settings.llm_concurrency_min, max_limit),
+                max_limit=max_limit,
+                latency_tolerance=settings.llm_latency_tolerance,
+                adaptive=adaptive,
+            )
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def limiter_stats() -> list[dict]:
+    with _REGISTRY_LOCK:
+        limiters = list(_LIMITERS.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def reset_limiters() -> None:
+    """Forget every limiter (tests and settings reloads)."""
+    with _REGISTRY_LOCK:
+        _LIMITERS.clear()
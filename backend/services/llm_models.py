@@ -1,28 +1,31 @@
 from __future__ import annotations
 
-import json
-from urllib.request import Request, urlopen
+from backend.services.llm_http import get_client
+
+MODELS_TIMEOUT = 30
+
 
 def list_openai_models(api_key: str, base_url: str) -> list[str]:
-    request = Request(
+    response = get_client("openai", base_url).get(
         f"{base_url.rstrip('/')}/models",
         headers={"Authorization": f"Bearer {api_key}"},
-        method="GET",
+        timeout=MODELS_TIMEOUT,
     )
-    with urlopen(request, timeout=30) as response:
-        data = json.loads(response.read().decode("utf-8"))
+    response.raise_for_status()
+    data = response.json()
     models = [item.get("id") for item in data.get("data", [])]
     return sorted([model for model in models if model])
 
 
 def list_gemini_models(api_key: str, base_url: str) -> list[str]:
-    request = Request(
-        f"{base_url.rstrip('/')}/models?key={api_key}",
+    response = get_client("gemini", base_url).get(
+        f"{base_url.rstrip('/')}/models",
+        params={"key": api_key},
         headers={"Content-Type": "application/json"},
-        method="GET",
+        timeout=MODELS_TIMEOUT,
     )
-    with urlopen(request, timeout=30) as response:
-        data = json.loads(response.read().decode("utf-8"))
+    response.raise_for_status()
+    data = response.json()
     models = []
     for item in data.get("models", []):
         name = item.get("name", "")
@@ -33,12 +36,12 @@ def list_gemini_models(api_key: str, base_url: str) -> list[str]:
 
 
 def list_ollama_models(base_url: str) -> list[str]:
-    request = Request(
+    response = get_client("ollama", base_url).get(
         f"{base_url.rstrip('/')}/api/tags",
         headers={"Content-Type": "application/json"},
-        method="GET",
+        timeout=MODELS_TIMEOUT,
     )
-    with urlopen(request, timeout=30) as response:
-        data = json.loads(response.read().decode("utf-8"))
+    response.raise_for_status()
+    data = response.json()
     models = [item.get("name") for item in data.get("models", [])]
     return sorted([model for model in models if model])
@@ -1,30 +1,98 @@
 from __future__ import annotations
 
 import json
+import threading
+import weakref
 from collections.abc import Iterable
 
+from backend.config import settings
 from backend.services.prompt_store import render_prompt
+from backend.services.term_matcher import TermMatcher
+from backend.services.token_tracker import (
+    estimate_tokens,
+    estimate_tokens_for_chars,
+    record_prompt_compaction,
+)
 from backend.services.translate_config import (
     get_language_example as _language_example,
     get_language_hint as _language_hint,
     get_language_label as _language_label,
 )
 
-def build_prompt(
-    blocks: Iterable[dict],
+# Response schema used with compact payloads; expand_compact_contract maps the
+# ids back onto the original blocks.
+COMPACT_CONTRACT_EXAMPLE = {"blocks": [{"id": 0, "translated_text": ""}]}
+
+# Payload keys that are the same for every chunk of a job. They are emitted
+# first so the prompt starts with a byte-stable prefix that provider prompt
+# caches (OpenAI prefix caching, Gemini cached content, the Ollama runner's
+# KV cache) can reuse across chunks.
+STATIC_PAYLOAD_KEYS = ("target_language", "mode", "contract_schema_example")
+
+_PAYLOAD_MARK = "\ue000payload\ue000"
+
+# JSON length of each job's full glossary, for compaction statistics.
+_TERMS_CHARS: weakref.WeakKeyDictionary[TermMatcher, int] = weakref.WeakKeyDictionary()
+_TERMS_CHARS_LOCK = threading.Lock()
+
+
+def compact_blocks(blocks: list[dict]) -> list[dict]:
+    """Project blocks to the ``{id, text}`` fields the model needs."""
+    compacted = []
+    for index, block in enumerate(blocks):
+        item = {"id": index, "text": block.get("source_text", "")}
+        if block.get("alignment_source"):
+            item["alignment_source"] = block["alignment_source"]
+        compacted.append(item)
+    return compacted
+
+
+def relevant_terms(
+    texts: list[str],
+    preferred_terms: TermMatcher | list[tuple[str, str]],
+) -> list[tuple[str, str]]:
+    """Preferred terms whose source occurs in any of ``texts``."""
+    if isinstance(preferred_terms, TermMatcher):
+        found: set[int] = set()
+        for text in texts:
+            found |= preferred_terms.find_all(text)
+        return [preferred_terms.terms[idx] for idx in sorted(found)]
+    haystack = "\n".join(texts).lower()
+    return [
+        (source, target)
+        for source, target in preferred_terms
+        if source and source.lower() in haystack
+    ]
+
+
+def compact_context(context: dict, texts: list[str]) -> dict:
+    """Keep context text only, dropping duplicates and the chunk's own blocks."""
+    seen = set(texts)
+    context_texts = []
+    for block in context.get("context_blocks", []):
+        text = (block.get("source_text") or "").strip()
+        if text and text not in seen:
+            seen.add(text)
+            context_texts.append(text)
+    compacted = {key: value for key, value in context.items() if key != "context_blocks"}
+    compacted["context_blocks"] = context_texts
+    return compacted
+
+
+def _legacy_payload(
+    blocks: list[dict],
     target_language: str,
     contract_example: dict,
     context: dict | None,
-    preferred_terms: list[tuple[str, str]] | None = None,
-    placeholder_tokens: list[str] | None = None,
-    language_hint: str | None = None,
-    mode: str = "direct",
-) -> str:
+    preferred_terms: TermMatcher | list[tuple[str, str]] | None,
+    placeholder_tokens: list[str] | None,
+    mode: str,
+) -> dict:
     input_payload = {
         "target_language": target_language,
         "mode": mode,
-        "blocks": list(blocks),
         "contract_schema_example": contract_example,
+        "blocks": blocks,
     }
     if preferred_terms:
         input_payload["preferred_terms"] = [
@@ -35,17 +103,156 @@ def build_prompt(
         input_payload["placeholder_tokens"] = placeholder_tokens
     if context:
         input_payload["context"] = context
-    payload = json.dumps(input_payload, ensure_ascii=False)
+    return input_payload
+
+
+def _terms_json_chars(preferred_terms: TermMatcher | list[tuple[str, str]]) -> int:
+    """Length of the legacy ``preferred_terms`` JSON; cached per TermMatcher (one per job)."""
+
+    def measure() -> int:
+        return len(
+            json.dumps(
+                [{"source": source, "target": target} for source, target in preferred_terms],
+                ensure_ascii=False,
+            )
+        )
+
+    if not isinstance(preferred_terms, TermMatcher):
+        return measure()
+    with _TERMS_CHARS_LOCK:
+        chars = _TERMS_CHARS.get(preferred_terms)
+    if chars is None:
+        chars = measure()
+        with _TERMS_CHARS_LOCK:
+            _TERMS_CHARS[preferred_terms] = chars
+    return chars
+
+
+def _legacy_payload_chars(
+    blocks: list[dict],
+    target_language: str,
+    contract_example: dict,
+    context: dict | None,
+    preferred_terms: TermMatcher | list[tuple[str, str]] | None,
+    placeholder_tokens: list[str] | None,
+    mode: str,
+) -> int:
+    """Length of the legacy payload JSON without re-serializing the glossary per chunk."""
+    chars = len(
+        json.dumps(
+            _legacy_payload(
+                blocks, target_language, contract_example, context, None, placeholder_tokens, mode
+            ),
+            ensure_ascii=False,
+        )
+    )
+    if preferred_terms:
+        chars += len(', "preferred_terms": ') + _terms_json_chars(preferred_terms)
+    return chars
+
+
+def _compact_payload(
+    blocks: list[dict],
+    target_language: str,
+    context: dict | None,
+    preferred_terms: TermMatcher | list[tuple[str, str]] | None,
+    placeholder_tokens: list[str] | None,
+    mode: str,
+) -> dict:
+    texts = [block.get("source_text", "") for block in blocks]
+    input_payload = {
+        "target_language": target_language,
+        "mode": mode,
+        "contract_schema_example": COMPACT_CONTRACT_EXAMPLE,
+        "blocks": compact_blocks(blocks),
+    }
+    terms = relevant_terms(texts, preferred_terms) if preferred_terms else []
+    if terms:
+        input_payload["preferred_terms"] = [
+            {"source": source, "target": target} for source, target in terms
+        ]
+    if placeholder_tokens:
+        input_payload["placeholder_tokens"] = placeholder_tokens
+    if context:
+        input_payload["context"] = compact_context(context, texts)
+    return input_payload
+
+
+def split_payload(input_payload: dict) -> tuple[str, str]:
+    """JSON-encode ``input_payload`` as (job-wide head, per-chunk tail).
+
+    ``head + tail`` is the JSON of the payload with the static keys first.
+    """
+    static = {key: input_payload[key] for key in STATIC_PAYLOAD_KEYS if key in input_payload}
+    dynamic = {key: value for key, value in input_payload.items() if key not in static}
+    if not static or not dynamic:
+        return json.dumps({**static, **dynamic}, ensure_ascii=False), ""
+    head = json.dumps(static, ensure_ascii=False)[:-1] + ", "
+    return head, json.dumps(dynamic, ensure_ascii=False)[1:]
+
+
+def build_prompt_parts(
+    blocks: Iterable[dict],
+    target_language: str,
+    contract_example: dict,
+    context: dict | None,
+    preferred_terms: TermMatcher | list[tuple[str, str]] | None = None,
+    placeholder_tokens: list[str] | None = None,
+    language_hint: str | None = None,
+    mode: str = "direct",
+    compact: bool | None = None,
+    provider: str = "default",
+) -> tuple[str, str]:
+    """Build the translation prompt as ``(prefix, suffix)``.
+
+    The prefix (instructions, language fields, static payload keys) is
+    identical for every chunk of a job; the suffix holds the chunk's blocks,
+    terms and context.
+    """
+    blocks = list(blocks)
+    if compact is None:
+        compact = settings.llm_compact_prompt
+    if compact:
+        input_payload = _compact_payload(
+            blocks, target_language, context, preferred_terms, placeholder_tokens, mode
+        )
+        head, tail = split_payload(input_payload)
+        payload = head + tail
+        legacy_chars = _legacy_payload_chars(
+            blocks,
+            target_language,
+            contract_example,
+            context,
+            preferred_terms,
+            placeholder_tokens,
+            mode,
+        )
+        record_prompt_compaction(
+            estimate_tokens_for_chars(legacy_chars, provider),
+            estimate_tokens(payload, provider),
+        )
+    else:
+        input_payload = _legacy_payload(
+            blocks,
+            target_language,
+            contract_example,
+            context,
+            preferred_terms,
+            placeholder_tokens,
+            mode,
+        )
+        head, tail = split_payload(input_payload)
+        payload = head + tail
 
     # Merge static hint (from map) and dynamic hint (from args)
     static_hint = _language_hint(target_language)
     combined_hint = f"{static_hint}\n{language_hint or ''}".strip()
 
     try:
-        return render_prompt(
+        rendered = render_prompt(
             "translate_json",
-            {
-                "payload": payload,
+            {"payload": _PAYLOAD_MARK},
+            static={
                 "language_hint": combined_hint,
                 "language_example": _language_example(target_language),
                 "target_language_label": _language_label(target_language),
@@ -53,7 +260,7 @@ def build_prompt(
             },
         )
     except FileNotFoundError:
-        return f"""請將每個區塊翻譯為 target_language。若提供 preferred_terms，必須優先使用。
+        rendered = f"""請將每個區塊翻譯為 target_language。若提供 preferred_terms，必須優先使用。
   若提供 placeholder_tokens，必須完整保留，不可改動。
   若 payload 中含 context，必須遵守其規則。
   若區塊中含 alignment_source，表示目前的 source_text 是既有的譯文，而 alignment_source 是其原文。
@@ -76,4 +283,38 @@ def build_prompt(
 
   {_language_hint(target_language)}
 
-  {payload}"""
+  {_PAYLOAD_MARK}"""
+
+    # Everything up to the payload's per-chunk tail is the cacheable prefix.
+    before, found, after = rendered.partition(_PAYLOAD_MARK)
+    if not found:
+        return rendered, ""
+    return before + head, tail + after.replace(_PAYLOAD_MARK, payload)
+
+
+def build_prompt(
+    blocks: Iterable[dict],
+    target_language: str,
+    contract_example: dict,
+    context: dict | None,
+    preferred_terms: TermMatcher | list[tuple[str, str]] | None = None,
+    placeholder_tokens: list[str] | None = None,
+    language_hint: str | None = None,
+    mode: str = "direct",
+    compact: bool | None = None,
+    provider: str = "default",
+) -> str:
+    return "".join(
+        build_prompt_parts(
+            blocks,
+            target_language,
+            contract_example,
+            context,
+            preferred_terms,
+            placeholder_tokens,
+            language_hint,
+            mode=mode,
+            compact=compact,
+            provider=provider,
+        )
+    )
@@ -0,0 +1,221 @@
+"""Process-wide fair scheduler for LLM chunk tasks.
+
+Every ``/translate-stream`` job fans its chunks out as async tasks. Without a
+shared gate one 2,000-block workbook fills the backend and every other job
+waits behind it. Chunk tasks now pass through a :class:`FairScheduler` per
+(provider, model), which hands free slots to jobs by deficit round robin:
+each waiting job gets ``quantum * weight`` blocks of credit per round, so
+small jobs are served within one round however large the others are.
+
+The scheduler has no cap of its own: it admits as many chunks as the
+model's :class:`~backend.services.llm_limiter.AdaptiveLimiter` currently
+allows, so chunks queue here, in fair order, rather than in the limiter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from backend.config import settings
+from backend.services.llm_limiter import AdaptiveLimiter, get_limiter
+
+# Smoothing factor for the wait-time average.
+WAIT_EWMA = 0.2
+
+
+class _Ticket:
+    __slots__ = ("cost", "loop", "future", "enqueued", "granted")
+
+    def __init__(self, cost: int, loop: asyncio.AbstractEventLoop):
+        self.cost = cost
+        self.loop = loop
+        self.future = loop.create_future()
+        self.enqueued = time.monotonic()
+        self.granted = False
+
+    def grant(self) -> None:
+        self.granted = True
+
+        def _set() -> None:
+            if not self.future.done():
+                self.future.set_result(None)
+
+        self.loop.call_soon_threadsafe(_set)
+
+
+class _Flow:
+    __slots__ = ("flow_id", "weight", "queue", "deficit", "credited")
+
+    def __init__(self, flow_id: str, weight: float):
+        self.flow_id = flow_id
+        self.weight = weight
+        self.queue: deque[_Ticket] = deque()
+        self.deficit = 0.0
+        self.credited = False
+
+
+class FairScheduler:
+    """Deficit round robin across flows with a cap on chunks in flight.
+
+    With a ``limiter`` the cap is the limiter's current limit; otherwise it
+    is the fixed ``max_in_flight``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int = 1,
+        quantum: int = 10,
+        limiter: AdaptiveLimiter | None = None,
+    ):
+        self.name = name
+        self.limiter = limiter
+        self._max_in_flight = max(1, max_in_flight)
+        self.quantum = max(1, quantum)
+        self.in_flight = 0
+        self._flows: dict[str, _Flow] = {}
+        self._active: deque[str] = deque()
+        self._lock = threading.Lock()
+        self._stats = {"dispatched": 0, "cancelled": 0, "max_wait": 0.0, "avg_wait": 0.0}
+
+    @property
+    def max_in_flight(self) -> int:
+        if self.limiter is not None:
+            return max(1, int(self.limiter.limit))
+        return self._max_in_flight
+
+    def _queued(self) -> int:
+        return sum(len(flow.queue) for flow in self._flows.values())
+
+    def _record_wait(self, waited: float) -> None:
+        self._stats["dispatched"] += 1
+        self._stats["max_wait"] = max(self._stats["max_wait"], waited)
+        self._stats["avg_wait"] += (waited - self._stats["avg_wait"]) * WAIT_EWMA
+
+    def _drop_flow(self, flow: _Flow) -> None:
+        self._flows.pop(flow.flow_id, None)
+        if flow.flow_id in self._active:
+            self._active.remove(flow.flow_id)
+
+    def _dispatch(self) -> None:
+        """Grant free slots in DRR order (caller holds the lock)."""
+        now = time.monotonic()
+        while self.in_flight < self.max_in_flight and self._active:
+            flow = self._flows[self._active[0]]
+            if not flow.credited:
+                flow.deficit += self.quantum * flow.weight
+                flow.credited = True
+            ticket = flow.queue[0]
+            if flow.deficit >= ticket.cost:
+                flow.deficit -= ticket.cost
+                flow.queue.popleft()
+                self.in_flight += 1
+                self._record_wait(now - ticket.enqueued)
+                ticket.grant()
+                if not flow.queue:
+                    self._drop_flow(flow)
+                continue
+            # Out of credit: the flow's turn ends.
+            flow.credited = False
+            self._active.rotate(-1)
+
+    async def acquire(self, flow_id: str, cost: int = 1, weight: float = 1.0) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < self.max_in_flight and not self._active:
+                self.in_flight += 1
+                self._record_wait(0.0)
+                return
+            ticket = _Ticket(max(1, cost), loop)
+            flow = self._flows.get(flow_id)
+            if flow is None:
+                flow = _Flow(flow_id, max(weight, 0.01))
+                self._flows[flow_id] = flow
+                self._active.append(flow_id)
+            flow.queue.append(ticket)
+            self._dispatch()
+        try:
+            await asyncio.shield(ticket.future)
+        except BaseException:
+            with self._lock:
+                self._stats["cancelled"] += 1
+                if ticket.granted:
+                    self.in_flight -= 1
+                else:
+                    flow = self._flows.get(flow_id)
+                    if flow is not None and ticket in flow.queue:
+                        flow.queue.remove(ticket)
+                        if not flow.queue:
+                            self._drop_flow(flow)
+                self._dispatch()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        flow_id: str,
+        cost: int = 1,
+        weight: float = 1.0,
+    ) -> AsyncIterator[None]:
+        await self.acquire(flow_id, cost, weight)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            flows = {
+                flow.flow_id: {
+                    "queued": len(flow.queue),
+                    "oldest_wait": round(now - flow.queue[0].enqueued, 3) if flow.queue else 0.0,
+                }
+                for flow in self._flows.values()
+            }
+            return {
+                "name": self.name,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "queue_depth": self._queued(),
+                "flows": flows,
+                "dispatched": self._stats["dispatched"],
+                "cancelled": self._stats["cancelled"],
+                "avg_wait": round(self._stats["avg_wait"], 3),
+                "max_wait": round(self._stats["max_wait"], 3),
+            }
+
+
+_SCHEDULERS: dict[tuple[str, str], FairScheduler] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_scheduler(provider: str, model: str | None = None) -> FairScheduler:
+    """Return the shared scheduler for ``(provider, model)``, bound to its limiter."""
+    key = (provider or "default", model or "default")
+    with _REGISTRY_LOCK:
+        scheduler = _SCHEDULERS.get(key)
+        if scheduler is None:
+            scheduler = FairScheduler(
+                f"{key[0]}:{key[1]}",
+                quantum=settings.llm_scheduler_quantum,
+                limiter=get_limiter(provider, model),
+            )
+            _SCHEDULERS[key] = scheduler
+        return scheduler
+
+
+def scheduler_stats() -> list[dict]:
+    with _REGISTRY_LOCK:
+        schedulers = list(_SCHEDULERS.values())
+    return [scheduler.stats() for scheduler in schedulers]
@@ -0,0 +1,175 @@
+"""Single-flight coalescing of identical in-flight LLM chunk requests.
+
+``TranslationCache`` only fills in once a chunk completes, so two users
+uploading the same deck, or a ``/translate-stream`` retry after a dropped SSE
+connection, used to send the same chunk to the LLM twice. Chunk requests are
+now keyed on (normalized texts, target language, provider, model, tone,
+vision_context, mode): the first caller leads and makes the request, later
+callers with the same key wait for its outcome instead of issuing their own.
+Only the leader writes the result to the cache.
+
+Sync threads and any event loop can lead or follow each other. A failed or
+cancelled leader fails its followers with :class:`CoalescedRequestError`,
+which the chunk retry loop handles like any other failed attempt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import unicodedata
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from backend.config import settings
+
+
+class CoalescedRequestError(RuntimeError):
+    """The request this caller was waiting on failed; chained to its cause."""
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "").strip()
+
+
+def flight_key(
+    texts: Sequence[str],
+    target_language: str,
+    provider: str,
+    model: str | None,
+    tone: str | None = None,
+    vision_context: bool = True,
+    mode: str = "direct",
+) -> str:
+    raw = json.dumps(
+        [
+            [normalize_text(text) for text in texts],
+            target_language,
+            provider,
+            model or "default",
+            tone or "",
+            vision_context,
+            mode,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("event", "waiters", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+    def finish(self, result: Any, error: BaseException | None) -> None:
+        self.result = result
+        self.error = error
+        self.event.set()
+        for loop, future in self.waiters:
+
+            def _set(future: asyncio.Future = future) -> None:
+                if not future.done():
+                    future.set_result(None)
+
+            loop.call_soon_threadsafe(_set)
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise CoalescedRequestError(str(self.error)) from self.error
+        return self.result
+
+
+class SingleFlight:
+    """Run one call per key at a time and share its outcome with the waiters."""
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "failures": 0}
+
+    def _join(
+        self,
+        key: str,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> tuple[_Call, bool, asyncio.Future | None]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["leaders"] += 1
+                return call, True, None
+            self._stats["coalesced"] += 1
+            future = None
+            if loop is not None:
+                future = loop.create_future()
+                call.waiters.append((loop, future))
+            return call, False, future
+
+    def _finish(self, key: str, call: _Call, result: Any, error: BaseException | None) -> None:
+        with self._lock:
+            # Removed under the lock: later callers lead a fresh request.
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            if error is not None:
+                self._stats["failures"] += 1
+            call.finish(result, error)
+
+    @staticmethod
+    def _leader_error(exc: BaseException) -> BaseException:
+        if isinstance(exc, Exception):
+            return exc
+        return CoalescedRequestError("Coalesced request was cancelled")
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``(result, leader)``; ``fn`` only runs for the leader."""
+        call, leader, _ = self._join(key)
+        if not leader:
+            call.event.wait()
+            return call.outcome(), False
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key, call, None, self._leader_error(exc))
+            raise
+        self._finish(key, call, result, None)
+        return result, True
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Async :meth:`do`; a cancelled follower leaves the leader running."""
+        call, leader, future = self._join(key, asyncio.get_running_loop())
+        if not leader:
+            await asyncio.shield(future)
+            return call.outcome(), False
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._finish(key, call, None, self._leader_error(exc))
+            raise
+        self._finish(key, call, result, None)
+        return result, True
+
+    def stats(self) -> dict:
+        with self._lock:
+            waiting = sum(
+                len(call.waiters) for call in self._calls.values()
+            )
+            return {
+                "enabled": settings.llm_coalesce_requests,
+                "in_flight": len(self._calls),
+                "async_waiters": waiting,
+                **self._stats,
+            }
+
+
+chunk_flights = SingleFlight()
+
+
+def coalesce_stats() -> dict:
+    return chunk_flights.stats()
@@ -0,0 +1,172 @@
+"""Incremental parsing of streamed LLM output into finished blocks.
+
+Streaming clients hand every text delta to a parser. As soon as a block's
+translation is complete in the stream, the block is emitted (index within
+the chunk, translated text) so progress can be pushed before the whole chunk
+finishes. The final result is still parsed and validated from the full text;
+streamed blocks are only an early preview.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import httpx
+
+from backend.services.translate_prompt import BLOCK_RESPONSE_PATTERN, clean_block_text
+
+LOGGER = logging.getLogger(__name__)
+
+# (index within the blocks sent, translated text); may return an awaitable.
+BlockCallback = Callable[[int, str], Any]
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+
+class BatchBlockStreamParser:
+    """Parser for the ``<<<BLOCK:n>>> ... <<<END>>>`` batch format."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self._buffer = ""
+        self._pos = 0
+        self._seen: set[int] = set()
+
+    def feed(self, delta: str) -> list[tuple[int, str]]:
+        self._buffer += delta
+        found = []
+        for match in BLOCK_RESPONSE_PATTERN.finditer(self._buffer, self._pos):
+            self._pos = match.end()
+            idx_str, content = match.groups()
+            if not idx_str.isdigit():
+                continue
+            idx = int(idx_str)
+            text = clean_block_text(content)
+            if 0 <= idx < self.count and idx not in self._seen and text:
+                self._seen.add(idx)
+                found.append((idx, text))
+        return found
+
+
+class JsonBlockStreamParser:
+    """Parser for JSON contracts: ``{"blocks": [{...}, {...}]}``.
+
+    Tracks string/escape state and nesting depth, and decodes each object of
+    the ``blocks`` array as soon as its closing brace arrives. Compact items
+    carry their ``id``; full-schema items are numbered by position.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start: int | None = None
+        self._items = 0
+        self._seen: set[int] = set()
+
+    def _emit(self, raw: str) -> tuple[int, str] | None:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        position = self._items
+        self._items += 1
+        if not isinstance(item, dict):
+            return None
+        try:
+            idx = int(item["id"]) if "id" in item else position
+        except (TypeError, ValueError):
+            return None
+        text = item.get("translated_text")
+        if not isinstance(text, str) or not text or not 0 <= idx < self.count:
+            return None
+        if idx in self._seen:
+            return None
+        self._seen.add(idx)
+        return idx, text
+
+    def _string_char(self, char: str) -> None:
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+
+    def _close(self, char: str, pos: int) -> tuple[int, str] | None:
+        block = None
+        if self._depth == 3 and char == "}" and self._item_start is not None:
+            block = self._emit(self._buffer[self._item_start:pos + 1])
+            self._item_start = None
+        self._depth -= 1
+        return block
+
+    def feed(self, delta: str) -> list[tuple[int, str]]:
+        self._buffer += delta
+        found = []
+        for pos in range(self._pos, len(self._buffer)):
+            char = self._buffer[pos]
+            if self._in_string:
+                self._string_char(char)
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                # Root object, blocks array, then the item objects.
+                if self._depth == 3 and char == "{":
+                    self._item_start = pos
+            elif char in "}]":
+                block = self._close(char, pos)
+                if block is not None:
+                    found.append(block)
+        self._pos = len(self._buffer)
+        return found
+
+
+def block_delta_handler(
+    parser: BatchBlockStreamParser | JsonBlockStreamParser,
+    on_block: BlockCallback,
+) -> DeltaCallback:
+    """Wrap ``on_block`` as a delta callback; callback errors never abort a stream."""
+
+    async def _on_delta(delta: str) -> None:
+        for idx, text in parser.feed(delta):
+            try:
+                result = on_block(idx, text)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                LOGGER.exception("Streamed block callback failed")
+
+    return _on_delta
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[dict]:
+    """Yield decoded ``data:`` payloads of a server-sent events response."""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        yield json.loads(data)
+
+
+async def iter_ndjson(response: httpx.Response) -> AsyncIterator[dict]:
+    """Yield objects of a newline-delimited JSON response (Ollama)."""
+    async for line in response.aiter_lines():
+        if line.strip():
+            yield json.loads(line)
+
+
+async def raise_for_stream_status(response: httpx.Response) -> None:
+    """``raise_for_status`` for streamed responses, with the body loaded."""
+    if response.is_error:
+        await response.aread()
+        response.raise_for_status()
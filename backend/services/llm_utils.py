@@ -4,6 +4,9 @@ import hashlib
 import json
 from collections.abc import Iterable
 
+from backend.services.term_matcher import TermMatcher, as_matcher
+
+
 def safe_json_loads(content: str) -> dict:
     if not content:
         raise ValueError("Empty LLM response content")
@@ -51,16 +54,8 @@ def chunked(
 def tm_respects_terms(
     source_text: str,
     translated_text: str,
-    preferred_terms: list[tuple[str, str]],
+    preferred_terms: TermMatcher | list[tuple[str, str]],
 ) -> bool:
     if not source_text or not translated_text or not preferred_terms:
         return True
-    for source, target in preferred_terms:
-        if not source or not target:
-            continue
-        if (
-            source.lower() in source_text.lower()
-            and target not in translated_text
-        ):
-            return False
-    return True
+    return as_matcher(preferred_terms).respects(source_text, translated_text)
@@ -0,0 +1,260 @@
+"""Content-addressed cache of OCR results.
+
+Logos, screenshots and re-uploaded documents used to be OCR'd from scratch
+every time. Results are stored in SQLite (``data/cache.db``, next to the
+translation and document caches) under the SHA-256 of the image content
+plus every setting that changes the OCR output: engine, language,
+Tesseract options and :data:`OCR_PIPELINE_VERSION`.
+
+The cached value is the raw line list of the OCR engine, before filtering
+and block construction, so one entry serves any shape, page or source the
+same image shows up in.
+
+Settings (environment, like the other ``IMAGE_OCR_*`` options, so pool
+workers see the same values):
+
+* ``IMAGE_OCR_CACHE``: ``0`` disables the cache.
+* ``IMAGE_OCR_CACHE_MAX_MB``: size cap; least recently used entries are
+  evicted first (``0`` for unbounded).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when image preprocessing or line grouping changes the OCR output.
+OCR_PIPELINE_VERSION = 1
+
+# Writes between eviction passes.
+_EVICT_INTERVAL = 100
+
+
+def ocr_cache_enabled() -> bool:
+    return os.getenv("IMAGE_OCR_CACHE", "1").strip() != "0"
+
+
+def _max_bytes() -> int:
+    try:
+        return max(0, int(os.getenv("IMAGE_OCR_CACHE_MAX_MB", "128"))) * 1024 * 1024
+    except ValueError:
+        return 128 * 1024 * 1024
+
+
+def image_digest(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def pil_digest(image: Image.Image) -> str:
+    """Digest of decoded pixels, for images that never existed as a file."""
+    hasher = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    hasher.update(image.tobytes())
+    return hasher.hexdigest()
+
+
+class OcrCache:
+    _instance: OcrCache | None = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.db_path = Path("data/cache.db")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._writes_since_evict = 0
+        try:
+            self._init_db()
+        except Exception as err:
+            LOGGER.error("OcrCache init error: %s", err)
+        self._initialized = True
+
+    def _init_db(self) -> None:
+        query = """
+        CREATE TABLE IF NOT EXISTS ocr_cache (
+            key TEXT PRIMARY KEY,
+            lines_json TEXT,
+            engine TEXT,
+            lang TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at REAL
+        )
+        """
+        conn = self._get_conn()
+        with conn:
+            conn.execute(query)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_used "
+                "ON ocr_cache(last_used_at)"
+            )
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return the long-lived WAL connection owned by the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # OCR pool workers share the file with the server process.
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        if amount:
+            with self._stats_lock:
+                self._stats[name] += amount
+
+    @staticmethod
+    def make_key(digest: str, engine: str, lang: str, cfg: dict) -> str:
+        settings = {
+            "version": OCR_PIPELINE_VERSION,
+            "engine": engine,
+            "lang": lang,
+            "psm": cfg.get("psm"),
+            "oem": cfg.get("oem"),
+            "preserve_interword_spaces": cfg.get("preserve_interword_spaces"),
+        }
+        if engine == "paddle":
+            settings["use_angle"] = os.getenv("PADDLE_OCR_USE_ANGLE", "1").strip()
+        params = json.dumps(settings, sort_keys=True)
+        return hashlib.sha256(f"{digest}:{params}".encode()).hexdigest()
+
+    def get(self, key: str) -> list[dict] | None:
+        if not ocr_cache_enabled():
+            return None
+        try:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT lines_json FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._bump("misses")
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE ocr_cache SET last_used_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+        except Exception as err:
+            LOGGER.error("OcrCache get error: %s", err)
+            return None
+        self._bump("hits")
+        return json.loads(row[0])
+
+    def set(self, key: str, lines: list[dict], engine: str, lang: str) -> None:
+        if not ocr_cache_enabled():
+            return
+        query = (
+            "INSERT OR REPLACE INTO ocr_cache "
+            "(key, lines_json, engine, lang, last_used_at) "
+            "VALUES (?, ?, ?, ?, ?)"
+        )
+        try:
+            conn = self._get_conn()
+            with conn:
+                conn.execute(
+                    query,
+                    (key, json.dumps(lines, ensure_ascii=False), engine, lang, time.time()),
+                )
+        except Exception as err:
+            LOGGER.error("OcrCache set error: %s", err)
+            return
+        self._bump("writes")
+
+        self._writes_since_evict += 1
+        if self._writes_since_evict >= _EVICT_INTERVAL:
+            self._writes_since_evict = 0
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used rows until the cache fits its size cap."""
+        max_bytes = _max_bytes()
+        if max_bytes <= 0:
+            return 0
+        deleted = 0
+        try:
+            conn = self._get_conn()
+            with conn:
+                rows, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(key) + LENGTH(lines_json)), 0) "
+                    "FROM ocr_cache"
+                ).fetchone()
+                if size > max_bytes and rows:
+                    excess = int((size - max_bytes) / (size / rows)) + 1
+                    cursor = conn.execute(
+                        "DELETE FROM ocr_cache WHERE key IN ("
+                        "  SELECT key FROM ocr_cache ORDER BY last_used_at ASC LIMIT ?"
+                        ")",
+                        (excess,),
+                    )
+                    deleted = max(cursor.rowcount, 0)
+        except Exception as err:
+            LOGGER.error("OcrCache evict error: %s", err)
+        self._bump("evictions", deleted)
+        return deleted
+
+    def clear(self) -> None:
+        try:
+            conn = self._get_conn()
+            with conn:
+                conn.execute("DELETE FROM ocr_cache")
+        except Exception as err:
+            LOGGER.error("OcrCache clear error: %s", err)
+
+    def counters(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def merge_counters(self, delta: dict) -> None:
+        """Fold counters collected in an OCR pool worker into this process."""
+        with self._stats_lock:
+            for name, value in delta.items():
+                if name in self._stats:
+                    self._stats[name] += value
+
+    def stats(self) -> dict:
+        """Size of the shared store plus hit/miss counters.
+
+        The counters include lookups done by OCR pool workers, which send
+        theirs back with each job.
+        """
+        rows = size = 0
+        try:
+            rows, size = self._get_conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(key) + LENGTH(lines_json)), 0) "
+                "FROM ocr_cache"
+            ).fetchone()
+        except Exception as err:
+            LOGGER.error("OcrCache stats error: %s", err)
+        counters = self.counters()
+        return {
+            "enabled": ocr_cache_enabled(),
+            "rows": rows,
+            "bytes": size,
+            "max_bytes": _max_bytes(),
+            **counters,
+        }
+
+
+# Singleton
+ocr_cache = OcrCache()
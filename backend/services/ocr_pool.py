@@ -0,0 +1,241 @@
+"""Shared process pool for OCR of images embedded in PPTX/DOCX/XLSX.
+
+Each image costs an OpenCV denoise plus a Tesseract run, so a deck full of
+screenshots took minutes when the extractors OCR'd them one after another.
+The extractors now hand their image jobs to :func:`run_ocr_jobs`, which
+runs them on one process pool shared by every upload:
+
+* ``IMAGE_OCR_WORKERS``: pool size (``auto``: one per CPU, at most 4);
+  ``0``/``1`` keeps OCR in-process.
+* ``IMAGE_OCR_MAX_PER_DOCUMENT``: jobs one document may have in flight, so a
+  single upload cannot take every worker.
+* ``IMAGE_OCR_QUEUE_SIZE``: jobs submitted to the pool across all documents;
+  further submissions wait for a slot.
+
+Results come back in job order. OCR settings are read from the environment
+(and changed at runtime by the OCR settings API), so every job carries the
+submitter's ``IMAGE_OCR_*``/``PDF_OCR_*`` variables to the worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.services.image_ocr import extract_image_text_blocks
+from backend.services.ocr_cache import ocr_cache
+from backend.services.ocr_gate import gate_counters, merge_gate_stats
+
+LOGGER = logging.getLogger(__name__)
+
+# Environment the OCR code reads; copied into workers with every job.
+OCR_ENV_PREFIXES = ("IMAGE_OCR_", "PDF_OCR_", "PADDLE_", "SOURCE_LANGUAGE")
+
+_POOL: ProcessPoolExecutor | None = None
+_QUEUE: threading.BoundedSemaphore | None = None
+_POOL_LOCK = threading.Lock()
+_STATS_LOCK = threading.Lock()
+_STATS = {"documents": 0, "jobs": 0, "pooled": 0, "failed": 0, "pool_restarts": 0}
+
+
+def get_ocr_pool_config() -> dict:
+    def read_int(name: str, default: int) -> int:
+        try:
+            return int(os.getenv(name, str(default)))
+        except ValueError:
+            return default
+
+    if os.getenv("IMAGE_OCR_WORKERS", "auto").strip().lower() == "auto":
+        workers = min(4, os.cpu_count() or 1)
+    else:
+        workers = read_int("IMAGE_OCR_WORKERS", 0)
+    return {
+        "workers": max(0, workers),
+        "per_document": max(1, read_int("IMAGE_OCR_MAX_PER_DOCUMENT", 2)),
+        "queue_size": max(1, read_int("IMAGE_OCR_QUEUE_SIZE", max(workers, 1) * 4)),
+    }
+
+
+def _count(name: str, value: int = 1) -> None:
+    with _STATS_LOCK:
+        _STATS[name] += value
+
+
+def _ocr_env() -> dict[str, str]:
+    return {key: value for key, value in os.environ.items() if key.startswith(OCR_ENV_PREFIXES)}
+
+
+def _run_job(job: dict, env: dict[str, str]) -> tuple[list[dict], dict]:
+    """Worker side: adopt the submitter's OCR settings, then OCR one image.
+
+    Also returns the worker's gate and cache counters for this job, so the
+    server's ``ocr_gate_stats`` and ``ocr_cache.stats`` cover pooled OCR.
+    """
+    for key in [key for key in os.environ if key.startswith(OCR_ENV_PREFIXES)]:
+        if key not in env:
+            del os.environ[key]
+    os.environ.update(env)
+    gate_before, cache_before = gate_counters(), ocr_cache.counters()
+    blocks = extract_image_text_blocks(**job)
+    gate_after, cache_after = gate_counters(), ocr_cache.counters()
+    return blocks, {
+        "gate": {name: gate_after[name] - gate_before[name] for name in gate_after},
+        "cache": {name: cache_after[name] - cache_before[name] for name in cache_after},
+    }
+
+
+def _run_in_process(job: dict) -> list[dict]:
+    try:
+        return extract_image_text_blocks(**job)
+    except Exception as e:
+        _count("failed")
+        LOGGER.warning("Image OCR failed for %s: %s", job.get("image_part"), e)
+        return []
+
+
+def _get_pool(config: dict) -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _POOL, _QUEUE
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=config["workers"],
+                # Workers must not inherit the server's threads and open handles.
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _QUEUE = threading.BoundedSemaphore(config["queue_size"])
+        return _POOL, _QUEUE
+
+
+def reset_ocr_pool(wait_for_jobs: bool = False) -> None:
+    """Shut the pool down; the next document starts a new one."""
+    global _POOL, _QUEUE
+    with _POOL_LOCK:
+        pool, _POOL, _QUEUE = _POOL, None, None
+    if pool is not None:
+        pool.shutdown(wait=wait_for_jobs, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor | None) -> None:
+    """Stop sharing ``pool`` after a failure, if no one has replaced it yet.
+
+    Unlike :func:`reset_ocr_pool` this leaves jobs already queued by other
+    documents to finish (or fail) instead of cancelling them.
+    """
+    global _POOL, _QUEUE
+    with _POOL_LOCK:
+        if pool is None or _POOL is not pool:
+            return
+        _POOL, _QUEUE = None, None
+    pool.shutdown(wait=False)
+
+
+def _submit(pool, queue, job: dict, env: dict[str, str]) -> Future:
+    queue.acquire()
+    try:
+        future = pool.submit(_run_job, job, env)
+    except BaseException:
+        queue.release()
+        raise
+    future.add_done_callback(lambda _: queue.release())
+    return future
+
+
+def media_ocr_jobs(
+    package_path: str, prefix: str, shape_id_prefix: str, skip: set[str] | None = None
+) -> list[dict]:
+    """Jobs for the images under ``prefix`` in an OOXML package.
+
+    Parts in ``skip`` (already OCR'd through their shapes) are left out but
+    keep their index, so ``shape_id`` numbering does not depend on them.
+    """
+    jobs = []
+    try:
+        with zipfile.ZipFile(package_path, "r") as zf:
+            media_files = [n for n in zf.namelist() if n.startswith(prefix)]
+            for idx, name in enumerate(media_files):
+                if skip and name in skip:
+                    continue
+                try:
+                    image_bytes = zf.read(name)
+                except Exception:
+                    continue
+                jobs.append(
+                    {
+                        "image_bytes": image_bytes,
+                        "slide_index": -1,
+                        "shape_id": f"{shape_id_prefix}-{idx}",
+                        "image_part": name,
+                    }
+                )
+    except Exception:
+        pass
+    return jobs
+
+
+def run_ocr_jobs(jobs: list[dict]) -> list[list[dict]]:
+    """OCR one document's images; ``jobs`` are ``extract_image_text_blocks`` kwargs.
+
+    Returns the blocks of each job, in job order. An image that fails to OCR
+    yields no blocks.
+    """
+    config = get_ocr_pool_config()
+    _count("documents")
+    _count("jobs", len(jobs))
+    if config["workers"] <= 1 or len(jobs) < 2:
+        return [_run_in_process(job) for job in jobs]
+
+    env = _ocr_env()
+    results: list[list[dict] | None] = [None] * len(jobs)
+    pending: dict[Future, int] = {}
+    next_job = 0
+    pool = None
+    try:
+        pool, queue = _get_pool(config)
+        while next_job < len(jobs) or pending:
+            while next_job < len(jobs) and len(pending) < config["per_document"]:
+                pending[_submit(pool, queue, jobs[next_job], env)] = next_job
+                next_job += 1
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index], counters = future.result()
+                    merge_gate_stats(counters["gate"])
+                    ocr_cache.merge_counters(counters["cache"])
+                    _count("pooled")
+                except (BrokenProcessPool, CancelledError):
+                    raise
+                except Exception as e:
+                    _count("failed")
+                    LOGGER.warning("Image OCR failed for %s: %s", jobs[index].get("image_part"), e)
+                    results[index] = []
+    except (BrokenProcessPool, CancelledError, RuntimeError, OSError) as e:
+        # A crashed worker breaks the whole pool, and a reset elsewhere
+        # cancels queued jobs; finish this document here.
+        LOGGER.warning("OCR pool failed, finishing in-process: %s", e or type(e).__name__)
+        _count("pool_restarts")
+        _discard_pool(pool)
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = _run_in_process(jobs[index])
+    return results
+
+
+def ocr_pool_stats() -> dict:
+    config = get_ocr_pool_config()
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    with _POOL_LOCK:
+        running = _POOL is not None
+    return {**config, "running": running, **stats}
@@ -0,0 +1,313 @@
+"""Routing, model batching and keep-alive for Ollama backends.
+
+Ollama keeps a handful of models in memory and unloads them after
+``keep_alive`` (5 minutes by default). When glossary extraction asks for a
+different model mid-job, a GPU-bound server swaps models for every request.
+:class:`OllamaManager` sits in front of one or more Ollama endpoints and:
+
+* sends ``keep_alive`` with every request; the translation model
+  (``ollama_model``) can be pinned with a negative keep-alive;
+* routes each request to the least-loaded endpoint, preferring one that
+  served the same model last (already warm);
+* batches requests per model on an endpoint: with ``ollama_model_exclusive``
+  another model only gets the endpoint once it drains, and a model that
+  keeps the endpoint for ``ollama_model_batch`` admissions while others wait
+  stops being admitted so the endpoint can switch.
+
+Waiters can be threads (sync translator, glossary extraction) or coroutines
+on any event loop. An endpoint that refuses connections is skipped for
+``ollama_endpoint_retry`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+import httpx
+
+from backend.config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _keep_alive_value(value: str) -> str | int:
+    # Ollama takes durations ("30m") or seconds; "-1" must be sent as a number.
+    value = value.strip()
+    return int(value) if re.fullmatch(r"-?\d+", value) else value
+
+
+def configured_endpoints() -> list[str]:
+    raw = settings.ollama_endpoints or settings.ollama_base_url
+    endpoints = [url.strip().rstrip("/") for url in raw.split(",") if url.strip()]
+    return list(dict.fromkeys(endpoints))
+
+
+class _Waiter:
+    __slots__ = ("model", "loop", "future", "event")
+
+    def __init__(self, model: str, loop: asyncio.AbstractEventLoop | None = None):
+        self.model = model
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = threading.Event() if loop is None else None
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+            return
+
+        def _set() -> None:
+            if not self.future.done():
+                self.future.set_result(None)
+
+        self.loop.call_soon_threadsafe(_set)
+
+    def reset(self) -> None:
+        if self.event is not None:
+            self.event.clear()
+        elif self.future.done():
+            self.future = self.loop.create_future()
+
+
+class OllamaEndpoint:
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.in_flight = 0
+        self.model: str | None = None
+        self.served = 0
+        self.requests = 0
+        self.switches = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+
+class OllamaManager:
+    """Least-loaded, model-batching router over a set of Ollama endpoints."""
+
+    def __init__(
+        self,
+        endpoints: list[str],
+        max_in_flight: int = 4,
+        exclusive: bool = True,
+        max_batch: int = 8,
+    ):
+        self.endpoints = [OllamaEndpoint(url.rstrip("/")) for url in endpoints]
+        self.max_in_flight = max(1, max_in_flight)
+        self.exclusive = exclusive
+        self.max_batch = max(1, max_batch)
+        self._waiters: list[_Waiter] = []
+        self._lock = threading.Lock()
+
+    # -- admission -------------------------------------------------------
+
+    def _others_waiting(self, model: str) -> bool:
+        return any(waiter.model != model for waiter in self._waiters)
+
+    def _can_take(self, endpoint: OllamaEndpoint, model: str) -> bool:
+        if endpoint.in_flight >= self.max_in_flight:
+            return False
+        if not self.exclusive:
+            return True
+        if endpoint.model == model:
+            return endpoint.served < self.max_batch or not self._others_waiting(model)
+        return endpoint.in_flight == 0
+
+    def _choose(self, model: str) -> OllamaEndpoint | None:
+        now = time.monotonic()
+        healthy = [ep for ep in self.endpoints if ep.healthy(now)]
+        # With every endpoint marked down, keep trying rather than stall.
+        candidates = [ep for ep in healthy or self.endpoints if self._can_take(ep, model)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda ep: (ep.model != model, ep.in_flight, ep.requests))
+
+    def _start(self, endpoint: OllamaEndpoint, model: str) -> OllamaEndpoint:
+        if endpoint.model == model:
+            endpoint.served += 1
+        else:
+            if endpoint.model is not None:
+                endpoint.switches += 1
+            endpoint.model = model
+            endpoint.served = 1
+        endpoint.in_flight += 1
+        endpoint.requests += 1
+        return endpoint
+
+    def _try_acquire(self, waiter: _Waiter) -> OllamaEndpoint | None:
+        # Caller holds the lock; earlier waiters of the same model go first.
+        for other in self._waiters:
+            if other is waiter:
+                break
+            if other.model == waiter.model:
+                return None
+        endpoint = self._choose(waiter.model)
+        if endpoint is None:
+            return None
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+        return self._start(endpoint, waiter.model)
+
+    def _wake_all(self) -> None:
+        for waiter in self._waiters:
+            waiter.wake()
+
+    def acquire(self, model: str) -> OllamaEndpoint:
+        waiter = _Waiter(model)
+        while True:
+            with self._lock:
+                endpoint = self._try_acquire(waiter)
+                if endpoint is not None:
+                    return endpoint
+                if waiter not in self._waiters:
+                    self._waiters.append(waiter)
+                waiter.reset()
+            waiter.event.wait(1.0)
+
+    async def acquire_async(self, model: str) -> OllamaEndpoint:
+        waiter = _Waiter(model, asyncio.get_running_loop())
+        try:
+            while True:
+                with self._lock:
+                    endpoint = self._try_acquire(waiter)
+                    if endpoint is not None:
+                        return endpoint
+                    if waiter not in self._waiters:
+                        self._waiters.append(waiter)
+                    waiter.reset()
+                    future = waiter.future
+                try:
+                    # Timed so endpoints coming back up are noticed.
+                    await asyncio.wait_for(asyncio.shield(future), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self._wake_all()
+            raise
+
+    def release(self, endpoint: OllamaEndpoint, error: BaseException | None = None) -> None:
+        with self._lock:
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+            if isinstance(error, httpx.RequestError):
+                endpoint.failures += 1
+                endpoint.down_until = time.monotonic() + settings.ollama_endpoint_retry
+                LOGGER.warning("Ollama endpoint %s unreachable: %s", endpoint.base_url, error)
+            self._wake_all()
+
+    @contextmanager
+    def lease(self, model: str) -> Iterator[str]:
+        """Hold an endpoint for one request; yields its base URL."""
+        endpoint = self.acquire(model)
+        try:
+            yield endpoint.base_url
+        except BaseException as exc:
+            self.release(endpoint, exc)
+            raise
+        self.release(endpoint)
+
+    @asynccontextmanager
+    async def lease_async(self, model: str) -> AsyncIterator[str]:
+        endpoint = await self.acquire_async(model)
+        try:
+            yield endpoint.base_url
+        except BaseException as exc:
+            self.release(endpoint, exc)
+            raise
+        self.release(endpoint)
+
+    # -- keep-alive ------------------------------------------------------
+
+    @staticmethod
+    def keep_alive(model: str) -> str | int:
+        if settings.ollama_pin_model and model == settings.ollama_model:
+            return _keep_alive_value(settings.ollama_pinned_keep_alive)
+        return _keep_alive_value(settings.ollama_keep_alive)
+
+    async def preload(self, model: str) -> None:
+        """Load ``model`` on every endpoint (an empty generate request)."""
+        from backend.services.llm_http import get_async_client
+
+        payload = {"model": model, "keep_alive": self.keep_alive(model)}
+        for endpoint in self.endpoints:
+            try:
+                client = get_async_client("ollama", endpoint.base_url)
+                response = await client.post(
+                    f"{endpoint.base_url}/api/generate",
+                    json=payload,
+                    timeout=settings.ollama_timeout,
+                )
+                response.raise_for_status()
+                with self._lock:
+                    endpoint.model = endpoint.model or model
+            except httpx.HTTPError as exc:
+                LOGGER.warning("Preloading %s on %s failed: %s", model, endpoint.base_url, exc)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "exclusive": self.exclusive,
+                "max_in_flight": self.max_in_flight,
+                "waiting": [waiter.model for waiter in self._waiters],
+                "endpoints": [
+                    {
+                        "base_url": ep.base_url,
+                        "in_flight": ep.in_flight,
+                        "model": ep.model,
+                        "requests": ep.requests,
+                        "model_switches": ep.switches,
+                        "failures": ep.failures,
+                        "healthy": ep.healthy(now),
+                    }
+                    for ep in self.endpoints
+                ],
+            }
+
+
+_MANAGERS: dict[tuple[str, ...], OllamaManager] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_ollama_manager(base_url: str | None = None) -> OllamaManager:
+    """Manager for the configured endpoint pool, or one for an ad-hoc URL.
+
+    A ``base_url`` that is part of ``ollama_endpoints`` (or is the default
+    ``ollama_base_url``) shares the pool; any other URL gets its own.
+    """
+    endpoints = configured_endpoints()
+    url = (base_url or "").rstrip("/")
+    key = tuple(endpoints) if not url or url in endpoints else (url,)
+    with _REGISTRY_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = OllamaManager(
+                list(key),
+                max_in_flight=settings.ollama_endpoint_max_in_flight,
+                exclusive=settings.ollama_model_exclusive,
+                max_batch=settings.ollama_model_batch,
+            )
+            _MANAGERS[key] = manager
+        return manager
+
+
+def ollama_stats() -> list[dict]:
+    with _REGISTRY_LOCK:
+        managers = list(_MANAGERS.values())
+    return [manager.stats() for manager in managers]
+
+
+def reset_managers() -> None:
+    """Forget every manager (tests and settings reloads)."""
+    with _REGISTRY_LOCK:
+        _MANAGERS.clear()
@@ -25,6 +25,12 @@ from backend.services.pdf.ocr_engine import (
     get_poppler_path,
     perform_paddle_ocr_on_page,
 )
+from backend.services.pdf.parallel import (
+    extract_pages_parallel,
+    get_parallel_config,
+    should_parallelize,
+)
+from backend.services.pdf.raster import PageRasters
 from backend.services.pdf.table_extract import extract_table_blocks, get_table_config
 from backend.services.image_ocr import extract_image_text_blocks_from_pil
 from backend.services.language_detect import detect_document_languages
@@ -33,19 +39,27 @@ from backend.services.ocr_lang import resolve_ocr_lang_from_doc_lang
 LOGGER = logging.getLogger(__name__)
 
 
-def perform_ocr_on_page(pdf_path: str, page_index: int, config: dict | None = None) -> list[dict]:
+def perform_ocr_on_page(
+    pdf_path: str,
+    page_index: int,
+    config: dict | None = None,
+    rasters: PageRasters | None = None,
+) -> list[dict]:
     cfg = config or get_ocr_config()
     try:
-        images = convert_from_path(
-            pdf_path,
-            first_page=page_index + 1,
-            last_page=page_index + 1,
-            dpi=cfg["dpi"],
-            poppler_path=get_poppler_path(),
-        )
-        if not images:
+        if rasters is not None:
+            image = rasters.array(page_index, cfg["dpi"])
+        else:
+            images = convert_from_path(
+                pdf_path,
+                first_page=page_index + 1,
+                last_page=page_index + 1,
+                dpi=cfg["dpi"],
+                poppler_path=get_poppler_path(),
+            )
+            image = images[0] if images else None
+        if image is None:
             return []
-        image = images[0]
         ocr_data = pytesseract.image_to_data(
             enhance_image_for_ocr(image),
             output_type=pytesseract.Output.DICT,
@@ -102,198 +116,264 @@ def perform_ocr_on_page(pdf_path: str, page_index: int, config: dict | None = No
         return []
 
 
-def extract_blocks(pdf_path: str, preferred_lang: str | None = None) -> dict:  # noqa: C901
-    """Extract text blocks from PDF using PyMuPDF and OCR/table extraction."""
-    doc = fitz.open(pdf_path)
-    if pdfplumber:
-        try:
-            plumber_doc = pdfplumber.open(pdf_path)
-        except Exception:
-            plumber_doc = None
-    else:
-        plumber_doc = None
-    blocks, cfg = [], get_ocr_config()
-    sw, sh = 0, 0
-    doc_primary_lang = preferred_lang or None
+def open_plumber_doc(pdf_path: str):
+    if not pdfplumber:
+        return None
+    try:
+        return pdfplumber.open(pdf_path)
+    except Exception:
+        return None
 
-    for page_index, page in enumerate(doc):
+
+def _text_line_blocks(page, page_index: int, text_dict: dict | None = None) -> list[dict]:
+    """Selectable text of a page, one block per line (paragraph granularity)."""
+    if text_dict is None:
         text_dict = page.get_text("dict")
-        page_blocks = []
-
-        # 1. Detect Tables First for Spatial Filtering
-        table_areas = []
-        if plumber_doc and page_index < len(plumber_doc.pages):
-            try:
-                tables = plumber_doc.pages[page_index].find_tables(table_settings=get_table_config())
-                table_areas = [t.bbox for t in tables if getattr(t, "bbox", None)]
-                if table_areas:
-                    LOGGER.info("Page %s: Detected %s table areas: %s", page_index + 1, len(table_areas), table_areas)
-            except Exception as e:
-                LOGGER.warning("Spatial table detection failed for page %s: %s", page_index + 1, e)
-
-        def is_in_table(bbox):
-            x0, y0, x1, y1 = bbox
-            for tx0, ty0, tx1, ty1 in table_areas:
-                # Check if center of block is inside table area (more robust)
-                cx = (x0 + x1) / 2
-                cy = (y0 + y1) / 2
-                if tx0 <= cx <= tx1 and ty0 <= cy <= ty1:
-                    return True
-            return False
-
-        # 2. Standard text extraction — split by line for paragraph granularity
-        line_id = 0
-        extracted_line_count = 0
-        for b_idx, b in enumerate(text_dict["blocks"]):
-            if b.get("type") != 0:
-                continue
+    page_blocks = []
+    line_id = 0
+    for b_idx, b in enumerate(text_dict["blocks"]):
+        if b.get("type") != 0:
+            continue
 
-            block_bbox = b.get("bbox")
-            # Don't pre-filter. We prefer to deduplicate after we know if table extraction succeeded.
-            # Only skip if it's explicitly marked as a non-text block by PyMuPDF (unlikely here)
-            if False: # Placeholder for potential future logic
+        block_bbox = b.get("bbox")
+        for line in b.get("lines", []):
+            line_text = "".join(
+                span.get("text", "") for span in line.get("spans", [])
+            ).strip()
+            if not line_text:
                 continue
 
-            for line in b.get("lines", []):
-                line_text = "".join(
-                    span.get("text", "") for span in line.get("spans", [])
-                ).strip()
-                if not line_text:
-                    continue
-
-                line_id += 1
-                extracted_line_count += 1
-                line_bbox = line.get("bbox", block_bbox)
-                lx0, ly0, lx1, ly1 = line_bbox
-                first_span = line["spans"][0] if line.get("spans") else {}
-                block = make_block(
-                    slide_index=page_index,
-                    shape_id=b_idx * 100 + line_id,
-                    block_type="pdf_text_block",
-                    source_text=line_text,
-                    x=lx0,
-                    y=ly0,
-                    width=lx1 - lx0,
-                    height=ly1 - ly0,
+            line_id += 1
+            line_bbox = line.get("bbox", block_bbox)
+            lx0, ly0, lx1, ly1 = line_bbox
+            first_span = line["spans"][0] if line.get("spans") else {}
+            block = make_block(
+                slide_index=page_index,
+                shape_id=b_idx * 100 + line_id,
+                block_type="pdf_text_block",
+                source_text=line_text,
+                x=lx0,
+                y=ly0,
+                width=lx1 - lx0,
+                height=ly1 - ly0,
+            )
+            block.update(
+                {
+                    "font_size": first_span.get("size", 10.0),
+                    "font_name": first_span.get("font", "helv"),
+                    "page_no": page_index + 1,
+                }
+            )
+            page_blocks.append(block)
+    return page_blocks
+
+
+def initial_document_language(doc, preferred_lang: str | None = None) -> str | None:
+    """Language of the first page with selectable text (for sharded extraction)."""
+    if preferred_lang:
+        return preferred_lang
+    for page_index, page in enumerate(doc):
+        line_blocks = _text_line_blocks(page, page_index)
+        if line_blocks:
+            return detect_document_languages(line_blocks).get("primary")
+    return None
+
+
+def _merge_table_blocks(page_blocks: list[dict], table_blocks: list[dict]) -> list[dict]:
+    # Deduplicate: preferring table blocks over standard lines
+    final_page_blocks = []
+    standard_lines = [b for b in page_blocks if not b.get("is_table")]
+
+    # For each standard line, check if it's "covered" by a table cell
+    for sl in standard_lines:
+        s_x0, s_y0, s_w, s_h = sl["x"], sl["y"], sl["width"], sl["height"]
+        scx, scy = s_x0 + s_w / 2, s_y0 + s_h / 2
+
+        is_covered = False
+        for tb in table_blocks:
+            tx0, ty0, tw, th = tb["x"], tb["y"], tb["width"], tb["height"]
+            if tx0 <= scx <= tx0 + tw and ty0 <= scy <= ty0 + th:
+                is_covered = True
+                break
+
+        if not is_covered:
+            final_page_blocks.append(sl)
+
+    final_page_blocks.extend(table_blocks)
+    return final_page_blocks
+
+
+def _ocr_fallback(
+    pdf_path: str,
+    page_index: int,
+    cfg: dict,
+    ocr_lang: str | None,
+    rasters: PageRasters,
+) -> list[dict]:
+    ocr_cfg = dict(cfg)
+    if ocr_lang:
+        ocr_cfg["lang"] = ocr_lang
+    ocr_func = (
+        perform_paddle_ocr_on_page if ocr_cfg.get("engine") == "paddle" else perform_ocr_on_page
+    )
+    ocr_result = ocr_func(pdf_path, page_index, ocr_cfg, rasters=rasters)
+    if isinstance(ocr_result, tuple):
+        ob, conf = ocr_result
+    else:
+        ob, conf = ocr_result, 0
+    if (
+        ocr_cfg.get("paddle_fallback")
+        and ocr_cfg.get("engine") != "paddle"
+        and conf < 60
+        and len(ob) < 5
+    ):
+        pb, _ = perform_paddle_ocr_on_page(pdf_path, page_index, ocr_cfg, rasters=rasters)
+        if len(pb) > len(ob):
+            ob = pb
+    return ob
+
+
+def extract_page(  # noqa: C901
+    pdf_path: str,
+    page,
+    page_index: int,
+    plumber_doc,
+    rasters: PageRasters,
+    cfg: dict,
+    preferred_lang: str | None = None,
+    doc_primary_lang: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """Extract one page; returns its blocks and its detected language.
+
+    Pages are independent apart from ``doc_primary_lang`` (the OCR language
+    for pages without text of their own), so this runs the same in-process
+    or in a worker of ``pdf.parallel``.
+    """
+    text_dict = page.get_text("dict")
+    plumber_page = (
+        plumber_doc.pages[page_index]
+        if plumber_doc and page_index < len(plumber_doc.pages)
+        else None
+    )
+
+    # 1. Detect Tables First for Spatial Filtering
+    if plumber_page is not None:
+        try:
+            tables = plumber_page.find_tables(table_settings=get_table_config())
+            table_areas = [t.bbox for t in tables if getattr(t, "bbox", None)]
+            if table_areas:
+                LOGGER.info(
+                    "Page %s: Detected %s table areas: %s",
+                    page_index + 1,
+                    len(table_areas),
+                    table_areas,
                 )
-                block.update(
-                    {
-                        "font_size": first_span.get("size", 10.0),
-                        "font_name": first_span.get("font", "helv"),
-                        "page_no": page_index + 1,
-                    }
+        except Exception as e:
+            LOGGER.warning("Spatial table detection failed for page %s: %s", page_index + 1, e)
+
+    # 2. Standard text extraction — split by line for paragraph granularity
+    page_blocks = _text_line_blocks(page, page_index, text_dict)
+
+    # 3. Table extraction
+    if plumber_page is not None:
+        force_ocr = len(page_blocks) == 0
+        need_table_image = os.getenv("PDF_TABLE_LINE_DETECT", "1").strip() == "1"
+        # The page is rendered only if a table cell actually needs OCR.
+        table_blocks = extract_table_blocks(
+            plumber_page,
+            page_index,
+            None,
+            cfg,
+            force_ocr,
+            rasters=rasters if force_ocr or need_table_image else None,
+        )
+        page_blocks = _merge_table_blocks(page_blocks, table_blocks)
+
+    page_lang = None
+    if page_blocks and not preferred_lang:
+        page_lang = detect_document_languages(page_blocks).get("primary")
+
+    ocr_lang = resolve_ocr_lang_from_doc_lang(page_lang or doc_primary_lang)
+
+    # 3. OCR for image text on page render
+    if not page_blocks or os.getenv("IMAGE_OCR_PDF", "1").strip() == "1":
+        try:
+            page_image = rasters.image(page_index, cfg["dpi"])
+            if page_image is not None:
+                page_width = page.rect.width
+                page_height = page.rect.height
+                image_blocks = extract_image_text_blocks_from_pil(
+                    page_image,
+                    page_index=page_index,
+                    page_width=page_width,
+                    page_height=page_height,
+                    source="pdf",
+                    ocr_lang=ocr_lang,
                 )
-                page_blocks.append(block)
-
-        # 3. Table extraction
-        if plumber_doc and page_index < len(plumber_doc.pages):
-            force_ocr = len(page_blocks) == 0
-            page_image = None
-            need_table_image = os.getenv("PDF_TABLE_LINE_DETECT", "1").strip() == "1"
-            if force_ocr or need_table_image:
-                try:
-                    imgs = convert_from_path(
-                        pdf_path,
-                        first_page=page_index + 1,
-                        last_page=page_index + 1,
-                        dpi=cfg["dpi"],
-                        poppler_path=get_poppler_path(),
-                    )
-                    page_image = imgs[0] if imgs else None
-                except Exception:
-                    pass
-
-            table_blocks = extract_table_blocks(
-                plumber_doc.pages[page_index],
-                page_index,
-                page_image,
-                cfg,
-                force_ocr,
+                page_blocks.extend(image_blocks)
+        except Exception:
+            pass
+
+    # 4. OCR Fallback if still no blocks
+    if not page_blocks:
+        page_blocks.extend(_ocr_fallback(pdf_path, page_index, cfg, ocr_lang, rasters))
+
+    return page_blocks, page_lang
+
+
+def _extract_sequential(
+    pdf_path: str,
+    doc,
+    cfg: dict,
+    preferred_lang: str | None,
+) -> list[list[dict]]:
+    plumber_doc = open_plumber_doc(pdf_path)
+    rasters = PageRasters(doc, pdf_path)
+    doc_primary_lang = preferred_lang or None
+    pages = []
+    try:
+        for page_index, page in enumerate(doc):
+            page_blocks, page_lang = extract_page(
+                pdf_path, page, page_index, plumber_doc, rasters, cfg,
+                preferred_lang, doc_primary_lang,
             )
-            # Deduplicate: preferring table blocks over standard lines
-            final_page_blocks = []
-            standard_lines = [b for b in page_blocks if not b.get("is_table")]
-            
-            # For each standard line, check if it's "covered" by a table cell
-            for sl in standard_lines:
-                s_x0, s_y0, s_w, s_h = sl["x"], sl["y"], sl["width"], sl["height"]
-                scx, scy = s_x0 + s_w/2, s_y0 + s_h/2
-                
-                is_covered = False
-                for tb in table_blocks:
-                    tx0, ty0, tw, th = tb["x"], tb["y"], tb["width"], tb["height"]
-                    if tx0 <= scx <= tx0 + tw and ty0 <= scy <= ty0 + th:
-                        is_covered = True
-                        break
-                
-                if not is_covered:
-                    final_page_blocks.append(sl)
-            
-            final_page_blocks.extend(table_blocks)
-            page_blocks = final_page_blocks
-
-        page_lang = None
-        if page_blocks and not preferred_lang:
-            page_lang = detect_document_languages(page_blocks).get("primary")
             if not doc_primary_lang and page_lang:
                 doc_primary_lang = page_lang
+            pages.append(page_blocks)
+    finally:
+        if plumber_doc:
+            plumber_doc.close()
+    LOGGER.debug("pdf_extract rendered %s page rasters", rasters.renders)
+    return pages
 
-        ocr_lang = resolve_ocr_lang_from_doc_lang(page_lang or doc_primary_lang)
-
-        # 3. OCR for image text on page render
-        if not page_blocks or os.getenv("IMAGE_OCR_PDF", "1").strip() == "1":
-            try:
-                imgs = convert_from_path(
-                    pdf_path,
-                    first_page=page_index + 1,
-                    last_page=page_index + 1,
-                    dpi=cfg["dpi"],
-                    poppler_path=get_poppler_path(),
-                )
-                page_image = imgs[0] if imgs else None
-                if page_image is not None:
-                    page_width = page.rect.width
-                    page_height = page.rect.height
-                    image_blocks = extract_image_text_blocks_from_pil(
-                        page_image,
-                        page_index=page_index,
-                        page_width=page_width,
-                        page_height=page_height,
-                        source="pdf",
-                        ocr_lang=ocr_lang,
-                    )
-                    page_blocks.extend(image_blocks)
-            except Exception:
-                pass
-
-        # 4. OCR Fallback if still no blocks
-        if not page_blocks:
-            ocr_cfg = dict(cfg)
-            if ocr_lang:
-                ocr_cfg["lang"] = ocr_lang
-            ocr_func = (
-                perform_paddle_ocr_on_page if ocr_cfg.get("engine") == "paddle" else perform_ocr_on_page
-            )
-            ocr_result = ocr_func(pdf_path, page_index, ocr_cfg)
-            if isinstance(ocr_result, tuple):
-                ob, conf = ocr_result
-            else:
-                ob, conf = ocr_result, 0
-            if (
-                ocr_cfg.get("paddle_fallback")
-                and ocr_cfg.get("engine") != "paddle"
-                and conf < 60
-                and len(ob) < 5
-            ):
-                pb, _ = perform_paddle_ocr_on_page(pdf_path, page_index, ocr_cfg)
-                if len(pb) > len(ob):
-                    ob = pb
-            page_blocks.extend(ob)
-
-        blocks.extend(page_blocks)
-
-    if plumber_doc:
-        plumber_doc.close()
+
+def extract_blocks(
+    pdf_path: str,
+    preferred_lang: str | None = None,
+    workers: int | None = None,
+) -> dict:
+    """Extract text blocks from PDF using PyMuPDF and OCR/table extraction.
+
+    With ``PDF_EXTRACT_WORKERS`` (or ``workers``) above 1, documents of at
+    least ``PDF_EXTRACT_PARALLEL_MIN_PAGES`` pages are extracted page-parallel
+    in a process pool; the result is the same as sequential extraction.
+    """
+    doc = fitz.open(pdf_path)
+    cfg = get_ocr_config()
+    sw, sh = 0, 0
+    page_count = len(doc)
+
+    workers = get_parallel_config()["workers"] if workers is None else workers
+    if should_parallelize(page_count, workers):
+        doc_lang = initial_document_language(doc, preferred_lang)
+        pages = extract_pages_parallel(
+            pdf_path, page_count, cfg, preferred_lang, doc_lang, workers
+        )
+    else:
+        pages = _extract_sequential(pdf_path, doc, cfg, preferred_lang)
+
+    # Per-page results are merged in page order before clustering.
+    blocks = [block for page_blocks in pages for block in page_blocks]
     for block in blocks:
         block.setdefault("x", 0.0)
         block.setdefault("y", 0.0)
@@ -311,13 +391,12 @@ def extract_blocks(pdf_path: str, preferred_lang: str | None = None) -> dict:  #
 
     LOGGER.info(
         "pdf_extract complete: pages=%s, dimensions=%sx%s, refined blocks from %s to %s",
-        len(doc),
+        page_count,
         sw,
         sh,
         len(blocks),
         len(clustered),
     )
-    page_count = len(doc)
     if hasattr(doc, "close"):
         doc.close()
     return {"blocks": clustered, "page_count": page_count, "slide_width": sw, "slide_height": sh}
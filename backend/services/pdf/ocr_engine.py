@@ -1,7 +1,10 @@
+from __future__ import annotations
+
 import logging
 import os
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 os.environ.setdefault("FLAGS_use_mkldnn", "0")
 os.environ.setdefault("FLAGS_enable_onednn", "0")
@@ -20,13 +23,19 @@ from backend.services.pdf.ocr_paddle import (
 )
 from backend.services.ocr_lang import map_source_lang_to_tesseract
 
+if TYPE_CHECKING:
+    from backend.services.pdf.raster import PageRasters
+
 LOGGER = logging.getLogger(__name__)
 
 
 def enhance_image_for_ocr(pil_img):
-    """Apply OpenCV preprocessing to improve OCR accuracy."""
+    """Apply OpenCV preprocessing to improve OCR accuracy.
+
+    Accepts a PIL image or an RGB array (used as is, without a copy).
+    """
     try:
-        open_cv_image = np.array(pil_img)
+        open_cv_image = np.asarray(pil_img)
         if len(open_cv_image.shape) == 3:
             if open_cv_image.shape[2] == 3:
                 open_cv_image = cv2.cvtColor(open_cv_image, cv2.COLOR_RGB2BGR)
@@ -169,23 +178,36 @@ def get_poppler_path() -> str | None:
     return str(default_path) if default_path.exists() else None
 
 
+def _page_raster(
+    pdf_path: str,
+    page_index: int,
+    dpi: int,
+    rasters: PageRasters | None,
+):
+    if rasters is not None:
+        return rasters.array(page_index, dpi)
+    images = convert_from_path(
+        pdf_path,
+        first_page=page_index + 1,
+        last_page=page_index + 1,
+        dpi=dpi,
+        poppler_path=get_poppler_path(),
+    )
+    return images[0] if images else None
+
+
 def perform_ocr_on_page(
     pdf_path: str,
     page_index: int,
     config: dict | None = None,
+    rasters: PageRasters | None = None,
 ) -> tuple[list[dict], float]:
     cfg = config or get_ocr_config()
     try:
-        images = convert_from_path(
-            pdf_path,
-            first_page=page_index + 1,
-            last_page=page_index + 1,
-            dpi=cfg["dpi"],
-            poppler_path=get_poppler_path(),
-        )
-        if not images:
+        raster = _page_raster(pdf_path, page_index, cfg["dpi"], rasters)
+        if raster is None:
             return [], 0
-        image = enhance_image_for_ocr(images[0])
+        image = enhance_image_for_ocr(raster)
         ocr_data = pytesseract.image_to_data(
             image,
             output_type=pytesseract.Output.DICT,
@@ -262,20 +284,15 @@ def perform_paddle_ocr_on_page(
     pdf_path: str,
     page_index: int,
     config: dict | None = None,
+    rasters: PageRasters | None = None,
 ) -> tuple[list[dict], float]:
     cfg = config or get_ocr_config()
     try:
-        images = convert_from_path(
-            pdf_path,
-            first_page=page_index + 1,
-            last_page=page_index + 1,
-            dpi=cfg["dpi"],
-            poppler_path=get_poppler_path(),
-        )
-        if not images:
+        raster = _page_raster(pdf_path, page_index, cfg["dpi"], rasters)
+        if raster is None:
             return [], 0
         scale = 72.0 / float(cfg["dpi"])
-        image = enhance_image_for_ocr(images[0])
+        image = enhance_image_for_ocr(raster)
         lines = paddle_ocr_image(image, cfg["lang"])
         blocks = []
         for idx, line in enumerate(lines, start=1):
@@ -0,0 +1,217 @@
+"""Page-parallel PDF extraction across a process pool.
+
+Text extraction, ``find_tables``, rendering and OCR are CPU-bound and
+independent per page, so large documents are sharded over worker
+processes. Each worker opens the document (PyMuPDF, pdfplumber and a
+``PageRasters``) once in its initializer and then extracts the pages it is
+handed. ``shape_id`` numbering only depends on the page, and results are
+re-assembled in page order, so the output matches sequential extraction.
+
+Settings (environment, like the other ``PDF_*`` options):
+
+* ``PDF_EXTRACT_WORKERS``: worker processes; ``0``/``1`` extracts in-process,
+  ``auto`` uses one per CPU.
+* ``PDF_EXTRACT_PARALLEL_MIN_PAGES``: smaller documents stay in-process
+  (starting workers costs more than it saves).
+* ``PDF_EXTRACT_WORKER_MEMORY_MB``: address-space cap per worker (POSIX).
+  A page that fails under the cap is retried once in a fresh capped worker
+  and yields no blocks if it fails again; it is never redone uncapped in
+  the server process.
+* ``PDF_EXTRACT_MAX_TASKS_PER_CHILD``: recycle workers after N pages to
+  return memory held by OCR engines.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+
+from backend.services.pdf.raster import PageRasters
+
+LOGGER = logging.getLogger(__name__)
+
+# Per-worker state, set by _init_worker.
+_WORKER: dict = {}
+
+
+def get_parallel_config() -> dict:
+    def read_int(name: str, default: int) -> int:
+        try:
+            return int(os.getenv(name, str(default)))
+        except ValueError:
+            return default
+
+    workers_env = os.getenv("PDF_EXTRACT_WORKERS", "0").strip().lower()
+    if workers_env == "auto":
+        workers = os.cpu_count() or 1
+    else:
+        workers = read_int("PDF_EXTRACT_WORKERS", 0)
+    return {
+        "workers": max(0, workers),
+        "min_pages": read_int("PDF_EXTRACT_PARALLEL_MIN_PAGES", 8),
+        "memory_mb": read_int("PDF_EXTRACT_WORKER_MEMORY_MB", 0),
+        "max_tasks_per_child": read_int("PDF_EXTRACT_MAX_TASKS_PER_CHILD", 0),
+    }
+
+
+def should_parallelize(page_count: int, workers: int) -> bool:
+    return workers > 1 and page_count > 1 and page_count >= get_parallel_config()["min_pages"]
+
+
+def _limit_memory(memory_mb: int) -> None:
+    if memory_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        LOGGER.warning("Could not cap PDF worker memory at %s MB: %s", memory_mb, e)
+
+
+def _init_worker(pdf_path: str, memory_mb: int) -> None:
+    # extract imports this module; import it back lazily.
+    from backend.services.pdf.extract import open_plumber_doc
+
+    _limit_memory(memory_mb)
+    doc = fitz.open(pdf_path)
+    _WORKER.update(
+        pdf_path=pdf_path,
+        doc=doc,
+        plumber_doc=open_plumber_doc(pdf_path),
+        rasters=PageRasters(doc, pdf_path),
+    )
+
+
+def _extract_page_task(task: tuple) -> tuple[int, list[dict]]:
+    from backend.services.pdf.extract import extract_page
+
+    page_index, cfg, preferred_lang, doc_lang = task
+    doc = _WORKER["doc"]
+    page_blocks, _ = extract_page(
+        _WORKER["pdf_path"],
+        doc[page_index],
+        page_index,
+        _WORKER["plumber_doc"],
+        _WORKER["rasters"],
+        cfg,
+        preferred_lang,
+        doc_lang,
+    )
+    return page_index, page_blocks
+
+
+def extract_pages_parallel(
+    pdf_path: str,
+    page_count: int,
+    cfg: dict,
+    preferred_lang: str | None,
+    doc_lang: str | None,
+    workers: int,
+) -> list[list[dict]]:
+    """Blocks of every page, in page order, extracted by ``workers`` processes.
+
+    ``doc_lang`` stands in for the language sequential extraction learns
+    from earlier pages. Pages a worker could not extract (crash, memory cap)
+    are redone in-process, or, when a memory cap is set, retried in a fresh
+    capped worker.
+    """
+    config = get_parallel_config()
+    workers = max(1, min(workers, page_count))
+    tasks = [(page_index, cfg, preferred_lang, doc_lang) for page_index in range(page_count)]
+    pool_args = {
+        "max_workers": workers,
+        # Workers must not inherit the server's threads and open handles.
+        "mp_context": multiprocessing.get_context("spawn"),
+        "initializer": _init_worker,
+        "initargs": (pdf_path, config["memory_mb"]),
+    }
+    if config["max_tasks_per_child"] > 0:
+        pool_args["max_tasks_per_child"] = config["max_tasks_per_child"]
+
+    results: dict[int, list[dict]] = {}
+    try:
+        with ProcessPoolExecutor(**pool_args) as pool:
+            futures = [pool.submit(_extract_page_task, task) for task in tasks]
+            for future in futures:
+                try:
+                    page_index, page_blocks = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    LOGGER.warning("PDF worker failed on a page: %s", e)
+                    continue
+                results[page_index] = page_blocks
+    except (BrokenProcessPool, OSError) as e:
+        LOGGER.warning("PDF worker pool failed, finishing in-process: %s", e)
+
+    missing = [page_index for page_index in range(page_count) if page_index not in results]
+    if missing and config["memory_mb"] > 0:
+        # Redoing these in the server would lift the cap they just hit.
+        results.update(
+            _retry_in_fresh_workers({**pool_args, "max_workers": 1}, tasks, missing)
+        )
+    elif missing:
+        results.update(_extract_in_process(pdf_path, missing, cfg, preferred_lang, doc_lang))
+    LOGGER.info(
+        "pdf_extract parallel: pages=%s, workers=%s, redone=%s, dropped=%s",
+        page_count,
+        workers,
+        len(missing),
+        page_count - len(results),
+    )
+    return [results.get(page_index, []) for page_index in range(page_count)]
+
+
+def _retry_in_fresh_workers(
+    pool_args: dict, tasks: list[tuple], page_indices: list[int]
+) -> dict[int, list[dict]]:
+    """Retry each page once in its own capped worker; failures yield no blocks."""
+    results: dict[int, list[dict]] = {}
+    for page_index in page_indices:
+        try:
+            with ProcessPoolExecutor(**pool_args) as pool:
+                _, page_blocks = pool.submit(_extract_page_task, tasks[page_index]).result()
+        except Exception as e:
+            LOGGER.warning(
+                "PDF page %s failed again under the worker memory cap, skipping it: %s",
+                page_index + 1,
+                e,
+            )
+            continue
+        results[page_index] = page_blocks
+    return results
+
+
+def _extract_in_process(
+    pdf_path: str,
+    page_indices: list[int],
+    cfg: dict,
+    preferred_lang: str | None,
+    doc_lang: str | None,
+) -> dict[int, list[dict]]:
+    from backend.services.pdf.extract import open_plumber_doc, extract_page
+
+    doc = fitz.open(pdf_path)
+    plumber_doc = open_plumber_doc(pdf_path)
+    rasters = PageRasters(doc, pdf_path)
+    try:
+        return {
+            page_index: extract_page(
+                pdf_path, doc[page_index], page_index, plumber_doc, rasters, cfg,
+                preferred_lang, doc_lang,
+            )[0]
+            for page_index in page_indices
+        }
+    finally:
+        if plumber_doc:
+            plumber_doc.close()
+        doc.close()
@@ -0,0 +1,84 @@
+import logging
+from collections import OrderedDict
+
+import numpy as np
+from pdf2image import convert_from_path
+from PIL import Image
+
+from backend.services.pdf.ocr_engine import get_poppler_path
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PageRasters:
+    """Page rasters of one open PDF, each (page, dpi) rendered at most once.
+
+    Table cell OCR, image OCR and the OCR fallbacks used to call
+    ``convert_from_path`` separately, each spawning ``pdftoppm`` to re-parse
+    the whole file. Pages are now rendered in-process from the already-open
+    ``fitz`` document; :meth:`array` hands the pixmap's samples to
+    NumPy/OpenCV without copying. Poppler is only used if MuPDF fails.
+    """
+
+    def __init__(self, doc, pdf_path: str | None = None, max_entries: int = 2):
+        self._doc = doc
+        self._pdf_path = pdf_path
+        self._max_entries = max(1, max_entries)
+        # (page, dpi) -> (pixmap kept alive for the view, RGB array, PIL image)
+        self._cache: OrderedDict[tuple[int, int], list] = OrderedDict()
+        self.renders = 0
+
+    def array(self, page_index: int, dpi: int) -> np.ndarray | None:
+        """``(height, width, 3)`` RGB view of the page; read-only, not copied."""
+        entry = self._entry(page_index, dpi)
+        return entry[1] if entry else None
+
+    def image(self, page_index: int, dpi: int) -> Image.Image | None:
+        """The page as a PIL image (built from the cached raster once)."""
+        entry = self._entry(page_index, dpi)
+        if not entry:
+            return None
+        if entry[2] is None:
+            entry[2] = Image.fromarray(entry[1])
+        return entry[2]
+
+    def _entry(self, page_index: int, dpi: int) -> list | None:
+        key = (page_index, int(dpi))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        entry = self._render(page_index, key[1])
+        self._cache[key] = entry
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+        return entry
+
+    def _render(self, page_index: int, dpi: int) -> list | None:
+        self.renders += 1
+        try:
+            pix = self._doc[page_index].get_pixmap(dpi=dpi, alpha=False)
+            if pix.n != 3 or pix.stride != pix.width * 3:
+                raise ValueError(f"unexpected pixmap layout n={pix.n} stride={pix.stride}")
+            view = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+            # Shared by every consumer of the page; nobody may draw on it.
+            view.flags.writeable = False
+            return [pix, view.reshape(pix.height, pix.width, 3), None]
+        except Exception as e:
+            LOGGER.debug("MuPDF render failed for page %s: %s", page_index + 1, e)
+        if not self._pdf_path:
+            return None
+        try:
+            images = convert_from_path(
+                self._pdf_path,
+                first_page=page_index + 1,
+                last_page=page_index + 1,
+                dpi=dpi,
+                poppler_path=get_poppler_path(),
+            )
+        except Exception as e:
+            LOGGER.warning("Rendering page %s failed: %s", page_index + 1, e)
+            return None
+        if not images:
+            return None
+        image = images[0].convert("RGB")
+        return [None, np.asarray(image), image]
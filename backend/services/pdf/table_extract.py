@@ -128,8 +128,13 @@ def extract_table_blocks(  # noqa: C901
     page_image,
     cfg: dict,
     force_cell_ocr: bool,
+    rasters=None,
 ) -> list[dict]:
-    """Robust table cell extraction with selectable-text and OCR fallbacks."""
+    """Robust table cell extraction with selectable-text and OCR fallbacks.
+
+    Without ``page_image``, the page is taken from ``rasters`` (a
+    ``PageRasters``) the first time a cell needs OCR.
+    """
     blocks: list[dict] = []
     if not plumber_page:
         return blocks
@@ -189,6 +194,8 @@ def extract_table_blocks(  # noqa: C901
                     cbottom = ctop + ch
 
                 # 2. OCR Fallback for empty text layer
+                if (not text or force_cell_ocr) and page_image is None and rasters is not None:
+                    page_image = rasters.image(page_index, cfg.get("dpi", 200))
                 if (not text or force_cell_ocr) and page_image:
                     try:
                         x0_px, y0_px = int(cx0 * scale), int(ctop * scale)
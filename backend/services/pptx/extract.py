@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
@@ -10,9 +12,52 @@ from .extract_iterators import (
     iter_table_blocks,
     iter_textbox_blocks,
 )
-from backend.services.image_ocr import extract_image_text_blocks
 from backend.services.language_detect import detect_document_languages
 from backend.services.ocr_lang import resolve_ocr_lang_from_doc_lang
+from backend.services.ocr_pool import media_ocr_jobs, run_ocr_jobs
+
+
+def _picture_jobs(slide, slide_index: int) -> list[dict]:
+    jobs = []
+    for shape in iter_shapes(slide.shapes):
+        try:
+            if shape.shape_type != MSO_SHAPE_TYPE.PICTURE:
+                continue
+            part = slide.part.related_part(shape._element.blip_rId)  # noqa: SLF001
+            image_part = str(part.partname)
+            jobs.append(
+                {
+                    "image_bytes": part.blob,
+                    "slide_index": slide_index,
+                    "shape_id": getattr(shape, "shape_id", None) or image_part or slide_index,
+                    "image_part": image_part,
+                    "shape_left": shape.left,
+                    "shape_top": shape.top,
+                    "shape_width": shape.width,
+                    "shape_height": shape.height,
+                }
+            )
+        except Exception:
+            continue
+    return jobs
+
+
+def _place_on_slide(job: dict, image_blocks: list[dict]) -> list[dict]:
+    """Map OCR boxes from image pixels to the picture's position on the slide."""
+    if not image_blocks:
+        return image_blocks
+    slide_left = emu_to_points(job["shape_left"])
+    slide_top = emu_to_points(job["shape_top"])
+    img_w = image_blocks[0].get("image_width") or 1
+    img_h = image_blocks[0].get("image_height") or 1
+    scale_x = emu_to_points(job["shape_width"]) / float(img_w)
+    scale_y = emu_to_points(job["shape_height"]) / float(img_h)
+    for block in image_blocks:
+        block["x"] = slide_left + block["x"] * scale_x
+        block["y"] = slide_top + block["y"] * scale_y
+        block["width"] = block["width"] * scale_x
+        block["height"] = block["height"] * scale_y
+    return image_blocks
 
 
 def extract_blocks(pptx_path: str, preferred_lang: str | None = None) -> dict:
@@ -28,97 +73,33 @@ def extract_blocks(pptx_path: str, preferred_lang: str | None = None) -> dict:
         blocks.extend(iter_textbox_blocks(slide, slide_index, seen_ids))
         blocks.extend(iter_table_blocks(slide, slide_index))
         blocks.extend(iter_notes_blocks(slide, slide_index))
-        for shape in iter_shapes(slide.shapes):
-            try:
-                if shape.shape_type != MSO_SHAPE_TYPE.PICTURE:
-                    continue
-                image_bytes = None
-                image_part = None
-                if getattr(shape, "image", None) is not None:
-                    try:
-                        image_bytes = shape.image.blob
-                        image_part = str(shape.image.partname)
-                    except Exception:
-                        image_bytes = None
-                        image_part = None
-                if image_bytes is None:
-                    r_id = shape._element.blipFill.blip.embed  # noqa: SLF001
-                    part = slide.part.related_parts.get(r_id)
-                    if not part:
-                        continue
-                    image_part = str(part.partname)
-                    image_bytes = part.blob
-
-                image_jobs.append(
-                    {
-                        "image_bytes": image_bytes,
-                        "slide_index": slide_index,
-                        "shape_id": getattr(shape, "shape_id", None) or image_part or slide_index,
-                        "image_part": image_part,
-                        "shape_left": shape.left,
-                        "shape_top": shape.top,
-                        "shape_width": shape.width,
-                        "shape_height": shape.height,
-                    }
-                )
-            except Exception:
-                continue
-
-    import os
-    import zipfile
+        image_jobs.extend(_picture_jobs(slide, slide_index))
 
     doc_lang = preferred_lang or (detect_document_languages(blocks).get("primary") if blocks else None)
     ocr_lang = resolve_ocr_lang_from_doc_lang(doc_lang)
 
-    for job in image_jobs:
-        image_blocks = extract_image_text_blocks(
-            job["image_bytes"],
-            slide_index=job["slide_index"],
-            shape_id=job["shape_id"],
-            image_part=job["image_part"],
-            source="pptx",
-            ocr_lang=ocr_lang,
-        )
-        if image_blocks:
-            slide_left = emu_to_points(job["shape_left"])
-            slide_top = emu_to_points(job["shape_top"])
-            slide_w = emu_to_points(job["shape_width"])
-            slide_h = emu_to_points(job["shape_height"])
-            img_w = image_blocks[0].get("image_width") or 1
-            img_h = image_blocks[0].get("image_height") or 1
-            scale_x = slide_w / float(img_w)
-            scale_y = slide_h / float(img_h)
-            for block in image_blocks:
-                block["x"] = slide_left + block["x"] * scale_x
-                block["y"] = slide_top + block["y"] * scale_y
-                block["width"] = block["width"] * scale_x
-                block["height"] = block["height"] * scale_y
-            blocks.extend(image_blocks)
+    # Fallback: scan media parts directly (covers floating/unsupported image refs),
+    # skipping parts the picture shapes above already cover
+    processed = {job["image_part"].lstrip("/") for job in image_jobs}
+    media_jobs = media_ocr_jobs(pptx_path, "ppt/media/", "pptx-image", processed)
+
+    # OCR every image on the shared pool, then place the results.
+    ocr_keys = ("image_bytes", "slide_index", "shape_id", "image_part")
+    ocr_results = run_ocr_jobs(
+        [
+            {**{key: job[key] for key in ocr_keys}, "source": "pptx", "ocr_lang": ocr_lang}
+            for job in image_jobs + media_jobs
+        ]
+    )
+    picture_results = ocr_results[: len(image_jobs)]
+    for job, image_blocks in zip(image_jobs, picture_results, strict=True):
+        blocks.extend(_place_on_slide(job, image_blocks))
 
     if os.getenv("PPTX_EXTRACT_MASTERS", "0") == "1":
         blocks.extend(iter_master_blocks(presentation))
 
-    # Fallback: scan media parts directly (covers floating/unsupported image refs)
-    try:
-        with zipfile.ZipFile(pptx_path, "r") as zf:
-            media_files = [n for n in zf.namelist() if n.startswith("ppt/media/")]
-            for idx, name in enumerate(media_files):
-                try:
-                    image_bytes = zf.read(name)
-                except Exception:
-                    continue
-                blocks.extend(
-                    extract_image_text_blocks(
-                        image_bytes,
-                        slide_index=-1,
-                        shape_id=f"pptx-image-{idx}",
-                        image_part=name,
-                        source="pptx",
-                        ocr_lang=ocr_lang,
-                    )
-                )
-    except Exception:
-        pass
+    for image_blocks in ocr_results[len(image_jobs):]:
+        blocks.extend(image_blocks)
 
     return {
         "blocks": blocks,
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -142,16 +147,127 @@ DEFAULT_PROMPTS = {
 }
 
 
+# Seconds between mtime checks of a cached template (save_prompt is immediate).
+STAT_INTERVAL = 1.0
+# Pre-rendered static variants kept per template.
+MAX_STATIC_VARIANTS = 256
+
+_FIELD_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class CompiledTemplate:
+    """A template split once into literal parts and ``{field}`` slots.
+
+    Rendering is a single pass, so substituted values are never scanned for
+    further fields, and unknown fields are left as written.
+    """
+
+    __slots__ = ("parts", "fields", "_static")
+
+    def __init__(self, parts: list[str], fields: list[str]):
+        self.parts = parts
+        self.fields = fields
+        self._static: OrderedDict[tuple, CompiledTemplate] = OrderedDict()
+
+    @classmethod
+    def compile(cls, template: str) -> CompiledTemplate:
+        parts: list[str] = []
+        fields: list[str] = []
+        pos = 0
+        for match in _FIELD_PATTERN.finditer(template):
+            parts.append(template[pos:match.start()])
+            fields.append(match.group(1))
+            pos = match.end()
+        parts.append(template[pos:])
+        return cls(parts, fields)
+
+    def render(self, variables: dict[str, str]) -> str:
+        out = [self.parts[0]]
+        for field, part in zip(self.fields, self.parts[1:], strict=True):
+            value = variables.get(field)
+            out.append(f"{{{field}}}" if value is None else value)
+            out.append(part)
+        return "".join(out)
+
+    def partial(self, static: dict[str, str]) -> CompiledTemplate:
+        """Template with ``static`` filled in; cached per distinct values."""
+        key = tuple(sorted(static.items()))
+        with _LOCK:
+            cached = self._static.get(key)
+            if cached is not None:
+                self._static.move_to_end(key)
+                return cached
+        parts = [self.parts[0]]
+        fields: list[str] = []
+        for field, part in zip(self.fields, self.parts[1:], strict=True):
+            if field in static:
+                parts[-1] += static[field] + part
+            else:
+                fields.append(field)
+                parts.append(part)
+        compiled = CompiledTemplate(parts, fields)
+        with _LOCK:
+            self._static[key] = compiled
+            while len(self._static) > MAX_STATIC_VARIANTS:
+                self._static.popitem(last=False)
+        return compiled
+
+
+class _Entry:
+    __slots__ = ("mtime_ns", "size", "checked", "text", "compiled")
+
+    def __init__(self, stat: os.stat_result, text: str):
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.checked = time.monotonic()
+        self.text = text
+        self.compiled = CompiledTemplate.compile(text)
+
+
+_CACHE: dict[Path, _Entry] = {}
+_READY_DIRS: set[Path] = set()
+_LOCK = threading.Lock()
+
+
 def _ensure_dir() -> None:
     PROMPTS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _ensure_defaults() -> None:
+def _ensure_defaults(force: bool = False) -> None:
+    """Write missing default prompts, once per prompts directory."""
+    if PROMPTS_DIR in _READY_DIRS and not force:
+        return
     _ensure_dir()
     for name, content in DEFAULT_PROMPTS.items():
         path = PROMPTS_DIR / f"{name}.md"
         if not path.exists():
             path.write_text(content, encoding="utf-8")
+    _READY_DIRS.add(PROMPTS_DIR)
+
+
+def _load(name: str) -> _Entry:
+    """Cached template entry, re-read when the file's mtime or size changes."""
+    _ensure_defaults()
+    path = PROMPTS_DIR / f"{name}.md"
+    entry = _CACHE.get(path)
+    now = time.monotonic()
+    if entry is not None and now - entry.checked < STAT_INTERVAL:
+        return entry
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _CACHE.pop(path, None)
+        if name not in DEFAULT_PROMPTS:
+            raise FileNotFoundError(f"Prompt not found: {name}") from None
+        # A default prompt deleted at runtime is restored, as before.
+        _ensure_defaults(force=True)
+        stat = path.stat()
+    if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+        entry.checked = now
+        return entry
+    entry = _Entry(stat, path.read_text(encoding="utf-8"))
+    _CACHE[path] = entry
+    return entry
 
 
 def list_prompts() -> list[str]:
@@ -160,22 +276,28 @@ def list_prompts() -> list[str]:
 
 
 def get_prompt(name: str) -> str:
-    _ensure_defaults()
-    path = PROMPTS_DIR / f"{name}.md"
-    if not path.exists():
-        raise FileNotFoundError(f"Prompt not found: {name}")
-    return path.read_text(encoding="utf-8")
+    return _load(name).text
 
 
 def save_prompt(name: str, content: str) -> None:
     _ensure_dir()
     path = PROMPTS_DIR / f"{name}.md"
     path.write_text(content, encoding="utf-8")
-
-
-def render_prompt(name: str, variables: dict[str, str]) -> str:
-    template = get_prompt(name)
-    rendered = template
-    for key, value in variables.items():
-        rendered = rendered.replace(f"{{{key}}}", value)
-    return rendered
+    _CACHE.pop(path, None)
+
+
+def render_prompt(
+    name: str,
+    variables: dict[str, str],
+    static: dict[str, str] | None = None,
+) -> str:
+    """Render a prompt template in one pass.
+
+    ``static`` holds the values that repeat across calls (language, tone,
+    ...); the template with those filled in is cached, so each call only
+    splices ``variables`` (e.g. the chunk payload) into it.
+    """
+    compiled = _load(name).compiled
+    if static:
+        compiled = compiled.partial(static)
+    return compiled.render(variables)
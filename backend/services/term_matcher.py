@@ -0,0 +1,193 @@
+"""Single-pass multi-term matcher used for placeholders, glossary and TM checks.
+
+Preferred-term lists can hold thousands of entries (glossary, TM terms and
+the unified term center). Compiling one regex per term per block made
+placeholder substitution quadratic, so a :class:`TermMatcher` is built once
+per translation job as an Aho–Corasick automaton and every block is scanned
+once, regardless of how many terms there are.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+PLACEHOLDER_TEMPLATE = "__TERM_{}__"
+
+
+def _fold_char(char: str) -> str:
+    # Keep offsets stable: characters whose lowercase form is longer
+    # (e.g. "İ") are matched as-is.
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else char
+
+
+class TermMatcher:
+    """Aho–Corasick automaton over term sources.
+
+    Terms are ordered longest first (stable for equal lengths), which gives
+    the index used for placeholder tokens and the priority used when matches
+    overlap: a longer term always wins over a shorter one, like replacing
+    terms one by one from the longest down.
+    """
+
+    def __init__(self, terms: Iterable[tuple[str, str]] | None, ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self.terms: list[tuple[str, str]] = []
+        # Every target seen for a (folded) source, used by respects().
+        self._targets: list[list[str]] = []
+        seen: dict[str, int] = {}
+        ordered = sorted(terms or [], key=lambda item: len(item[0] or ""), reverse=True)
+        for source, target in ordered:
+            if not source:
+                continue
+            key = self._fold(source)
+            if key in seen:
+                self._targets[seen[key]].append(target)
+                continue
+            seen[key] = len(self.terms)
+            self.terms.append((source, target))
+            self._targets.append([target])
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self):
+        return iter(self.terms)
+
+    def _fold(self, text: str) -> str:
+        if not self.ignore_case:
+            return text
+        return "".join(_fold_char(char) for char in text)
+
+    def _build(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._term: list[int] = [-1]
+        self._length: list[int] = [0]
+        for idx, (source, _) in enumerate(self.terms):
+            node = 0
+            for char in self._fold(source):
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._term.append(-1)
+                    self._length.append(0)
+                node = nxt
+            self._term[node] = idx
+            self._length[node] = len(source)
+
+        # Breadth-first failure links plus "dictionary" links that jump
+        # straight to the next node on the failure chain ending a term.
+        self._fail = [0] * len(self._goto)
+        self._output = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                link = self._fail[child]
+                self._output[child] = link if self._term[link] >= 0 else self._output[link]
+                queue.append(child)
+
+    def _scan(self, text: str) -> Iterable[tuple[int, int, int]]:
+        """Yield every (start, end, term index) occurrence, overlaps included."""
+        goto, fail, term, length, output = (
+            self._goto,
+            self._fail,
+            self._term,
+            self._length,
+            self._output,
+        )
+        node = 0
+        fold = self.ignore_case
+        for pos, char in enumerate(text):
+            if fold:
+                char = _fold_char(char)
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            hit = node if term[node] >= 0 else output[node]
+            while hit:
+                yield pos + 1 - length[hit], pos + 1, term[hit]
+                hit = output[hit]
+
+    def find_all(self, text: str) -> set[int]:
+        """Indices of every term occurring anywhere in ``text``."""
+        if not text or not self.terms:
+            return set()
+        return {idx for _, _, idx in self._scan(text)}
+
+    def matches(self, text: str) -> list[tuple[int, int, int]]:
+        """Non-overlapping (start, end, term index) matches in text order.
+
+        Overlaps are resolved by term priority (longest term first), then by
+        position, which is what sequential longest-first replacement produced.
+        """
+        if not text or not self.terms:
+            return []
+        found = sorted(self._scan(text), key=lambda item: (item[2], item[0]))
+        taken = bytearray(len(text))
+        selected = []
+        for start, end, idx in found:
+            if any(taken[start:end]):
+                continue
+            taken[start:end] = b"\x01" * (end - start)
+            selected.append((start, end, idx))
+        selected.sort()
+        return selected
+
+    def replace(self, text: str, replacement: Callable[[int], str]) -> str:
+        """Rebuild ``text`` in one pass with ``replacement(term index)`` per match."""
+        parts: list[str] = []
+        cursor = 0
+        for start, end, idx in self.matches(text):
+            parts.append(text[cursor:start])
+            parts.append(replacement(idx))
+            cursor = end
+        if not parts:
+            return text
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+    def apply_placeholders(self, text: str) -> tuple[str, dict[str, str]]:
+        """Swap term occurrences for ``__TERM_n__`` tokens; returns token -> target."""
+        mapping: dict[str, str] = {}
+
+        def _token(idx: int) -> str:
+            token = PLACEHOLDER_TEMPLATE.format(idx)
+            mapping[token] = self.terms[idx][1]
+            return token
+
+        return self.replace(text, _token), mapping
+
+    def substitute(self, text: str) -> str:
+        """Replace every term occurrence with its target."""
+        return self.replace(text, lambda idx: self.terms[idx][1])
+
+    def respects(self, source_text: str, translated_text: str) -> bool:
+        """False when a term found in the source is missing its target in the translation."""
+        if not source_text or not translated_text:
+            return True
+        for idx in self.find_all(source_text):
+            for target in self._targets[idx]:
+                if target and target not in translated_text:
+                    return False
+        return True
+
+
+def as_matcher(
+    terms: TermMatcher | Iterable[tuple[str, str]] | None,
+    ignore_case: bool = True,
+) -> TermMatcher:
+    """Return ``terms`` if it is already a matcher, else build one."""
+    if isinstance(terms, TermMatcher):
+        return terms
+    return TermMatcher(terms, ignore_case=ignore_case)
@@ -0,0 +1,192 @@
+"""In-process fuzzy-match index over translation memory rows.
+
+One :class:`FuzzyTMIndex` is kept per (source_lang, target_lang, scope_type,
+scope_id). Rows are added incrementally (by ascending id) from the TM backend,
+character trigram postings generate a short candidate list, and only those
+candidates are scored with :func:`compute_match_score`.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Iterable
+
+from backend.services.tm_matcher import fuzzy_match, normalize_text
+
+NGRAM = 3
+# Candidates passed on to exact scoring per query.
+MAX_CANDIDATES = 24
+# Below this length ratio compute_match_score cannot reach 0.67, so such rows
+# are never worth scoring for the default 0.78 threshold.
+MIN_LENGTH_RATIO = 0.5
+# Share of the query's trigrams a row must contain to be considered at all.
+MIN_SHARED_RATIO = 0.3
+
+IndexKey = tuple[str, str, str, str | None, str | None]
+
+
+def char_ngrams(text: str, n: int = NGRAM) -> set[str]:
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class FuzzyTMIndex:
+    """Trigram postings plus exact-normalized lookup for one TM partition."""
+
+    def __init__(self) -> None:
+        self.high_water = 0
+        self._entries: dict[int, dict] = {}
+        self._norm: dict[int, str] = {}
+        self._grams: dict[int, set[str]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._by_norm: dict[str, int] = {}
+        self._by_hash: dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        """Add rows ordered by id. A row sharing a hash replaces the older id."""
+        with self._lock:
+            for row in rows:
+                entry_id = row["id"]
+                row_hash = row.get("hash")
+                if row_hash:
+                    previous = self._by_hash.get(row_hash)
+                    if previous is not None and previous != entry_id:
+                        self.remove(previous)
+                    self._by_hash[row_hash] = entry_id
+                if entry_id in self._entries:
+                    self.remove(entry_id)
+                norm = normalize_text(row.get("source_text") or "")
+                grams = char_ngrams(norm)
+                self._entries[entry_id] = row
+                self._norm[entry_id] = norm
+                self._grams[entry_id] = grams
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(entry_id)
+                # Newest row wins for exact-normalized hits, like ORDER BY id DESC.
+                self._by_norm[norm] = entry_id
+                self.high_water = max(self.high_water, entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        with self._lock:
+            row = self._entries.pop(entry_id, None)
+            if row is not None and self._by_hash.get(row.get("hash")) == entry_id:
+                del self._by_hash[row["hash"]]
+            norm = self._norm.pop(entry_id, None)
+            for gram in self._grams.pop(entry_id, ()):
+                ids = self._postings.get(gram)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del self._postings[gram]
+            if norm is not None and self._by_norm.get(norm) == entry_id:
+                del self._by_norm[norm]
+
+    def exact(self, text: str) -> dict | None:
+        with self._lock:
+            entry_id = self._by_norm.get(normalize_text(text))
+            return self._entries.get(entry_id) if entry_id is not None else None
+
+    def candidates(self, text: str, limit: int = MAX_CANDIDATES) -> list[dict]:
+        """Rows sharing the most trigrams with ``text`` and a plausible length."""
+        norm = normalize_text(text)
+        query_grams = char_ngrams(norm)
+        query_len = max(len(norm), 1)
+        min_shared = max(1, int(len(query_grams) * MIN_SHARED_RATIO))
+        with self._lock:
+            overlap: Counter[int] = Counter()
+            for gram in query_grams:
+                overlap.update(self._postings.get(gram, ()))
+            ranked = []
+            for entry_id, shared in overlap.most_common():
+                if shared < min_shared:
+                    break
+                cand_len = max(len(self._norm[entry_id]), 1)
+                if min(query_len, cand_len) / max(query_len, cand_len) < MIN_LENGTH_RATIO:
+                    continue
+                ranked.append(self._entries[entry_id])
+                if len(ranked) >= limit:
+                    break
+            return ranked
+
+    def search(
+        self,
+        text: str,
+        scope: dict,
+        min_score: float = 0.78,
+        limit: int = 1,
+    ) -> list[tuple[float, dict]]:
+        hit = self.exact(text)
+        if hit is not None:
+            return [(1.0, hit)]
+        return fuzzy_match(
+            query=text,
+            candidates=self.candidates(text),
+            scope=scope,
+            min_score=min_score,
+            limit=limit,
+        )
+
+
+_INDEXES: dict[IndexKey, FuzzyTMIndex] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_index(
+    source_lang: str,
+    target_lang: str,
+    scope_type: str | None,
+    scope_id: str | None,
+    store: str = "",
+) -> FuzzyTMIndex:
+    """Return the shared index for a TM partition; ``store`` names the backing DB."""
+    key = (store, source_lang, target_lang, scope_type, scope_id)
+    with _REGISTRY_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = FuzzyTMIndex()
+            _INDEXES[key] = index
+        return index
+
+
+def refresh_rows(
+    rows: list[dict], source_lang: str, target_lang: str, store: str = ""
+) -> None:
+    """Re-index rows updated in place (same ids) in the already-loaded indexes.
+
+    Each row leaves every partition of the language pair and rejoins the ones
+    it now belongs to, so a changed scope moves it. Rows above a partition's
+    high-water mark are left to that partition's next incremental sync.
+    """
+    if not rows:
+        return
+    rows = sorted(rows, key=lambda row: row["id"])
+    with _REGISTRY_LOCK:
+        loaded = [
+            (key, index)
+            for key, index in _INDEXES.items()
+            if key[:3] == (store, source_lang, target_lang)
+        ]
+    for (_, _, _, scope_type, scope_id), index in loaded:
+        for row in rows:
+            index.remove(row["id"])
+        index.add_rows(
+            row
+            for row in rows
+            if row["id"] <= index.high_water
+            and row.get("status", "active") == "active"
+            and row.get("scope_type") in (None, scope_type)
+            and row.get("scope_id") in (None, scope_id)
+        )
+
+
+def invalidate() -> None:
+    """Drop every index; call after updates or deletes that keep row ids."""
+    with _REGISTRY_LOCK:
+        _INDEXES.clear()
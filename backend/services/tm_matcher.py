@@ -28,20 +28,42 @@ def jaccard(tokens_a: Iterable[str], tokens_b: Iterable[str]) -> float:
 
 
 def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance using the bit-parallel Myers/Hyyrö algorithm.
+
+    Each character of ``b`` is processed with a handful of integer operations
+    over a bit vector as wide as ``a``, instead of filling an O(n*m) table.
+    """
     if a == b:
         return 0
     if not a:
         return len(b)
     if not b:
         return len(a)
-    prev = list(range(len(b) + 1))
-    for i, ca in enumerate(a, start=1):
-        curr = [i]
-        for j, cb in enumerate(b, start=1):
-            cost = 0 if ca == cb else 1
-            curr.append(min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + cost))
-        prev = curr
-    return prev[-1]
+    if len(a) > len(b):
+        a, b = b, a
+    peq: dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    high = 1 << (len(a) - 1)
+    pv = full
+    mv = 0
+    score = len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
 
 
 def compute_match_score(query: str, candidate: str, domain_bonus: float) -> float:
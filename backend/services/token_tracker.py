@@ -37,8 +37,16 @@ COST_PER_MILLION_TOKENS = {
     "default": {"input": 1.00, "output": 3.00},
 }
 
+# Share of the input rate billed for prompt tokens served from a provider's
+# prompt cache (OpenAI: 50%, Gemini: 25%); approximate, like the rates above.
+CACHED_INPUT_RATE = 0.5
+
 USAGE_FILE = Path(__file__).parent.parent / "data" / "token_usage.json"
 
+# Estimated prompt tokens before/after compaction, since process start.
+_COMPACTION_LOCK = threading.Lock()
+_COMPACTION = {"prompts": 0, "tokens_before": 0, "tokens_after": 0}
+
 
 @dataclass
 class TokenUsage:
@@ -52,20 +60,31 @@ class TokenUsage:
     total_tokens: int
     estimated_cost_usd: float
     operation: str = "translate"
+    cached_tokens: int = 0
 
 
 def estimate_tokens(text: str, provider: str = "default") -> int:
     """Estimate token count from text length."""
+    return estimate_tokens_for_chars(len(text), provider)
+
+
+def estimate_tokens_for_chars(chars: int, provider: str = "default") -> int:
+    """Estimate token count of a text of ``chars`` characters."""
     chars_per_token = CHARS_PER_TOKEN.get(provider, CHARS_PER_TOKEN["default"])
-    return max(1, len(text) // chars_per_token)
+    return max(1, chars // chars_per_token)
 
 
 def estimate_cost(
     model: str,
     prompt_tokens: int,
     completion_tokens: int,
+    cached_tokens: int = 0,
 ) -> float:
-    """Estimate cost in USD based on model and token counts."""
+    """Estimate cost in USD based on model and token counts.
+
+    ``cached_tokens`` is the part of ``prompt_tokens`` read from the
+    provider's prompt cache.
+    """
     # Normalize model name for lookup
     model_key = model.lower()
     for key in COST_PER_MILLION_TOKENS:
@@ -75,11 +94,33 @@ def estimate_cost(
     else:
         rates = COST_PER_MILLION_TOKENS["default"]
 
-    input_cost = (prompt_tokens / 1_000_000) * rates["input"]
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    billed_input = prompt_tokens - cached_tokens + cached_tokens * CACHED_INPUT_RATE
+    input_cost = (billed_input / 1_000_000) * rates["input"]
     output_cost = (completion_tokens / 1_000_000) * rates["output"]
     return round(input_cost + output_cost, 6)
 
 
+def record_prompt_compaction(tokens_before: int, tokens_after: int) -> None:
+    """Record the estimated size of one prompt payload before and after compaction."""
+    with _COMPACTION_LOCK:
+        _COMPACTION["prompts"] += 1
+        _COMPACTION["tokens_before"] += tokens_before
+        _COMPACTION["tokens_after"] += tokens_after
+
+
+def get_compaction_stats() -> dict:
+    """Get estimated prompt token savings from payload compaction."""
+    with _COMPACTION_LOCK:
+        stats = dict(_COMPACTION)
+    saved = stats["tokens_before"] - stats["tokens_after"]
+    stats["tokens_saved"] = saved
+    stats["saved_ratio"] = (
+        round(saved / stats["tokens_before"], 4) if stats["tokens_before"] else 0.0
+    )
+    return stats
+
+
 def _load_usage_history() -> list[dict]:
     """Load usage history from JSON file."""
     if not USAGE_FILE.exists():
@@ -107,10 +148,15 @@ def record_usage(
     prompt_tokens: int,
     completion_tokens: int,
     operation: str = "translate",
+    cached_tokens: int = 0,
 ) -> TokenUsage:
-    """Record a token usage event."""
+    """Record a token usage event.
+
+    ``cached_tokens`` counts prompt tokens the provider served from its
+    prompt cache; they are included in ``prompt_tokens``.
+    """
     total_tokens = prompt_tokens + completion_tokens
-    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+    cost = estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
 
     usage = TokenUsage(
         timestamp=datetime.utcnow().isoformat() + "Z",
@@ -121,6 +167,7 @@ def record_usage(
         total_tokens=total_tokens,
         estimated_cost_usd=cost,
         operation=operation,
+        cached_tokens=cached_tokens,
     )
 
     # Persist to file
@@ -160,6 +207,7 @@ def get_session_stats() -> dict:
             "total_tokens": 0,
             "prompt_tokens": 0,
             "completion_tokens": 0,
+            "cached_tokens": 0,
             "estimated_cost_usd": 0.0,
             "request_count": 0,
             "models_used": [],
@@ -168,6 +216,7 @@ def get_session_stats() -> dict:
     total_tokens = sum(r.get("total_tokens", 0) for r in recent)
     prompt_tokens = sum(r.get("prompt_tokens", 0) for r in recent)
     completion_tokens = sum(r.get("completion_tokens", 0) for r in recent)
+    cached_tokens = sum(r.get("cached_tokens", 0) for r in recent)
     total_cost = sum(r.get("estimated_cost_usd", 0) for r in recent)
     models = list({r.get("model", "unknown") for r in recent})
 
@@ -175,6 +224,7 @@ def get_session_stats() -> dict:
         "total_tokens": total_tokens,
         "prompt_tokens": prompt_tokens,
         "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
         "estimated_cost_usd": round(total_cost, 4),
         "request_count": len(recent),
         "models_used": models,
@@ -9,7 +9,14 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from collections.abc import Callable
+from typing import Any
+
+from backend.config import settings
+from backend.services.llm_deadline import Deadline
+from backend.services.llm_limiter import get_limiter
 from backend.services.llm_placeholders import apply_placeholders
+from backend.services.term_matcher import TermMatcher, as_matcher
 from backend.services.translate_chunk_cache import (
     get_from_cache,
     translate_and_cache_blocks,
@@ -35,21 +42,50 @@ from backend.services.translate_chunk_utils import (
 LOGGER = logging.getLogger(__name__)
 
 
+def _cached_blocks(
+    chunk_blocks: list[dict],
+    target_language: str,
+    provider: str,
+    tone: str | None,
+    vision_context: bool,
+    params: dict,
+) -> tuple[list[dict | None], list[int]]:
+    """Cache lookup for a chunk; nothing counts as cached on ``refresh``."""
+    if params.get("refresh", False):
+        return [None] * len(chunk_blocks), list(range(len(chunk_blocks)))
+    return get_from_cache(
+        chunk_blocks,
+        target_language,
+        provider,
+        params.get("model", "default"),
+        tone=tone,
+        vision_context=vision_context,
+    )
+
+
+async def _within_deadline(awaitable, deadline: Deadline | None):
+    """Await one LLM request, timed from when its limiter slot is held."""
+    if deadline is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, deadline.timeout(settings.llm_request_timeout))
+
+
 def prepare_chunk(
     chunk: list[tuple[int, dict]],
     use_placeholders: bool,
-    preferred_terms: list[tuple[str, str]],
+    preferred_terms: TermMatcher | list[tuple[str, str]],
 ) -> tuple[list[dict], list[dict], list[str]]:
     """Prepare a chunk of blocks for translation."""
     chunk_blocks = []
     placeholder_maps: list[dict[str, str]] = []
     placeholder_tokens: list[str] = []
+    matcher = as_matcher(preferred_terms) if use_placeholders else None
 
     for _, block in chunk:
         prepared = dict(block)
         if use_placeholders:
             prepared_text, mapping = apply_placeholders(
-                prepared.get("source_text", ""), preferred_terms
+                prepared.get("source_text", ""), matcher
             )
         else:
             prepared_text = prepared.get("source_text", "")
@@ -92,23 +128,14 @@ def translate_chunk(
                 len(chunk_blocks),
             )
 
-            refresh = params.get("refresh", False)
-            if refresh:
-                final_blocks = [None] * len(chunk_blocks)
-                uncached_indices = list(range(len(chunk_blocks)))
-            else:
-                final_blocks, uncached_indices = get_from_cache(
-                    chunk_blocks,
-                    target_language,
-                    provider,
-                    params.get("model", "default"),
-                    tone=tone,
-                    vision_context=vision_context,
-                )
+            final_blocks, uncached_indices = _cached_blocks(
+                chunk_blocks, target_language, provider, tone, vision_context, params
+            )
 
             if not uncached_indices:
                 return {"blocks": final_blocks}
 
+            limiter = get_limiter(provider, params.get("model"))
             result = translate_and_cache_blocks(
                 translator,
                 provider,
@@ -124,6 +151,7 @@ def translate_chunk(
                 params,
                 dispatch_translate,
                 mode=mode,
+                slot=limiter.slot(len(uncached_indices)),
             )
 
             chunk_texts = [
@@ -135,16 +163,17 @@ def translate_chunk(
                 target_language,
             ):
                 retried_for_language = True
-                result = retry_for_language(
-                    translator,
-                    provider,
-                    chunk_blocks,
-                    target_language,
-                    context,
-                    preferred_terms,
-                    placeholder_tokens,
-                    chunk_texts,
-                )
+                with limiter.slot(len(chunk_blocks)):
+                    result = retry_for_language(
+                        translator,
+                        provider,
+                        chunk_blocks,
+                        target_language,
+                        context,
+                        preferred_terms,
+                        placeholder_tokens,
+                        chunk_texts,
+                    )
 
             return result
 
@@ -186,11 +215,25 @@ async def translate_chunk_async(
     chunk_index: int,
     fallback_on_error: bool,
     mode: str,
+    on_block: Callable[[int, str], Any] | None = None,
+    deadline: Deadline | None = None,
 ) -> dict:
-    """Translate a single chunk with retry logic (Async)."""
+    """Translate a single chunk with retry logic (Async).
+
+    ``on_block(index, text)`` previews blocks of ``chunk_blocks`` as they
+    stream in; the returned result is authoritative.
+
+    With a ``deadline``, each request gets ``llm_request_timeout`` (capped
+    to the time left) once it holds its limiter slot, so the wait for a
+    slot and retry backoff are not counted. A timeout is not retried here;
+    it is raised so the caller can re-queue the chunk.
+    """
     attempt = 0
     retried_for_language = False
 
+    def dispatch(*args, **kwargs):
+        return _within_deadline(dispatch_translate_async(*args, **kwargs), deadline)
+
     while True:
         try:
             attempt += 1
@@ -201,23 +244,14 @@ async def translate_chunk_async(
                 len(chunk_blocks),
             )
 
-            refresh = params.get("refresh", False)
-            if refresh:
-                final_blocks = [None] * len(chunk_blocks)
-                uncached_indices = list(range(len(chunk_blocks)))
-            else:
-                final_blocks, uncached_indices = get_from_cache(
-                    chunk_blocks,
-                    target_language,
-                    provider,
-                    params.get("model", "default"),
-                    tone=tone,
-                    vision_context=vision_context,
-                )
+            final_blocks, uncached_indices = _cached_blocks(
+                chunk_blocks, target_language, provider, tone, vision_context, params
+            )
 
             if not uncached_indices:
                 return {"blocks": final_blocks}
 
+            limiter = get_limiter(provider, params.get("model"))
             result = await translate_and_cache_blocks_async(
                 translator,
                 provider,
@@ -231,8 +265,10 @@ async def translate_chunk_async(
                 tone,
                 vision_context,
                 params,
-                dispatch_translate_async,
+                dispatch,
                 mode=mode,
+                on_block=on_block,
+                slot=limiter.slot_async(len(uncached_indices)),
             )
 
             chunk_texts = [
@@ -244,19 +280,25 @@ async def translate_chunk_async(
                 target_language,
             ):
                 retried_for_language = True
-                result = await retry_for_language_async(
-                    translator,
-                    provider,
-                    chunk_blocks,
-                    target_language,
-                    context,
-                    preferred_terms,
-                    placeholder_tokens,
-                    chunk_texts,
-                )
+                async with limiter.slot_async(len(chunk_blocks)):
+                    result = await _within_deadline(
+                        retry_for_language_async(
+                            translator,
+                            provider,
+                            chunk_blocks,
+                            target_language,
+                            context,
+                            preferred_terms,
+                            placeholder_tokens,
+                            chunk_texts,
+                        ),
+                        deadline,
+                    )
 
             return result
 
+        except asyncio.TimeoutError:
+            raise
         except Exception as exc:
             if is_vision_error(str(exc)):
                 raise ValueError("偵測到圖片相關錯誤") from exc
@@ -1,14 +1,21 @@
 """Translation chunk caching utilities.
 
 This module contains cache-related functions for translation chunks.
+Identical uncached requests in flight at the same time are coalesced
+(:mod:`llm_singleflight`); only the leading caller writes the cache.
 """
 
 from __future__ import annotations
 
 from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, AbstractContextManager, nullcontext
+from typing import Any
 
+from backend.config import settings
+from backend.services.llm_singleflight import chunk_flights, flight_key
 from backend.services.translation_cache import cache
 
+
 def get_from_cache(
     chunk_blocks: list[dict],
     target_language: str,
@@ -17,17 +24,17 @@ def get_from_cache(
     **kwargs,
 ) -> tuple[list[dict | None], list[int]]:
     """Get blocks from cache and return final list and uncached indices."""
+    cached_texts = cache.get_many(
+        [block.get("source_text", "") for block in chunk_blocks],
+        target_language,
+        provider,
+        model,
+        tone=kwargs.get("tone"),
+        vision_context=kwargs.get("vision_context", True),
+    )
     final_blocks = []
     uncached_indices = []
-    for i, block in enumerate(chunk_blocks):
-        cached = cache.get(
-            block.get("source_text", ""),
-            target_language,
-            provider,
-            model,
-            tone=kwargs.get("tone"),
-            vision_context=kwargs.get("vision_context", True),
-        )
+    for i, (block, cached) in enumerate(zip(chunk_blocks, cached_texts, strict=True)):
         if cached:
             final_blocks.append({**block, "translated_text": cached})
         else:
@@ -36,6 +43,79 @@ def get_from_cache(
     return final_blocks, uncached_indices
 
 
+def _flight_key(
+    blocks_to_translate: list[dict],
+    target_language: str,
+    provider: str,
+    tone: str | None,
+    vision_context: bool,
+    params: dict,
+    mode: str,
+) -> str | None:
+    # Hedged duplicates opt out, or they would just wait on the original.
+    if not settings.llm_coalesce_requests or not params.get("coalesce", True):
+        return None
+    return flight_key(
+        [block.get("source_text", "") for block in blocks_to_translate],
+        target_language,
+        provider,
+        params.get("model", "default"),
+        tone=tone,
+        vision_context=vision_context,
+        mode=mode,
+    )
+
+
+def _snapshot(result: dict) -> tuple[dict, list[str]]:
+    # Texts are copied out before the leader restores placeholders in place.
+    texts = [block.get("translated_text", "") for block in result.get("blocks", [])]
+    return result, texts
+
+
+def _follower_result(shared: tuple[dict, list[str]], blocks_to_translate: list[dict]) -> dict:
+    result, texts = shared
+    blocks = [
+        {**block, "translated_text": text}
+        for block, text in zip(blocks_to_translate, texts, strict=True)
+    ]
+    return {**result, "blocks": blocks}
+
+
+def _store_results(
+    res_blocks: list[dict],
+    chunk_blocks: list[dict],
+    uncached_indices: list[int],
+    final_blocks: list[dict | None],
+    target_language: str,
+    provider: str,
+    tone: str | None,
+    vision_context: bool,
+    params: dict,
+    write_cache: bool = True,
+) -> None:
+    """Merge translated blocks into final_blocks and write them to cache in one batch."""
+    entries = []
+    for i, res_block in enumerate(res_blocks):
+        original_idx = uncached_indices[i]
+        final_blocks[original_idx] = res_block
+        entries.append(
+            (
+                chunk_blocks[original_idx].get("source_text", ""),
+                res_block.get("translated_text", ""),
+            )
+        )
+    if not write_cache:
+        return
+    cache.set_many(
+        entries,
+        target_language,
+        provider,
+        params.get("model", "default"),
+        tone=tone,
+        vision_context=vision_context,
+    )
+
+
 def translate_and_cache_blocks(
     translator,
     provider: str,
@@ -51,40 +131,55 @@ def translate_and_cache_blocks(
     params: dict,
     dispatch_func: Callable,
     mode: str = "direct",
+    slot: AbstractContextManager | None = None,
 ) -> dict:
-    """Translate uncached blocks and update cache."""
+    """Translate uncached blocks and update cache.
+
+    ``slot`` (e.g. a limiter slot) is entered around the LLM call only when
+    this caller leads; followers of a coalesced request never take one.
+    """
     blocks_to_translate = [chunk_blocks[i] for i in uncached_indices]
 
-    result = dispatch_func(
-        translator,
-        provider,
-        blocks_to_translate,
+    def _call() -> tuple[dict, list[str]]:
+        with slot or nullcontext():
+            return _snapshot(
+                dispatch_func(
+                    translator,
+                    provider,
+                    blocks_to_translate,
+                    target_language,
+                    context,
+                    preferred_terms,
+                    placeholder_tokens,
+                    tone,
+                    vision_context,
+                    mode=mode,
+                )
+            )
+
+    key = _flight_key(
+        blocks_to_translate, target_language, provider, tone, vision_context, params, mode
+    )
+    if key is None:
+        shared, leader = _call(), True
+    else:
+        shared, leader = chunk_flights.do(key, _call)
+    result = shared[0] if leader else _follower_result(shared, blocks_to_translate)
+
+    _store_results(
+        result.get("blocks", []),
+        chunk_blocks,
+        uncached_indices,
+        final_blocks,
         target_language,
-        context,
-        preferred_terms,
-        placeholder_tokens,
+        provider,
         tone,
         vision_context,
-        mode=mode,
+        params,
+        write_cache=leader,
     )
 
-    res_blocks = result.get("blocks", [])
-    for i, res_block in enumerate(res_blocks):
-        original_idx = uncached_indices[i]
-        translated_text = res_block.get("translated_text", "")
-        final_blocks[original_idx] = res_block
-        cache.set(
-            chunk_blocks[original_idx].get("source_text", ""),
-            target_language,
-            provider,
-            params.get("model", "default"),
-            translated_text,
-            tone=tone,
-            vision_context=vision_context,
-        )
-
-    result["blocks"] = final_blocks
-    return result
+    return {**result, "blocks": final_blocks}
 
 
 async def translate_and_cache_blocks_async(
@@ -102,37 +197,57 @@ async def translate_and_cache_blocks_async(
     params: dict,
     dispatch_func: Callable,
     mode: str = "direct",
+    on_block: Callable[[int, str], Any] | None = None,
+    slot: AbstractAsyncContextManager | None = None,
 ) -> dict:
-    """Translate uncached blocks and update cache (Async)."""
+    """Translate uncached blocks and update cache (Async).
+
+    ``on_block`` gets streamed blocks keyed by their index in ``chunk_blocks``;
+    followers of a coalesced request only get the final result.
+    """
     blocks_to_translate = [chunk_blocks[i] for i in uncached_indices]
+    extra = {}
+    if on_block is not None:
+        extra["on_block"] = lambda i, text: on_block(uncached_indices[i], text)
 
-    result = await dispatch_func(
-        translator,
-        provider,
-        blocks_to_translate,
+    async def _call() -> tuple[dict, list[str]]:
+        async with slot or nullcontext():
+            return _snapshot(
+                await dispatch_func(
+                    translator,
+                    provider,
+                    blocks_to_translate,
+                    target_language,
+                    context,
+                    preferred_terms,
+                    placeholder_tokens,
+                    tone,
+                    vision_context,
+                    mode=mode,
+                    **extra,
+                )
+            )
+
+    key = _flight_key(
+        blocks_to_translate, target_language, provider, tone, vision_context, params, mode
+    )
+    if key is None:
+        shared, leader = await _call(), True
+    else:
+        shared, leader = await chunk_flights.do_async(key, _call)
+    result = shared[0] if leader else _follower_result(shared, blocks_to_translate)
+
+    _store_results(
+        result.get("blocks", []),
+        chunk_blocks,
+        uncached_indices,
+        final_blocks,
         target_language,
-        context,
-        preferred_terms,
-        placeholder_tokens,
+        provider,
         tone,
         vision_context,
-        mode=mode,
+        params,
+        write_cache=leader,
     )
 
-    res_blocks = result.get("blocks", [])
-    for i, res_block in enumerate(res_blocks):
-        original_idx = uncached_indices[i]
-        translated_text = res_block.get("translated_text", "")
-        final_blocks[original_idx] = res_block
-        cache.set(
-            chunk_blocks[original_idx].get("source_text", ""),
-            target_language,
-            provider,
-            params.get("model", "default"),
-            translated_text,
-            tone=tone,
-            vision_context=vision_context,
-        )
-
-    result["blocks"] = final_blocks
-    return result
+    return {**result, "blocks": final_blocks}
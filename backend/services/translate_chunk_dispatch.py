@@ -11,6 +11,12 @@ from backend.services.llm_contract import (
     coerce_contract,
     validate_contract,
 )
+from backend.services.llm_stream import (
+    BatchBlockStreamParser,
+    BlockCallback,
+    JsonBlockStreamParser,
+    block_delta_handler,
+)
 from backend.services.translate_prompt import (
     build_ollama_batch_prompt,
     parse_ollama_batch_response,
@@ -21,6 +27,12 @@ from backend.services.translate_chunk_dispatch_helpers import (
     safe_translate_async,
 )
 
+def _json_delta_handler(chunk_blocks, on_block: BlockCallback | None):
+    if on_block is None:
+        return None
+    return block_delta_handler(JsonBlockStreamParser(len(chunk_blocks)), on_block)
+
+
 def dispatch_translate(
     translator,
     provider,
@@ -70,8 +82,15 @@ async def dispatch_translate_async(
     tone,
     vision_context,
     mode: str = "direct",
+    on_block: BlockCallback | None = None,
 ):
-    """Dispatch to correct translator async."""
+    """Dispatch to correct translator async.
+
+    ``on_block(index, text)`` receives each block as soon as it is complete
+    in the streamed response (streaming-capable translators only).
+    """
+    if not getattr(translator, "supports_streaming", False):
+        on_block = None
     if provider == "ollama":
         return await translate_ollama_async(
             translator,
@@ -83,6 +102,7 @@ async def dispatch_translate_async(
             tone,
             vision_context,
             mode=mode,
+            on_block=on_block,
         )
     return await translate_standard_async(
         translator,
@@ -94,6 +114,7 @@ async def dispatch_translate_async(
         tone,
         vision_context,
         mode=mode,
+        on_block=on_block,
     )
 
 
@@ -150,10 +171,17 @@ async def translate_ollama_async(
     tone,
     vision_context,
     mode: str = "direct",
+    on_block: BlockCallback | None = None,
 ):
     """Handle Ollama-specific translation (Async)."""
     prompt = build_ollama_batch_prompt(chunk_blocks, target_language)
-    text_output = await translator.translate_plain_async(prompt)
+    if on_block is not None:
+        text_output = await translator.translate_plain_async(
+            prompt,
+            on_delta=block_delta_handler(BatchBlockStreamParser(len(chunk_blocks)), on_block),
+        )
+    else:
+        text_output = await translator.translate_plain_async(prompt)
     translated_texts_chunk = parse_ollama_batch_response(
         text_output,
         len(chunk_blocks),
@@ -170,6 +198,7 @@ async def translate_ollama_async(
             placeholder_tokens,
             custom_hint,
             mode,
+            on_delta=_json_delta_handler(chunk_blocks, on_block),
         )
         result = coerce_contract(result, chunk_blocks, target_language)
     else:
@@ -221,6 +250,7 @@ async def translate_standard_async(
     tone,
     vision_context,
     mode: str = "direct",
+    on_block: BlockCallback | None = None,
 ):
     """Handle standard translation (Async)."""
     custom_hint = build_custom_hint(target_language, tone, vision_context)
@@ -233,6 +263,7 @@ async def translate_standard_async(
         placeholder_tokens,
         custom_hint,
         mode,
+        on_delta=_json_delta_handler(chunk_blocks, on_block),
     )
     result = coerce_contract(result, chunk_blocks, target_language)
     validate_contract(result)
@@ -58,7 +58,10 @@ async def safe_translate_async(
     placeholder_tokens,
     custom_hint,
     mode: str,
+    on_delta=None,
 ):
+    # Only streaming-capable translators receive on_delta.
+    extra = {"on_delta": on_delta} if on_delta is not None else {}
     try:
         return await translator.translate_async(
             chunk_blocks,
@@ -68,6 +71,7 @@ async def safe_translate_async(
             placeholder_tokens=placeholder_tokens,
             language_hint=custom_hint,
             mode=mode,
+            **extra,
         )
     except TypeError:
         return await translator.translate_async(
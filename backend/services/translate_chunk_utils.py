@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import random
-from urllib.error import HTTPError
 
 from backend.services.language_detect import detect_language
+from backend.services.llm_limiter import failure_signal
 
 
 def detect_top_language(texts: list[str]) -> str | None:
@@ -28,12 +28,7 @@ def calculate_backoff(
     backoff: float,
     max_backoff: float,
 ) -> float:
-    retry_after = None
-    if isinstance(exc, HTTPError) and exc.code in {429, 503}:
-        retry_after = exc.headers.get("Retry-After")
-    if retry_after:
-        try:
-            return max(float(retry_after), 0)
-        except ValueError:
-            pass
+    _, retry_after = failure_signal(exc)
+    if retry_after is not None:
+        return retry_after
     return min(backoff * attempt, max_backoff) + random.uniform(0, 0.5)
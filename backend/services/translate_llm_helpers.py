@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from backend.services.translate_llm_helpers_impl.async_tasks import create_async_chunk_tasks
-from backend.services.translate_llm_helpers_impl.cache import prepare_pending_blocks
+from backend.services.translate_llm_helpers_impl.cache import (
+    dedupe_pending_blocks,
+    fan_out_duplicates,
+    prepare_pending_blocks,
+)
 from backend.services.translate_llm_helpers_impl.preferred_terms import load_preferred_terms
 
 __all__ = [
     "create_async_chunk_tasks",
+    "dedupe_pending_blocks",
+    "fan_out_duplicates",
     "load_preferred_terms",
     "prepare_pending_blocks",
 ]
@@ -3,15 +3,162 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+import uuid
 from collections.abc import Callable
 from typing import Any
 
-from backend.services.llm_context import build_context
+from backend.config import settings
+from backend.services.llm_context import DocumentContextIndex, build_context
+from backend.services.llm_deadline import (
+    Deadline,
+    LatencyTracker,
+    get_latency_tracker,
+    hedged,
+)
+from backend.services.llm_glossary import apply_glossary
+from backend.services.llm_placeholders import restore_placeholders
+from backend.services.llm_scheduler import FairScheduler, get_scheduler
+from backend.services.term_matcher import TermMatcher
 from backend.services.translate_chunk import prepare_chunk, translate_chunk_async
+from backend.services.translate_llm_helpers_impl.cache import fan_out_duplicates
 from backend.services.translate_retry import apply_translation_results
+from backend.services.translate_selector import select_translator
 
 LOGGER = logging.getLogger(__name__)
 
+# (provider, translator, params) a hedged request is sent to.
+HedgeTarget = tuple[str, Any, dict]
+
+
+def resolve_hedge_target(provider, translator, params, mode) -> HedgeTarget | None:
+    """Where hedged requests go: ``llm_hedge_provider``, else the same translator."""
+    if not settings.llm_hedge_requests or mode == "mock" or provider == "mock":
+        return None
+    hedge_params = {**params, "coalesce": False}
+    if not settings.llm_hedge_provider:
+        return provider, translator, hedge_params
+    try:
+        hedge_provider, hedge_translator = select_translator(
+            settings.llm_hedge_provider, settings.llm_hedge_model, None, None, False
+        )
+    except OSError as exc:
+        LOGGER.warning("Hedge provider unavailable (%s); hedging on %s", exc, provider)
+        return provider, translator, hedge_params
+    return hedge_provider, hedge_translator, {**hedge_params, "model": settings.llm_hedge_model}
+
+
+async def _emit_progress(on_progress: Callable[[dict], Any], payload: dict) -> None:
+    try:
+        val = on_progress(payload)
+        if asyncio.iscoroutine(val):
+            await val
+    except Exception:
+        LOGGER.exception("Error in progress callback")
+
+
+async def _attempt_with_deadline(
+    primary: Callable[[], Any],
+    hedge: Callable[[], Any] | None,
+    tracker: LatencyTracker,
+    deadline: Deadline,
+) -> dict:
+    # Requests time themselves once they hold a limiter slot; this only
+    # stops the job's deadline from being overrun while they wait for one.
+    started = time.perf_counter()
+    delay = tracker.hedge_delay() if hedge is not None else None
+    result, hedge_won = await asyncio.wait_for(
+        hedged(primary, hedge, delay, tracker),
+        timeout=deadline.remaining(),
+    )
+    if not hedge_won:
+        tracker.record(time.perf_counter() - started)
+    return result
+
+
+def _partial_progress_handler(
+    chunk,
+    placeholder_maps,
+    glossary,
+    chunk_index,
+    on_progress: Callable[[dict], Any],
+    duplicates: dict[int, list[int]] | None,
+    blocks_list: list[dict],
+    total_pending: int,
+) -> Callable[[int, str], Any]:
+    """Turn streamed blocks into ``partial`` progress events.
+
+    Partial events carry text only (no completed ids), so a resumed job still
+    retranslates blocks whose chunk did not finish.
+    """
+
+    def _on_block(position: int, text: str):
+        index, block = chunk[position]
+        text = restore_placeholders(text, placeholder_maps[position])
+        if glossary:
+            text = apply_glossary(text, glossary)
+        targets = [block] + [blocks_list[dup] for dup in (duplicates or {}).get(index, [])]
+        completed_blocks = [
+            {"client_id": target.get("client_id"), "translated_text": text}
+            for target in targets
+            if target.get("client_id")
+        ]
+        if not completed_blocks:
+            return None
+        return on_progress(
+            {
+                "chunk_index": chunk_index,
+                "partial": True,
+                "completed_indices": [],
+                "completed_ids": [],
+                "completed_blocks": completed_blocks,
+                "chunk_size": 0,
+                "total_pending": total_pending,
+                "timestamp": time.time(),
+            }
+        )
+
+    return _on_block
+
+
+def _completed_payload(chunk_index, completed, translated_texts) -> dict:
+    completed_blocks = []
+    for idx, block in completed:
+        client_id = block.get("client_id")
+        translated_text = translated_texts[idx]
+        if translated_text is None:
+            continue
+        completed_blocks.append(
+            {
+                "client_id": client_id,
+                "translated_text": translated_text,
+            }
+        )
+    return {
+        "chunk_index": chunk_index,
+        "completed_indices": [idx for idx, _ in completed],
+        "completed_ids": [b.get("client_id") for _, b in completed if b.get("client_id")],
+        "completed_blocks": completed_blocks,
+        "chunk_size": len(completed),
+        "total_pending": len(translated_texts),
+        "timestamp": time.time(),
+    }
+
+
+def _failed_payload(chunk, duplicates, blocks_list, chunk_index, translated_texts) -> dict:
+    targets = [block for _, block in chunk]
+    for index, _ in chunk:
+        targets.extend(blocks_list[dup] for dup in (duplicates or {}).get(index, []))
+    return {
+        "chunk_index": chunk_index,
+        "completed_indices": [],
+        "completed_ids": [],
+        "completed_blocks": [],
+        "failed_ids": [b.get("client_id") for b in targets if b.get("client_id")],
+        "chunk_size": 0,
+        "total_pending": len(translated_texts),
+        "timestamp": time.time(),
+    }
+
 
 async def process_chunk_async(
     translator,
@@ -35,28 +182,85 @@ async def process_chunk_async(
     use_tm,
     on_progress: Callable[[dict], Any] | None = None,
     llm_context: dict | None = None,
+    duplicates: dict[int, list[int]] | None = None,
+    blocks_list: list[dict] | None = None,
+    scheduler: FairScheduler | None = None,
+    flow_id: str = "default",
+    deadline: Deadline | None = None,
+    hedge: HedgeTarget | None = None,
 ):
-    """Helper to process a single chunk asynchronously."""
-    chunk_started = time.perf_counter()
+    """Helper to process a single chunk asynchronously.
 
+    Each request is bounded by ``llm_request_timeout`` from when it holds
+    its limiter slot, and the chunk by the job's ``deadline``; a timed-out
+    chunk goes back into the scheduler up to
+    ``llm_chunk_requeues`` times, then raises ``asyncio.TimeoutError`` after
+    reporting its blocks as ``failed_ids``.
+    """
     if params.get("chunk_delay", 0) > 0:
         await asyncio.sleep(params["chunk_delay"] * (chunk_index - 1))
 
-    result = await translate_chunk_async(
-        translator,
-        provider,
-        chunk_blocks,
-        target_language,
-        context,
-        preferred_terms,
-        placeholder_tokens,
-        tone,
-        vision_context,
-        params,
-        chunk_index,
-        fallback_on_error,
-        mode,
-    )
+    scheduler = scheduler or get_scheduler(provider, params.get("model"))
+    deadline = deadline or Deadline()
+    tracker = get_latency_tracker(provider, params.get("model"))
+    on_block = None
+    if on_progress and settings.llm_stream_responses:
+        on_block = _partial_progress_handler(
+            chunk,
+            placeholder_maps,
+            glossary,
+            chunk_index,
+            on_progress,
+            duplicates,
+            blocks_list or [],
+            len(translated_texts),
+        )
+
+    def _attempt(target_translator, target_provider, target_params, stream):
+        return lambda: translate_chunk_async(
+            target_translator,
+            target_provider,
+            chunk_blocks,
+            target_language,
+            context,
+            preferred_terms,
+            placeholder_tokens,
+            tone,
+            vision_context,
+            target_params,
+            chunk_index,
+            fallback_on_error,
+            mode,
+            on_block=stream,
+            deadline=deadline,
+        )
+
+    primary = _attempt(translator, provider, params, on_block)
+    hedge_attempt = _attempt(hedge[1], hedge[0], hedge[2], None) if hedge else None
+    requeues = 0
+    while True:
+        try:
+            async with scheduler.slot(flow_id, cost=len(chunk_blocks)):
+                # Time the chunk from admission, not from when it was queued.
+                chunk_started = time.perf_counter()
+                result = await _attempt_with_deadline(primary, hedge_attempt, tracker, deadline)
+            break
+        except asyncio.TimeoutError:
+            if deadline.expired or requeues >= settings.llm_chunk_requeues:
+                if on_progress:
+                    payload = _failed_payload(
+                        chunk, duplicates, blocks_list or [], chunk_index, translated_texts
+                    )
+                    await _emit_progress(on_progress, payload)
+                raise
+            requeues += 1
+            # Back of this job's queue, so other chunks are not held up.
+            LOGGER.warning(
+                "LLM chunk %s timed out; re-queued (%s/%s)",
+                chunk_index,
+                requeues,
+                settings.llm_chunk_requeues,
+            )
 
     apply_translation_results(
         chunk,
@@ -69,38 +273,14 @@ async def process_chunk_async(
         use_tm,
         llm_context=llm_context,
     )
+    completed = chunk + fan_out_duplicates(
+        chunk, duplicates, blocks_list or [], translated_texts
+    )
 
     if on_progress:
-        completed_indices = [idx for idx, _ in chunk]
-        completed_ids = [b.get("client_id") for _, b in chunk if b.get("client_id")]
-        completed_blocks = []
-        for idx, block in chunk:
-            client_id = block.get("client_id")
-            translated_text = translated_texts[idx]
-            if translated_text is None:
-                continue
-            completed_blocks.append(
-                {
-                    "client_id": client_id,
-                    "translated_text": translated_text,
-                }
-            )
-        try:
-            val = on_progress(
-                {
-                    "chunk_index": chunk_index,
-                    "completed_indices": completed_indices,
-                    "completed_ids": completed_ids,
-                    "completed_blocks": completed_blocks,
-                    "chunk_size": len(chunk),
-                    "total_pending": len(translated_texts),
-                    "timestamp": time.time(),
-                }
-            )
-            if asyncio.iscoroutine(val):
-                await val
-        except Exception:
-            LOGGER.exception("Error in progress callback")
+        await _emit_progress(
+            on_progress, _completed_payload(chunk_index, completed, translated_texts)
+        )
 
     chunk_duration = time.perf_counter() - chunk_started
     LOGGER.info(
@@ -129,17 +309,32 @@ def create_async_chunk_tasks(
     vision_context,
     on_progress,
     llm_context: dict | None = None,
+    duplicates: dict[int, list[int]] | None = None,
+    term_matcher: TermMatcher | None = None,
+    context_index: DocumentContextIndex | None = None,
+    flow_id: str | None = None,
+    deadline: Deadline | None = None,
 ):
-    """Create async tasks for processing chunks."""
+    """Create async tasks for processing chunks.
+
+    Chunks are admitted through the model's shared :class:`FairScheduler`,
+    queued under ``flow_id`` (one flow per job unless given), and share the
+    job's ``deadline``.
+    """
     tasks = []
+    terms = term_matcher or preferred_terms
+    scheduler = get_scheduler(provider, params.get("model"))
+    flow_id = flow_id or f"job-{uuid.uuid4().hex[:12]}"
+    hedge = resolve_hedge_target(provider, translator, params, mode)
     for chunk_index, chunk in enumerate(chunk_list, start=1):
         chunk_blocks, placeholder_maps, placeholder_tokens = prepare_chunk(
-            chunk, use_placeholders, preferred_terms
+            chunk, use_placeholders, terms
         )
         context = build_context(
             params["context_strategy"],
             blocks_list,
             chunk_blocks,
+            index=context_index,
         )
 
         tasks.append(
@@ -151,7 +346,7 @@ def create_async_chunk_tasks(
                 placeholder_maps,
                 target_language,
                 context,
-                preferred_terms,
+                terms,
                 placeholder_tokens,
                 tone,
                 vision_context,
@@ -165,6 +360,12 @@ def create_async_chunk_tasks(
                 use_tm,
                 on_progress,
                 llm_context=llm_context,
+                duplicates=duplicates,
+                blocks_list=blocks_list,
+                scheduler=scheduler,
+                flow_id=flow_id,
+                deadline=deadline,
+                hedge=hedge,
             )
         )
     return tasks
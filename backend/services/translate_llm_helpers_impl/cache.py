@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from backend.services.llm_placeholders import has_placeholder
 from backend.services.llm_utils import cache_key, tm_respects_terms
-from backend.services.translation_memory_adapter import lookup_tm
+from backend.services.term_matcher import TermMatcher
+from backend.services.translation_memory_adapter import lookup_tm_many
 
 
 def _check_local_cache(
@@ -21,28 +22,19 @@ def _check_local_cache(
     return True
 
 
-def _check_tm(
-    block: dict,
+def _accept_tm_hit(
+    tm_hit: str | None,
     key: str,
-    target_language: str,
-    source_lang: str,
-    preferred_terms: list[tuple[str, str]],
+    source_text: str,
+    preferred_terms: TermMatcher | list[tuple[str, str]],
     translated_texts: list[str | None],
     local_cache: dict[str, str],
     use_placeholders: bool,
-    llm_context: dict | None,
     index: int,
 ) -> bool:
-    tm_hit = lookup_tm(
-        source_lang=source_lang,
-        target_lang=target_language,
-        text=block.get("source_text", "").strip(),
-        context=llm_context,
-        use_fuzzy=True,
-    )
     if (
         tm_hit
-        and tm_respects_terms(key, tm_hit, preferred_terms)
+        and tm_respects_terms(source_text, tm_hit, preferred_terms)
         and (use_placeholders or not has_placeholder(tm_hit))
     ):
         translated_texts[index] = tm_hit
@@ -51,13 +43,33 @@ def _check_tm(
     return False
 
 
+def _lookup_tm_hits(
+    keyed: list[tuple[int, dict, str]],
+    target_language: str,
+    source_lang: str,
+    llm_context: dict | None,
+) -> list[str | None]:
+    """Resolve every distinct source text against the TM in one batch."""
+    texts = [block.get("source_text", "").strip() for _, block, _ in keyed]
+    unique_texts = list(dict.fromkeys(texts))
+    hits = lookup_tm_many(
+        source_lang=source_lang,
+        target_lang=target_language,
+        texts=unique_texts,
+        context=llm_context,
+        use_fuzzy=True,
+    )
+    by_text = dict(zip(unique_texts, hits, strict=True))
+    return [by_text[text] for text in texts]
+
+
 def prepare_pending_blocks(
     blocks_list: list[dict],
     target_language: str,
     source_lang: str,
     use_tm: bool,
     use_placeholders: bool,
-    preferred_terms: list[tuple[str, str]],
+    preferred_terms: TermMatcher | list[tuple[str, str]],
     refresh: bool = False,
     llm_context: dict | None = None,
 ) -> tuple[list[str | None], list[tuple[int, dict]], dict[str, str]]:
@@ -66,37 +78,79 @@ def prepare_pending_blocks(
     translated_texts: list[str | None] = [None] * len(blocks_list)
     pending: list[tuple[int, dict]] = []
 
+    keyed: list[tuple[int, dict, str]] = []
     for index, block in enumerate(blocks_list):
         key = cache_key(block, context=llm_context)
         if not key:
             translated_texts[index] = ""
             continue
+        keyed.append((index, block, key))
+
+    tm_hits: list[str | None] = [None] * len(keyed)
+    if not refresh and source_lang and source_lang != "auto" and use_tm and keyed:
+        tm_hits = _lookup_tm_hits(keyed, target_language, source_lang, llm_context)
 
+    for (index, block, key), tm_hit in zip(keyed, tm_hits, strict=True):
         if not refresh and _check_local_cache(
             key, translated_texts, index, local_cache, use_placeholders
         ):
             continue
 
-        if (
-            not refresh
-            and source_lang
-            and source_lang != "auto"
-            and use_tm
-            and _check_tm(
-                block,
-                key,
-                target_language,
-                source_lang,
-                preferred_terms,
-                translated_texts,
-                local_cache,
-                use_placeholders,
-                llm_context,
-                index,
-            )
+        if _accept_tm_hit(
+            tm_hit,
+            key,
+            block.get("source_text", ""),
+            preferred_terms,
+            translated_texts,
+            local_cache,
+            use_placeholders,
+            index,
         ):
             continue
 
         pending.append((index, block))
 
     return translated_texts, pending, local_cache
+
+
+def dedupe_pending_blocks(
+    pending: list[tuple[int, dict]],
+    llm_context: dict | None = None,
+) -> tuple[list[tuple[int, dict]], dict[int, list[int]]]:
+    """Collapse pending blocks sharing a cache key so each string is sent once.
+
+    Returns the unique pending list (first occurrence wins) and a map from
+    each kept index to the indices of its duplicates.
+    """
+    first_index: dict[str, int] = {}
+    unique: list[tuple[int, dict]] = []
+    duplicates: dict[int, list[int]] = {}
+    for index, block in pending:
+        key = cache_key(block, context=llm_context)
+        primary = first_index.get(key)
+        if primary is None:
+            first_index[key] = index
+            unique.append((index, block))
+        else:
+            duplicates.setdefault(primary, []).append(index)
+    return unique, duplicates
+
+
+def fan_out_duplicates(
+    chunk: list[tuple[int, dict]],
+    duplicates: dict[int, list[int]] | None,
+    blocks_list: list[dict],
+    translated_texts: list[str | None],
+) -> list[tuple[int, dict]]:
+    """Copy each translated primary onto its duplicates; return the filled pairs."""
+    filled: list[tuple[int, dict]] = []
+    if not duplicates:
+        return filled
+    for index, _ in chunk:
+        translated = translated_texts[index]
+        if translated is None:
+            continue
+        for dup_index in duplicates.get(index, []):
+            translated_texts[dup_index] = translated
+            filled.append((dup_index, blocks_list[dup_index]))
+    return filled
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from typing import Any
 
-from backend.services.llm_context import build_context
+from backend.services.llm_context import DocumentContextIndex, build_context
+from backend.services.term_matcher import TermMatcher
 from backend.services.translate_chunk import prepare_chunk, translate_chunk
+from backend.services.translate_llm_helpers import fan_out_duplicates
 from backend.services.translate_retry import apply_translation_results
 
 
@@ -23,21 +25,27 @@ def _translate_chunk_sync(
     llm_context: dict[str, Any],
     translated_texts: list[str | None],
     local_cache: dict,
-    glossary: dict | None,
+    glossary: TermMatcher | list[tuple[str, str]] | None,
     use_tm: bool,
     chunk_index: int,
+    duplicates: dict[int, list[int]] | None = None,
+    term_matcher: TermMatcher | None = None,
+    context_index: DocumentContextIndex | None = None,
 ) -> None:
+    terms = term_matcher or preferred_terms
     chunk_blocks, placeholder_maps, placeholder_tokens = prepare_chunk(
-        chunk, use_placeholders, preferred_terms
+        chunk, use_placeholders, terms
+    )
+    context = build_context(
+        params["context_strategy"], blocks_list, chunk_blocks, index=context_index
     )
-    context = build_context(params["context_strategy"], blocks_list, chunk_blocks)
     result = translate_chunk(
         translator,
         resolved_provider,
         chunk_blocks,
         target_language,
         context,
-        preferred_terms,
+        terms,
         placeholder_tokens,
         tone,
         vision_context,
@@ -57,6 +65,7 @@ def _translate_chunk_sync(
         use_tm,
         llm_context=llm_context,
     )
+    fan_out_duplicates(chunk, duplicates, blocks_list, translated_texts)
 
 
 def _finalize_texts(
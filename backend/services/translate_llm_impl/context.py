@@ -6,10 +6,16 @@ from backend.config import settings
 from backend.services.bilingual_alignment import align_bilingual_blocks
 from backend.services.learning_service import detect_domain
 from backend.services.llm_contract import build_contract
+from backend.services.llm_context import DocumentContextIndex
 from backend.services.llm_glossary import load_glossary
-from backend.services.translate_llm_helpers import load_preferred_terms, prepare_pending_blocks
+from backend.services.term_matcher import TermMatcher
+from backend.services.translate_llm_helpers import (
+    dedupe_pending_blocks,
+    load_preferred_terms,
+    prepare_pending_blocks,
+)
 
-from .helpers import _determine_chunk_size, _prepare_params, _resolve_translator
+from .helpers import _plan_chunks, _prepare_params, _resolve_translator
 
 
 def prepare_translation_context(
@@ -56,6 +62,7 @@ def prepare_translation_context(
         target_language,
         use_tm,
     )
+    term_matcher = TermMatcher(preferred_terms)
     use_placeholders = resolved_provider != "ollama"
 
     param_overrides = (param_overrides or {}).copy()
@@ -78,10 +85,11 @@ def prepare_translation_context(
         source_lang,
         use_tm,
         use_placeholders,
-        preferred_terms,
+        term_matcher,
         refresh=refresh,
         llm_context=llm_context,
     )
+    pending, duplicates = dedupe_pending_blocks(pending, llm_context)
 
     params = _prepare_params(
         resolved_provider,
@@ -90,9 +98,16 @@ def prepare_translation_context(
         tone,
         vision_context,
     )
-    chunk_size = _determine_chunk_size(pending, params)
+    chunks = _plan_chunks(pending, params, resolved_provider, model or params.get("model"))
+    context_index = None
+    if params["context_strategy"] != "none":
+        context_index = DocumentContextIndex(
+            blocks_list,
+            token_budget=params["context_token_budget"],
+            provider=resolved_provider,
+        )
 
-    glossary = load_glossary(params["glossary_path"])
+    glossary = TermMatcher(load_glossary(params["glossary_path"]), ignore_case=False)
 
     return {
         "resolved_mode": resolved_mode,
@@ -103,13 +118,17 @@ def prepare_translation_context(
         "source_lang": source_lang,
         "domain": domain,
         "preferred_terms": preferred_terms,
+        "term_matcher": term_matcher,
         "use_placeholders": use_placeholders,
         "param_overrides": param_overrides,
         "llm_context": llm_context,
         "translated_texts": translated_texts,
         "pending": pending,
+        "duplicates": duplicates,
         "local_cache": local_cache,
         "params": params,
-        "chunk_size": chunk_size,
+        "chunks": chunks,
+        "chunk_size": max((len(chunk) for chunk in chunks), default=0),
+        "context_index": context_index,
         "glossary": glossary,
     }
@@ -6,11 +6,9 @@ import time
 from collections.abc import Callable
 from typing import Any
 
-import httpx
-
 from backend.config import settings
 from backend.services.llm_contract import build_contract
-from backend.services.llm_utils import chunked
+from backend.services.llm_deadline import Deadline
 from backend.services.translate_llm_helpers import create_async_chunk_tasks
 
 from .chunk import _finalize_texts, _translate_chunk_sync
@@ -65,7 +63,7 @@ def translate_blocks(
         ctx["chunk_size"],
     )
 
-    for chunk_index, chunk in enumerate(chunked(ctx["pending"], ctx["chunk_size"]), start=1):
+    for chunk_index, chunk in enumerate(ctx["chunks"], start=1):
         chunk_started = time.perf_counter()
         _translate_chunk_sync(
             ctx["translator"],
@@ -86,6 +84,9 @@ def translate_blocks(
             ctx["glossary"],
             use_tm,
             chunk_index,
+            duplicates=ctx["duplicates"],
+            term_matcher=ctx["term_matcher"],
+            context_index=ctx["context_index"],
         )
         chunk_duration = time.perf_counter() - chunk_started
         LOGGER.info(
@@ -123,7 +124,10 @@ async def translate_blocks_async(
     param_overrides: dict | None = None,
     on_progress: Callable[[dict], Any] | None = None,
     mode: str | None = None,
+    deadline: Deadline | None = None,
 ) -> dict:
+    if deadline is None or deadline.at is None:
+        deadline = Deadline.after(settings.llm_job_deadline)
     ctx = prepare_translation_context(
         blocks,
         target_language,
@@ -151,9 +155,8 @@ async def translate_blocks_async(
         ctx["chunk_size"],
     )
 
-    chunk_list = list(chunked(ctx["pending"], ctx["chunk_size"]))
     tasks = create_async_chunk_tasks(
-        chunk_list,
+        ctx["chunks"],
         ctx["translator"],
         ctx["resolved_provider"],
         ctx["blocks_list"],
@@ -171,37 +174,33 @@ async def translate_blocks_async(
         vision_context,
         on_progress,
         llm_context=ctx["llm_context"],
+        duplicates=ctx["duplicates"],
+        term_matcher=ctx["term_matcher"],
+        context_index=ctx["context_index"],
+        deadline=deadline,
     )
 
     if tasks:
-        if settings.llm_max_concurrency > 0:
-            sem_val = settings.llm_max_concurrency
-        else:
-            sem_val = 1 if ctx["resolved_provider"] == "ollama" else 5
-
-        sem = asyncio.Semaphore(sem_val)
-
-        async def sem_wrapped_task(task):
-            async with sem:
-                try:
-                    return await asyncio.wait_for(task, timeout=settings.llm_request_timeout)
-                except asyncio.TimeoutError:
-                    LOGGER.error("LLM Task timed out after %ss", settings.llm_request_timeout)
-                    return None
-                except Exception as exc:
-                    import traceback
-                    LOGGER.error("LLM Task failed: %s\n%s", exc, traceback.format_exc())
-                    return None
-
-        final_tasks = [sem_wrapped_task(t) for t in tasks]
-
-        if hasattr(ctx["translator"], "set_async_client"):
-            total_timeout = httpx.Timeout(settings.ollama_timeout, connect=10.0)
-            async with httpx.AsyncClient(timeout=total_timeout) as client:
-                ctx["translator"].set_async_client(client)
-                await asyncio.gather(*final_tasks)
-        else:
-            await asyncio.gather(*final_tasks)
+        # Chunks queue in the model's shared fair scheduler (llm_scheduler)
+        # and each LLM call takes a slot from the adaptive limiter
+        # (llm_limiter); each request's timeout starts once it holds that slot
+        # and is capped by the job deadline (llm_deadline).
+        async def guarded_task(task):
+            try:
+                return await task
+            except asyncio.TimeoutError:
+                # Re-queued already; its blocks went out as failed_ids.
+                LOGGER.error("LLM chunk gave up after timing out (deadline or re-queues spent)")
+                return None
+            except Exception as exc:
+                import traceback
+                LOGGER.error("LLM Task failed: %s\n%s", exc, traceback.format_exc())
+                return None
+
+        final_tasks = [guarded_task(t) for t in tasks]
+
+        # Translators share pooled clients from llm_http across jobs.
+        await asyncio.gather(*final_tasks)
 
     final_texts = [text if text is not None else "" for text in ctx["translated_texts"]]
 
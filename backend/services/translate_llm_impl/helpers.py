@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from typing import Any
 
+from backend.config import settings
+from backend.services.chunk_planner import plan_chunks
 from backend.services.llm_clients import MockTranslator
+from backend.services.llm_utils import chunked
 from backend.services.translate_selector import get_translation_params, select_translator
 
 
@@ -33,7 +36,12 @@ def _prepare_params(
     vision_context: bool,
 ) -> dict[str, Any]:
     overrides.update({"model": model, "tone": tone, "vision_context": vision_context})
+    explicit_chunk_size = "chunk_size" in overrides
     params = get_translation_params(resolved_provider, overrides=overrides)
+    # The token planner only caps block counts the caller asked for explicitly.
+    params["max_blocks"] = (
+        params["chunk_size"] if explicit_chunk_size else settings.llm_chunk_max_blocks
+    )
     if params["single_request"]:
         params["chunk_delay"] = 0.0
     return params
@@ -44,3 +52,14 @@ def _determine_chunk_size(pending: list, params: dict[str, Any]) -> int:
     if params["single_request"]:
         return len(pending) if pending else chunk_size
     return chunk_size
+
+
+def _plan_chunks(
+    pending: list,
+    params: dict[str, Any],
+    provider: str,
+    model: str | None,
+) -> list[list]:
+    if not settings.llm_chunk_planner:
+        return list(chunked(pending, _determine_chunk_size(pending, params)))
+    return plan_chunks(pending, params, provider, model)
@@ -52,15 +52,16 @@ def build_ollama_batch_prompt(
     )
 
     try:
+        # Everything but the blocks is fixed per (language, strict, tone, vision).
         return render_prompt(
             "ollama_batch",
-            {
+            {"blocks": blocks_text},
+            static={
                 "target_language_label": label,
                 "target_language_code": target_language,
                 "language_guard": language_guard,
                 "language_hint": f"{hint}\n{tone_hint}\n{vision_hint}".strip(),
                 "language_example": example,
-                "blocks": blocks_text,
             },
         )
     except FileNotFoundError:
@@ -85,6 +86,12 @@ def build_ollama_batch_prompt(
         )
 
 
+def clean_block_text(content: str) -> str:
+    """Strip echoed tags and stray markers from one parsed block."""
+    cleaned = TAG_PATTERN.sub("", content).strip()
+    return re.sub(r"<<<BLOCK:\d+>>>|<<<END>>>", "", cleaned).strip()
+
+
 def parse_ollama_batch_response(text: str, count: int) -> list[str] | None:
     """Parse Ollama batch translation response."""
     matches = BLOCK_RESPONSE_PATTERN.findall(text)
@@ -97,9 +104,7 @@ def parse_ollama_batch_response(text: str, count: int) -> list[str] | None:
             continue
         idx = int(idx_str)
         if 0 <= idx < count:
-            cleaned = TAG_PATTERN.sub("", content).strip()
-            cleaned = re.sub(r"<<<BLOCK:\d+>>>|<<<END>>>", "", cleaned).strip()
-            translated[idx] = cleaned
+            translated[idx] = clean_block_text(content)
 
     if any(item == "" for item in translated):
         return None
@@ -16,7 +16,7 @@ from backend.services.translate_retry_utils import (
     matches_target_language,
     should_save_tm,
 )
-from backend.services.translation_memory_adapter import save_tm
+from backend.services.translation_memory_adapter import save_tm_many
 
 
 def apply_translation_results(
@@ -33,6 +33,7 @@ def apply_translation_results(
     """Restore placeholders, apply glossary, and optionally save to TM."""
     from backend.config import settings
 
+    tm_pairs: list[tuple[str, str]] = []
     for (original, mapping), translated in zip(
         zip(chunk, placeholder_maps, strict=True),
         result["blocks"],
@@ -59,15 +60,17 @@ def apply_translation_results(
 
         if should_save_tm(translated_text, target_language, use_tm):
             cache[key] = translated_text
-            save_tm(
-                source_lang=settings.source_language
-                if settings.source_language != "auto"
-                else "unknown",
-                target_lang=target_language,
-                text=source_text,
-                translated=translated_text,
-                context=llm_context,
-            )
+            tm_pairs.append((source_text, translated_text))
+
+    if tm_pairs:
+        save_tm_many(
+            source_lang=settings.source_language
+            if settings.source_language != "auto"
+            else "unknown",
+            target_lang=target_language,
+            pairs=tm_pairs,
+            context=llm_context,
+        )
 
 
 def retry_for_language(
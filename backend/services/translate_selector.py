@@ -134,6 +134,9 @@ def get_translation_params(
         "backoff": settings.llm_retry_backoff,
         "max_backoff": settings.llm_retry_max_backoff,
         "context_strategy": settings.llm_context_strategy.lower(),
+        "context_token_budget": overrides.get(
+            "context_token_budget", settings.llm_context_token_budget
+        ),
         "glossary_path": settings.llm_glossary_path or "",
         "model": overrides.get("model", settings.ollama_model),
         "tone": overrides.get("tone"),
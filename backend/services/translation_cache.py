@@ -4,10 +4,54 @@ import hashlib
 import logging
 import sqlite3
 import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 
+from backend.config import settings
+
 LOGGER = logging.getLogger(__name__)
 
+# SQLite caps the number of bound parameters per statement (999 on older builds).
+_MAX_IN_PARAMS = 900
+# Memory-tier hits buffered before their last_used_at is written back.
+_TOUCH_BATCH = 256
+
+
+class MemoryLRU:
+    """Thread-safe bounded LRU map used as the in-process cache tier."""
+
+    def __init__(self, max_items: int):
+        self.max_items = max(0, max_items)
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
 
 class TranslationCache:
     _instance: TranslationCache | None = None
@@ -26,6 +70,21 @@ class TranslationCache:
 
         self.db_path = Path("data/cache.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.memory = MemoryLRU(settings.translation_cache_memory_items)
+        self.max_rows = settings.translation_cache_max_rows
+        self.max_bytes = settings.translation_cache_max_bytes
+        self.ttl_seconds = settings.translation_cache_ttl_days * 86400
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "db_evictions": 0,
+        }
+        self._writes_since_evict = 0
+        # Keys served from memory since last_used_at was last written back.
+        self._memory_used: set[str] = set()
         self._init_db()
         self._initialized = True
 
@@ -37,15 +96,69 @@ class TranslationCache:
             provider TEXT,
             model TEXT,
             target_lang TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at REAL
         )
         """
-        with sqlite3.connect(self.db_path, check_same_thread=False) as conn:
+        conn = self._get_conn()
+        with conn:
             conn.execute(query)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(translation_cache)")]
+            if "last_used_at" not in columns:
+                conn.execute("ALTER TABLE translation_cache ADD COLUMN last_used_at REAL")
+                conn.execute(
+                    "UPDATE translation_cache "
+                    "SET last_used_at = CAST(strftime('%s', created_at) AS REAL)"
+                )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_cache_key "
                 "ON translation_cache(key)"
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_last_used "
+                "ON translation_cache(last_used_at)"
+            )
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return the long-lived WAL connection owned by the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the current thread's pooled connection, if any."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        if amount:
+            with self._stats_lock:
+                self._stats[name] += amount
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters for both tiers."""
+        with self._stats_lock:
+            counters = dict(self._stats)
+        lookups = counters["memory_hits"] + counters["db_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["db_hits"]
+        counters.update(
+            {
+                "memory_items": len(self.memory),
+                "memory_max_items": self.memory.max_items,
+                "memory_evictions": self.memory.evictions,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "max_rows": self.max_rows,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+        )
+        return counters
 
     def _make_key(
         self,
@@ -71,26 +184,106 @@ class TranslationCache:
         tone: str | None = None,
         vision_context: bool = True,
     ) -> str | None:
-        key = self._make_key(
-            source_text,
+        return self.get_many(
+            [source_text],
             target_lang,
             provider,
             model,
             tone,
             vision_context,
-        )
+        )[0]
+
+    def get_many(
+        self,
+        source_texts: Sequence[str],
+        target_lang: str,
+        provider: str,
+        model: str,
+        tone: str | None = None,
+        vision_context: bool = True,
+    ) -> list[str | None]:
+        """Resolve many source texts at once; results follow input order."""
+        keys = [
+            self._make_key(text, target_lang, provider, model, tone, vision_context)
+            for text in source_texts
+        ]
+        found: dict[str, str] = {}
+        for key in keys:
+            if key in found:
+                continue
+            value = self.memory.get(key)
+            if value is not None:
+                found[key] = value
+        memory_hits = len(found)
+        pending = self._note_memory_hits(found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        db_found: dict[str, str] = {}
+        if missing:
+            try:
+                conn = self._get_conn()
+                for start in range(0, len(missing), _MAX_IN_PARAMS):
+                    batch = missing[start:start + _MAX_IN_PARAMS]
+                    placeholders = ",".join("?" * len(batch))
+                    cursor = conn.execute(
+                        "SELECT key, translated_text FROM translation_cache "
+                        f"WHERE key IN ({placeholders})",
+                        batch,
+                    )
+                    db_found.update(cursor.fetchall())
+                self._touch(conn, [*db_found, *self._take_memory_hits()])
+            except Exception as err:
+                LOGGER.error("Cache get_many error: %s", err)
+            for key, value in db_found.items():
+                self.memory.put(key, value)
+            found.update(db_found)
+        elif pending >= _TOUCH_BATCH:
+            self.flush_touches()
+
+        self._bump("memory_hits", memory_hits)
+        self._bump("db_hits", len(db_found))
+        self._bump("misses", len(missing) - len(db_found))
+        return [found.get(key) for key in keys]
+
+    def _note_memory_hits(self, keys: Iterable[str]) -> int:
+        with self._stats_lock:
+            self._memory_used.update(keys)
+            return len(self._memory_used)
+
+    def _take_memory_hits(self) -> list[str]:
+        with self._stats_lock:
+            keys = list(self._memory_used)
+            self._memory_used.clear()
+        return keys
+
+    def flush_touches(self) -> None:
+        """Write last_used_at back for keys served from the memory tier.
+
+        Hot keys rarely reach SQLite, so without this their rows would look
+        unused and be evicted first.
+        """
+        keys = self._take_memory_hits()
+        if not keys:
+            return
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT translated_text FROM translation_cache "
-                    "WHERE key = ?",
-                    (key,),
-                )
-                row = cursor.fetchone()
-                return row[0] if row else None
+            self._touch(self._get_conn(), keys)
         except Exception as err:
-            LOGGER.error("Cache get error: %s", err)
-            return None
+            LOGGER.error("Cache touch error: %s", err)
+
+    def _touch(self, conn: sqlite3.Connection, keys: list[str]) -> None:
+        """Refresh last_used_at for rows served from either tier."""
+        if not keys:
+            return
+        now = time.time()
+        with conn:
+            for start in range(0, len(keys), _MAX_IN_PARAMS):
+                batch = keys[start:start + _MAX_IN_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                conn.execute(
+                    "UPDATE translation_cache SET last_used_at = ? "
+                    f"WHERE key IN ({placeholders})",
+                    [now, *batch],
+                )
 
     def set(
         self,
@@ -102,29 +295,102 @@ class TranslationCache:
         tone: str | None = None,
         vision_context: bool = True,
     ) -> None:
-        if not translated_text:
-            return
-        key = self._make_key(
-            source_text,
+        self.set_many(
+            [(source_text, translated_text)],
             target_lang,
             provider,
             model,
             tone,
             vision_context,
         )
+
+    def set_many(
+        self,
+        items: Iterable[tuple[str, str]],
+        target_lang: str,
+        provider: str,
+        model: str,
+        tone: str | None = None,
+        vision_context: bool = True,
+    ) -> None:
+        """Store (source_text, translated_text) pairs in one transaction."""
+        now = time.time()
+        rows = [
+            (
+                self._make_key(source, target_lang, provider, model, tone, vision_context),
+                translated,
+                provider,
+                model,
+                target_lang,
+                now,
+            )
+            for source, translated in items
+            if translated
+        ]
+        if not rows:
+            return
+        for row in rows:
+            self.memory.put(row[0], row[1])
         query = (
             "INSERT OR REPLACE INTO translation_cache "
-            "(key, translated_text, provider, model, target_lang) "
-            "VALUES (?, ?, ?, ?, ?)"
+            "(key, translated_text, provider, model, target_lang, last_used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
         )
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    query,
-                    (key, translated_text, provider, model, target_lang),
-                )
+            conn = self._get_conn()
+            with conn:
+                conn.executemany(query, rows)
+        except Exception as err:
+            LOGGER.error("Cache set_many error: %s", err)
+            return
+
+        self._writes_since_evict += len(rows)
+        if self._writes_since_evict >= settings.translation_cache_evict_interval:
+            self._writes_since_evict = 0
+            self.evict()
+
+    def evict(self) -> int:
+        """Apply TTL, max-rows and max-bytes limits to the SQLite tier.
+
+        Rows are removed oldest ``last_used_at`` first. Returns the number of
+        rows deleted.
+        """
+        self.flush_touches()
+        deleted = 0
+        try:
+            conn = self._get_conn()
+            with conn:
+                if self.ttl_seconds > 0:
+                    cursor = conn.execute(
+                        "DELETE FROM translation_cache WHERE last_used_at < ?",
+                        (time.time() - self.ttl_seconds,),
+                    )
+                    deleted += max(cursor.rowcount, 0)
+
+                rows, size = conn.execute(
+                    "SELECT COUNT(*), "
+                    "COALESCE(SUM(LENGTH(key) + LENGTH(translated_text)), 0) "
+                    "FROM translation_cache"
+                ).fetchone()
+                excess = 0
+                if self.max_rows > 0 and rows > self.max_rows:
+                    excess = rows - self.max_rows
+                if self.max_bytes > 0 and size > self.max_bytes and rows:
+                    avg_row = size / rows
+                    excess = max(excess, int((size - self.max_bytes) / avg_row) + 1)
+                if excess:
+                    cursor = conn.execute(
+                        "DELETE FROM translation_cache WHERE key IN ("
+                        "  SELECT key FROM translation_cache "
+                        "  ORDER BY last_used_at ASC LIMIT ?"
+                        ")",
+                        (excess,),
+                    )
+                    deleted += max(cursor.rowcount, 0)
         except Exception as err:
-            LOGGER.error("Cache set error: %s", err)
+            LOGGER.error("Cache evict error: %s", err)
+        self._bump("db_evictions", deleted)
+        return deleted
 
 
 # Singleton
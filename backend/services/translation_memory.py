@@ -37,7 +37,9 @@ from backend.services.translation_memory_sqlite.tm import (
     get_tm_terms,
     get_tm_terms_any,
     lookup_tm,
+    lookup_tm_many,
     save_tm,
+    save_tm_many,
     seed_tm,
     upsert_tm,
 )
@@ -108,7 +110,9 @@ __all__ = [
     "list_learning_stats",
     "list_tm_categories",
     "lookup_tm",
+    "lookup_tm_many",
     "save_tm",
+    "save_tm_many",
     "seed_glossary",
     "seed_tm",
     "update_tm_category",
@@ -5,7 +5,7 @@ from sqlalchemy import text
 from backend.db.engine import get_engine
 
 from .db import _ensure_db
-from .learning import _record_learning_event
+from .learning import SINK
 
 
 def apply_glossary(source_lang: str, target_lang: str, text_value: str) -> str:
@@ -26,7 +26,7 @@ def apply_glossary(source_lang: str, target_lang: str, text_value: str) -> str:
     for source_text, target_text in rows:
         updated = updated.replace(source_text, target_text)
     if updated != text_value:
-        _record_learning_event(
+        SINK.emit(
             "lookup_hit_glossary",
             source_text=text_value,
             target_text=updated,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy import text
 
 from backend.db.engine import get_engine
+from backend.services.learning_sink import LearningEventSink
 
 from .db import _ensure_db
 
@@ -47,6 +48,59 @@ def _record_learning_event(
         return
 
 
+def _record_learning_events(events: list[dict]) -> None:
+    """Insert many learning events (``_record_learning_event`` kwargs) at once."""
+    if not events:
+        return
+    _ensure_db()
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO learning_events "
+                "(event_type, scope_type, scope_id, actor_type, entity_type, entity_id, "
+                "source_text, target_text, source_lang, target_lang, created_at) "
+                "VALUES (:event_type, :scope_type, :scope_id, :actor_type, :entity_type, "
+                ":entity_id, :source_text, :target_text, :source_lang, :target_lang, now())"
+            ),
+            [
+                {
+                    "event_type": event["event_type"],
+                    "scope_type": event.get("scope_type", "project"),
+                    "scope_id": event.get("scope_id", "default"),
+                    "actor_type": "system",
+                    "entity_type": event.get("entity_type"),
+                    "entity_id": event.get("entity_id"),
+                    "source_text": event.get("source_text"),
+                    "target_text": event.get("target_text"),
+                    "source_lang": event.get("source_lang"),
+                    "target_lang": event.get("target_lang"),
+                }
+                for event in events
+            ],
+        )
+
+
+def _record_tm_hits(counts: dict[int, int]) -> None:
+    """Apply coalesced hit counts ({entry_id: hits}) in one transaction."""
+    if not counts:
+        return
+    _ensure_db()
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE tm SET hit_count = hit_count + :count, last_hit_at = now() "
+                "WHERE id = :id"
+            ),
+            [{"count": count, "id": entry_id} for entry_id, count in counts.items()],
+        )
+
+
+# Hot-path lookups and ingest queue here instead of writing synchronously.
+SINK = LearningEventSink("postgres", _record_learning_events, _record_tm_hits)
+
+
 def list_learning_events(
     limit: int = 200,
     offset: int = 0,
@@ -63,6 +117,7 @@ def list_learning_events(
     sort_dir: str | None = None,
 ) -> tuple[list[dict], int]:
     _ensure_db()
+    SINK.flush()
     limit = max(1, min(int(limit or 200), 1000))
     offset = max(0, int(offset or 0))
     where = []
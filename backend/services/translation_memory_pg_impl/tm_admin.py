@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy import text
 
 from backend.db.engine import get_engine
+from backend.services import tm_fuzzy_index
 
 from .db import _ensure_db
 from .learning import _record_learning_event
@@ -130,6 +131,7 @@ def upsert_tm(entry: dict) -> None:
         scope_type=scope_type,
         scope_id=scope_id,
     )
+    tm_fuzzy_index.invalidate()
 
 
 def delete_tm(entry_id: int) -> int:
@@ -137,6 +139,7 @@ def delete_tm(entry_id: int) -> int:
     engine = get_engine()
     with engine.begin() as conn:
         res = conn.execute(text("DELETE FROM tm WHERE id = :id"), {"id": entry_id})
+    tm_fuzzy_index.invalidate()
     return res.rowcount or 0
 
 
@@ -147,6 +150,7 @@ def batch_delete_tm(ids: list[int]) -> int:
     engine = get_engine()
     with engine.begin() as conn:
         res = conn.execute(text("DELETE FROM tm WHERE id = ANY(:ids)"), {"ids": ids})
+    tm_fuzzy_index.invalidate()
     return res.rowcount or 0
 
 
@@ -155,4 +159,5 @@ def clear_tm() -> int:
     engine = get_engine()
     with engine.begin() as conn:
         res = conn.execute(text("DELETE FROM tm"))
+    tm_fuzzy_index.invalidate()
     return res.rowcount or 0
@@ -5,9 +5,10 @@ from collections.abc import Iterable
 from sqlalchemy import text
 
 from backend.db.engine import get_engine
+from backend.services import tm_fuzzy_index
 
 from .db import _ensure_db
-from .learning import _record_learning_event
+from .learning import SINK
 from .preserve_terms import _get_preserve_terms, _is_preserve_term
 from .utils import _hash_text, _is_low_quality_tm, _normalize_glossary_text, _resolve_context_scope
 
@@ -21,99 +22,179 @@ def save_tm(
     text_value: str | None = None,
 ) -> None:
     text_value = text_value if text_value is not None else text
-    if not text_value or not translated:
-        return
-    if _is_low_quality_tm(text_value, translated):
+    save_tm_many(source_lang, target_lang, [(text_value, translated)], context=context)
+
+
+def _filter_tm_pairs(
+    source_lang: str,
+    target_lang: str,
+    pairs: Iterable[tuple[str | None, str]],
+    context: dict | None,
+) -> dict[str, tuple[str, str]]:
+    """Drop empty, low-quality and preserve-term pairs; key the rest by TM hash."""
+    candidates: dict[str, tuple[str, str]] = {}
+    preserve_terms = None
+    for text_value, translated in pairs:
+        if not text_value or not translated:
+            continue
+        if _is_low_quality_tm(text_value, translated):
+            continue
+        source_text = text_value.strip()
+        target_text = translated.strip()
+        if not source_text or not target_text:
+            continue
+        if preserve_terms is None:
+            preserve_terms = _get_preserve_terms()
+        if _is_preserve_term(source_text, preserve_terms):
+            continue
+        key = _hash_text(source_lang, target_lang, text_value, context=context)
+        candidates[key] = (source_text, target_text)
+    return candidates
+
+
+def save_tm_many(
+    source_lang: str,
+    target_lang: str,
+    pairs: Iterable[tuple[str | None, str]],
+    context: dict | None = None,
+) -> None:
+    """Batch form of :func:`save_tm` for (text, translated) pairs sharing one context.
+
+    Low-quality and preserve-term entries are filtered in memory, the existing
+    hash / glossary / duplicate checks run as ``= ANY(...)`` queries, and all
+    upserts go through one ``INSERT ... ON CONFLICT`` in a single transaction.
+    """
+    candidates = _filter_tm_pairs(source_lang, target_lang, pairs, context)
+    if not candidates:
         return
     _ensure_db()
-    source_text = text_value.strip()
-    target_text = translated.strip()
-    if not source_text or not target_text:
-        return
-    preserve_terms = _get_preserve_terms()
-    if _is_preserve_term(source_text, preserve_terms):
-        return
-    key = _hash_text(source_lang, target_lang, text_value, context=context)
     scope_type, scope_id, domain, category = _resolve_context_scope(context)
+    event_base = {
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "entity_type": "tm",
+        "scope_type": scope_type,
+        "scope_id": scope_id,
+    }
+    events: list[dict] = []
+    overwritten: list[str] = []
     engine = get_engine()
     with engine.begin() as conn:
-        existing = conn.execute(
-            text("SELECT id, target_text FROM tm WHERE hash = :hash"),
-            {"hash": key},
-        ).fetchone()
-        if existing and existing[1] != target_text:
+        existing = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(
+                text("SELECT hash, id, target_text FROM tm WHERE hash = ANY(:hashes)"),
+                {"hashes": list(candidates)},
+            ).fetchall()
+        }
+        normalized = {
+            key: _normalize_glossary_text(source_text)
+            for key, (source_text, _) in candidates.items()
+        }
+        in_glossary = {
+            row[0]
+            for row in conn.execute(
+                text(
+                    "SELECT source_text FROM glossary "
+                    "WHERE source_lang = :source_lang AND target_lang = :target_lang "
+                    "AND source_text = ANY(:sources)"
+                ),
+                {
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "sources": list(dict.fromkeys(normalized.values())),
+                },
+            ).fetchall()
+        }
+        known_pairs = {
+            (row[0], row[1])
+            for row in conn.execute(
+                text(
+                    "SELECT source_text, target_text FROM tm "
+                    "WHERE source_text = ANY(:sources)"
+                ),
+                {"sources": list(dict.fromkeys(entry[0] for entry in candidates.values()))},
+            ).fetchall()
+        }
+
+        overwrites: list[dict] = []
+        upserts: list[dict] = []
+        for key, (source_text, target_text) in candidates.items():
+            current = existing.get(key)
+            if current and current[1] != target_text:
+                overwrites.append({"id": current[0]})
+                events.append(
+                    {
+                        **event_base,
+                        "event_type": "overwrite",
+                        "source_text": source_text,
+                        "target_text": target_text,
+                        "entity_id": current[0],
+                    }
+                )
+            if normalized[key] in in_glossary or (source_text, target_text) in known_pairs:
+                continue
+            known_pairs.add((source_text, target_text))
+            if current is not None:
+                overwritten.append(key)
+            upserts.append(
+                {
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "source_text": source_text,
+                    "target_text": target_text,
+                    "domain": domain,
+                    "category": category,
+                    "scope_type": scope_type,
+                    "scope_id": scope_id,
+                    "hash": key,
+                }
+            )
+            events.append(
+                {
+                    **event_base,
+                    "event_type": "ingest",
+                    "source_text": source_text,
+                    "target_text": target_text,
+                }
+            )
+        if overwrites:
             conn.execute(
                 text("UPDATE tm SET overwrite_count = overwrite_count + 1 WHERE id = :id"),
-                {"id": existing[0]},
+                overwrites,
             )
-            _record_learning_event(
-                "overwrite",
-                source_text=source_text,
-                target_text=target_text,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                entity_type="tm",
-                entity_id=existing[0],
-                scope_type=scope_type,
-                scope_id=scope_id,
+        if upserts:
+            conn.execute(
+                text(
+                    "INSERT INTO tm "
+                    "(source_lang, target_lang, source_text, target_text, "
+                    "domain, category, scope_type, scope_id, hash, created_at) "
+                    "VALUES (:source_lang, :target_lang, :source_text, :target_text, "
+                    ":domain, :category, :scope_type, :scope_id, :hash, now()) "
+                    "ON CONFLICT (hash) DO UPDATE SET "
+                    "target_text = EXCLUDED.target_text, "
+                    "domain = EXCLUDED.domain, "
+                    "category = EXCLUDED.category, "
+                    "scope_type = EXCLUDED.scope_type, "
+                    "scope_id = EXCLUDED.scope_id"
+                ),
+                upserts,
             )
-        normalized_source = _normalize_glossary_text(source_text)
-        cur = conn.execute(
-            text(
-                "SELECT 1 FROM glossary "
-                "WHERE source_lang = :source_lang AND target_lang = :target_lang "
-                "AND source_text = :source_text LIMIT 1"
-            ),
-            {
-                "source_lang": source_lang,
-                "target_lang": target_lang,
-                "source_text": normalized_source,
-            },
-        )
-        if cur.fetchone():
-            return
-        cur = conn.execute(
-            text("SELECT 1 FROM tm WHERE source_text = :source_text AND target_text = :target_text LIMIT 1"),
-            {"source_text": source_text, "target_text": target_text},
-        )
-        if cur.fetchone():
-            return
-        conn.execute(
-            text(
-                "INSERT INTO tm "
-                "(source_lang, target_lang, source_text, target_text, "
-                "domain, category, scope_type, scope_id, hash, created_at) "
-                "VALUES (:source_lang, :target_lang, :source_text, :target_text, "
-                ":domain, :category, :scope_type, :scope_id, :hash, now()) "
-                "ON CONFLICT (hash) DO UPDATE SET "
-                "target_text = EXCLUDED.target_text, "
-                "domain = EXCLUDED.domain, "
-                "category = EXCLUDED.category, "
-                "scope_type = EXCLUDED.scope_type, "
-                "scope_id = EXCLUDED.scope_id"
-            ),
-            {
-                "source_lang": source_lang,
-                "target_lang": target_lang,
-                "source_text": source_text,
-                "target_text": target_text,
-                "domain": domain,
-                "category": category,
-                "scope_type": scope_type,
-                "scope_id": scope_id,
-                "hash": key,
-            },
-        )
-    _record_learning_event(
-        "ingest",
-        source_text=source_text,
-        target_text=target_text,
-        source_lang=source_lang,
-        target_lang=target_lang,
-        entity_type="tm",
-        scope_type=scope_type,
-        scope_id=scope_id,
-    )
+        refreshed = []
+        if overwritten:
+            # ON CONFLICT rewrote these rows in place, keeping their ids.
+            refreshed = [
+                dict(row._mapping)
+                for row in conn.execute(
+                    text(
+                        "SELECT id, source_text, target_text, domain, category, "
+                        "scope_type, scope_id, hash, status FROM tm WHERE hash = ANY(:hashes)"
+                    ),
+                    {"hashes": overwritten},
+                ).fetchall()
+            ]
+    tm_fuzzy_index.refresh_rows(refreshed, source_lang, target_lang, store="postgres")
+    SINK.emit_many(events)
 
 
 def seed_tm(entries: Iterable[tuple[str, str, str, str]]) -> None:
@@ -137,3 +218,4 @@ def seed_tm(entries: Iterable[tuple[str, str, str, str]]) -> None:
                     "hash": key,
                 },
             )
+    tm_fuzzy_index.invalidate()
@@ -3,27 +3,52 @@ from __future__ import annotations
 from sqlalchemy import text
 
 from backend.db.engine import get_engine
-from backend.services.tm_matcher import fuzzy_match, normalize_text
+from backend.services.tm_fuzzy_index import FuzzyTMIndex, get_index
 
 from .db import _ensure_db
-from .learning import _record_learning_event
+from .learning import SINK
 from .utils import _hash_text, _resolve_context_scope
 
+_FUZZY_COLUMNS = (
+    "id",
+    "source_text",
+    "target_text",
+    "domain",
+    "category",
+    "scope_type",
+    "scope_id",
+    "hash",
+)
 
-def _record_tm_hit(entry_id: int) -> None:
-    try:
-        _ensure_db()
-        engine = get_engine()
-        with engine.begin() as conn:
-            conn.execute(
-                text(
-                    "UPDATE tm SET hit_count = hit_count + 1, last_hit_at = now() "
-                    "WHERE id = :id"
-                ),
-                {"id": entry_id},
-            )
-    except Exception:
-        return
+
+def _sync_fuzzy_index(
+    conn,
+    index: FuzzyTMIndex,
+    source_lang: str,
+    target_lang: str,
+    scope_type: str,
+    scope_id: str | None,
+) -> None:
+    """Feed rows newer than the index high-water mark into the fuzzy index."""
+    rows = conn.execute(
+        text(
+            "SELECT id, source_text, target_text, domain, category, scope_type, scope_id, hash "
+            "FROM tm WHERE id > :high_water "
+            "AND source_lang = :source_lang AND target_lang = :target_lang "
+            "AND status = 'active' "
+            "AND (scope_type = :scope_type OR scope_type IS NULL) "
+            "AND (scope_id = :scope_id OR scope_id IS NULL) "
+            "ORDER BY id"
+        ),
+        {
+            "high_water": index.high_water,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "scope_type": scope_type,
+            "scope_id": scope_id,
+        },
+    ).fetchall()
+    index.add_rows(dict(zip(_FUZZY_COLUMNS, row, strict=True)) for row in rows)
 
 
 def lookup_tm(
@@ -48,8 +73,8 @@ def lookup_tm(
             {"hash": key, "scope_type": scope_type, "scope_id": scope_id},
         ).fetchone()
     if row:
-        _record_tm_hit(row[0])
-        _record_learning_event(
+        SINK.add_hit(row[0])
+        SINK.emit(
             "lookup_hit_tm",
             source_text=text_value,
             target_text=row[1],
@@ -62,7 +87,7 @@ def lookup_tm(
         )
         return row[1]
     if not use_fuzzy:
-        _record_learning_event(
+        SINK.emit(
             "lookup_miss",
             source_text=text_value,
             source_lang=source_lang,
@@ -72,74 +97,11 @@ def lookup_tm(
             scope_id=scope_id,
         )
         return None
+    index = get_index(source_lang, target_lang, scope_type, scope_id, store="postgres")
     with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                "SELECT id, source_text, target_text, domain, category, scope_type, scope_id "
-                "FROM tm "
-                "WHERE source_lang = :source_lang AND target_lang = :target_lang "
-                "AND status = 'active' "
-                "AND (scope_type = :scope_type OR scope_type IS NULL) "
-                "AND (scope_id = :scope_id OR scope_id IS NULL) "
-                "ORDER BY id DESC LIMIT 500"
-            ),
-            {
-                "source_lang": source_lang,
-                "target_lang": target_lang,
-                "scope_type": scope_type,
-                "scope_id": scope_id,
-            },
-        ).fetchall()
-    if not rows:
-        _record_learning_event(
-            "lookup_miss",
-            source_text=text_value,
-            source_lang=source_lang,
-            target_lang=target_lang,
-            entity_type="tm",
-            scope_type=scope_type,
-            scope_id=scope_id,
-        )
-        return None
-    normalized_query = normalize_text(text_value)
-    for entry_id, source_text, target_text, _, _, _, _ in rows:
-        if normalize_text(source_text) == normalized_query:
-            _record_tm_hit(entry_id)
-            _record_learning_event(
-                "lookup_hit_tm",
-                source_text=text_value,
-                target_text=target_text,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                entity_type="tm",
-                entity_id=entry_id,
-                scope_type=scope_type,
-                scope_id=scope_id,
-            )
-            return target_text
-    candidates = [
-        {
-            "id": entry_id,
-            "source_text": source_text,
-            "target_text": target_text,
-            "domain": row_domain,
-            "category": row_category,
-            "scope_type": row_scope_type,
-            "scope_id": row_scope_id,
-        }
-        for (
-            entry_id,
-            source_text,
-            target_text,
-            row_domain,
-            row_category,
-            row_scope_type,
-            row_scope_id,
-        ) in rows
-    ]
-    results = fuzzy_match(
-        query=text_value,
-        candidates=candidates,
+        _sync_fuzzy_index(conn, index, source_lang, target_lang, scope_type, scope_id)
+    results = index.search(
+        text_value,
         scope={"domain": domain, "category": category, "scope_type": scope_type, "scope_id": scope_id},
         min_score=0.78,
         limit=1,
@@ -148,8 +110,8 @@ def lookup_tm(
         best = results[0][1]
         entry_id = best.get("id")
         if entry_id:
-            _record_tm_hit(entry_id)
-        _record_learning_event(
+            SINK.add_hit(entry_id)
+        SINK.emit(
             "lookup_hit_tm",
             source_text=text_value,
             target_text=best.get("target_text"),
@@ -161,7 +123,7 @@ def lookup_tm(
             scope_id=scope_id,
         )
         return best.get("target_text")
-    _record_learning_event(
+    SINK.emit(
         "lookup_miss",
         source_text=text_value,
         source_lang=source_lang,
@@ -171,3 +133,75 @@ def lookup_tm(
         scope_id=scope_id,
     )
     return None
+
+
+def lookup_tm_many(
+    source_lang: str,
+    target_lang: str,
+    texts: list[str],
+    context: dict | None = None,
+    use_fuzzy: bool = False,
+) -> list[str | None]:
+    """Batch form of :func:`lookup_tm`; results follow the order of ``texts``.
+
+    Exact hashes are resolved with one ``= ANY(:hashes)`` query, fuzzy matching
+    runs only on the misses, and hit counts / learning events are written in
+    one batch.
+    """
+    results: list[str | None] = [None] * len(texts)
+    if not texts:
+        return results
+    _ensure_db()
+    scope_type, scope_id, domain, category = _resolve_context_scope(context)
+    hashes = [_hash_text(source_lang, target_lang, value, context=context) for value in texts]
+    index = None
+    engine = get_engine()
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT hash, id, target_text FROM tm "
+                "WHERE hash = ANY(:hashes) AND status = 'active' "
+                "AND (scope_type = :scope_type OR scope_type IS NULL) "
+                "AND (scope_id = :scope_id OR scope_id IS NULL)"
+            ),
+            {"hashes": list(set(hashes)), "scope_type": scope_type, "scope_id": scope_id},
+        ).fetchall()
+        exact = {row[0]: (row[1], row[2]) for row in rows}
+        if use_fuzzy and any(key not in exact for key in hashes):
+            index = get_index(source_lang, target_lang, scope_type, scope_id, store="postgres")
+            _sync_fuzzy_index(conn, index, source_lang, target_lang, scope_type, scope_id)
+
+    scope = {"domain": domain, "category": category, "scope_type": scope_type, "scope_id": scope_id}
+    hit_ids: list[int] = []
+    events: list[dict] = []
+    for i, value in enumerate(texts):
+        entry_id, target_text = exact.get(hashes[i], (None, None))
+        if target_text is None and index is not None:
+            matches = index.search(value, scope=scope, min_score=0.78, limit=1)
+            if matches:
+                entry_id = matches[0][1].get("id")
+                target_text = matches[0][1].get("target_text")
+        event = {
+            "source_text": value,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "entity_type": "tm",
+            "scope_type": scope_type,
+            "scope_id": scope_id,
+        }
+        if target_text is not None:
+            results[i] = target_text
+            hit_ids.append(entry_id)
+            events.append(
+                {
+                    **event,
+                    "event_type": "lookup_hit_tm",
+                    "target_text": target_text,
+                    "entity_id": entry_id,
+                }
+            )
+        else:
+            events.append({**event, "event_type": "lookup_miss"})
+    SINK.add_hits(hit_ids)
+    SINK.emit_many(events)
+    return results
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 
 from .db import DB_PATH, _ensure_db
-from .learning import _record_learning_event
+from .learning import SINK
 
 
 def apply_glossary(source_lang: str, target_lang: str, text: str) -> str:
@@ -22,7 +22,7 @@ def apply_glossary(source_lang: str, target_lang: str, text: str) -> str:
     for source_text, target_text in rows:
         updated = updated.replace(source_text, target_text)
     if updated != text:
-        _record_learning_event(
+        SINK.emit(
             "lookup_hit_glossary",
             source_text=text,
             target_text=updated,
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import sqlite3
 
+from backend.services.learning_sink import LearningEventSink
+
 from .db import DB_PATH, _ensure_db
 
 
@@ -43,6 +45,53 @@ def _record_learning_event(
         return
 
 
+def _record_learning_events(events: list[dict]) -> None:
+    """Insert many learning events (``_record_learning_event`` kwargs) at once."""
+    if not events:
+        return
+    with sqlite3.connect(DB_PATH) as conn:
+        conn.executemany(
+            (
+                "INSERT INTO learning_events "
+                "(event_type, scope_type, scope_id, entity_type, entity_id, "
+                "source_text, target_text, source_lang, target_lang) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            ),
+            [
+                (
+                    event["event_type"],
+                    event.get("scope_type", "project"),
+                    event.get("scope_id", "default"),
+                    event.get("entity_type"),
+                    event.get("entity_id"),
+                    event.get("source_text"),
+                    event.get("target_text"),
+                    event.get("source_lang"),
+                    event.get("target_lang"),
+                )
+                for event in events
+            ],
+        )
+        conn.commit()
+
+
+def _record_tm_hits(counts: dict[int, int]) -> None:
+    """Apply coalesced hit counts ({entry_id: hits}) in one transaction."""
+    if not counts:
+        return
+    with sqlite3.connect(DB_PATH) as conn:
+        conn.executemany(
+            "UPDATE tm SET hit_count = hit_count + ?, last_hit_at = CURRENT_TIMESTAMP "
+            "WHERE id = ?",
+            [(count, entry_id) for entry_id, count in counts.items()],
+        )
+        conn.commit()
+
+
+# Hot-path lookups and ingest queue here instead of writing synchronously.
+SINK = LearningEventSink("sqlite", _record_learning_events, _record_tm_hits)
+
+
 def list_learning_events(
     limit: int = 200,
     offset: int = 0,
@@ -59,6 +108,7 @@ def list_learning_events(
     sort_dir: str | None = None,
 ) -> tuple[list[dict], int]:
     _ensure_db()
+    SINK.flush()
     limit = max(1, min(int(limit or 200), 1000))
     offset = max(0, int(offset or 0))
     where = []
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from .tm_admin import batch_delete_tm, clear_tm, delete_tm, upsert_tm
-from .tm_ingest import save_tm, seed_tm
-from .tm_lookup import lookup_tm
+from .tm_ingest import save_tm, save_tm_many, seed_tm
+from .tm_lookup import lookup_tm, lookup_tm_many
 from .tm_query import get_tm, get_tm_count, get_tm_terms, get_tm_terms_any
 
 __all__ = [
@@ -14,7 +14,9 @@ __all__ = [
     "get_tm_terms",
     "get_tm_terms_any",
     "lookup_tm",
+    "lookup_tm_many",
     "save_tm",
+    "save_tm_many",
     "seed_tm",
     "upsert_tm",
 ]
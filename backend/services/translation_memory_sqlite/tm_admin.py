@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import sqlite3
 
+from backend.services import tm_fuzzy_index
+
 from .db import DB_PATH, _ensure_db
 from .learning import _record_learning_event
 from .utils import _hash_text, _is_low_quality_tm
@@ -124,6 +126,7 @@ def upsert_tm(entry: dict) -> None:
         scope_type=scope_type,
         scope_id=scope_id,
     )
+    tm_fuzzy_index.invalidate()
 
 
 def delete_tm(entry_id: int) -> int:
@@ -134,7 +137,8 @@ def delete_tm(entry_id: int) -> int:
             (entry_id,),
         )
         conn.commit()
-        return cur.rowcount
+    tm_fuzzy_index.invalidate()
+    return cur.rowcount
 
 
 def batch_delete_tm(ids: list[int]) -> int:
@@ -147,7 +151,8 @@ def batch_delete_tm(ids: list[int]) -> int:
             [(entry_id,) for entry_id in ids],
         )
         conn.commit()
-        return cur.rowcount
+    tm_fuzzy_index.invalidate()
+    return cur.rowcount
 
 
 def clear_tm() -> int:
@@ -155,4 +160,5 @@ def clear_tm() -> int:
     with sqlite3.connect(DB_PATH) as conn:
         cur = conn.execute("DELETE FROM tm")
         conn.commit()
-        return cur.rowcount
+    tm_fuzzy_index.invalidate()
+    return cur.rowcount
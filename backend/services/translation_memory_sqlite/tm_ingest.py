@@ -4,8 +4,9 @@ import sqlite3
 from collections.abc import Iterable
 
 from .db import DB_PATH, _ensure_db
-from .learning import _record_learning_event
+from .learning import SINK
 from .preserve_terms import _get_preserve_terms, _is_preserve_term
+from .tm_lookup import _MAX_IN_PARAMS
 from .utils import _hash_text, _is_low_quality_tm, _normalize_glossary_text, _resolve_context_scope
 
 
@@ -16,89 +17,160 @@ def save_tm(
     translated: str,
     context: dict | None = None,
 ) -> None:
-    if not text or not translated:
-        return
-    if _is_low_quality_tm(text, translated):
-        print(f"攔截低質量 TM 寫入: {text} -> {translated}")
+    save_tm_many(source_lang, target_lang, [(text, translated)], context=context)
+
+
+def _select_in(
+    conn: sqlite3.Connection, query: str, values: list[str], params: tuple = ()
+) -> list[tuple]:
+    """Run ``query`` (with one ``{}`` IN slot) over ``values`` in parameter-safe batches."""
+    rows: list[tuple] = []
+    for start in range(0, len(values), _MAX_IN_PARAMS):
+        batch = values[start:start + _MAX_IN_PARAMS]
+        placeholders = ",".join("?" * len(batch))
+        rows.extend(conn.execute(query.format(placeholders), (*params, *batch)).fetchall())
+    return rows
+
+
+def _filter_tm_pairs(
+    source_lang: str,
+    target_lang: str,
+    pairs: Iterable[tuple[str, str]],
+    context: dict | None,
+) -> dict[str, tuple[str, str, str, str]]:
+    """Drop empty, low-quality and preserve-term pairs; key the rest by TM hash."""
+    candidates: dict[str, tuple[str, str, str, str]] = {}
+    preserve_terms = None
+    for text, translated in pairs:
+        if not text or not translated:
+            continue
+        if _is_low_quality_tm(text, translated):
+            print(f"攔截低質量 TM 寫入: {text} -> {translated}")
+            continue
+        source_text = text.strip()
+        target_text = translated.strip()
+        if not source_text or not target_text:
+            continue
+        if preserve_terms is None:
+            preserve_terms = _get_preserve_terms()
+        if _is_preserve_term(source_text, preserve_terms):
+            continue
+        key = _hash_text(source_lang, target_lang, text, context=context)
+        candidates[key] = (text, translated, source_text, target_text)
+    return candidates
+
+
+def save_tm_many(
+    source_lang: str,
+    target_lang: str,
+    pairs: Iterable[tuple[str, str]],
+    context: dict | None = None,
+) -> None:
+    """Batch form of :func:`save_tm` for (text, translated) pairs sharing one context.
+
+    Low-quality and preserve-term entries are filtered in memory, the existing
+    hash / glossary / duplicate checks run as ``IN`` queries, and all writes
+    happen in one transaction.
+    """
+    candidates = _filter_tm_pairs(source_lang, target_lang, pairs, context)
+    if not candidates:
         return
     _ensure_db()
-    source_text = text.strip()
-    target_text = translated.strip()
-    if not source_text or not target_text:
-        return
-    preserve_terms = _get_preserve_terms()
-    if _is_preserve_term(source_text, preserve_terms):
-        return
-    key = _hash_text(source_lang, target_lang, text, context=context)
     scope_type, scope_id, domain, category = _resolve_context_scope(context)
+    event_base = {
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "entity_type": "tm",
+        "scope_type": scope_type,
+        "scope_id": scope_id,
+    }
+    events: list[dict] = []
     with sqlite3.connect(DB_PATH) as conn:
-        existing = conn.execute(
-            "SELECT id, target_text FROM tm WHERE hash = ?",
-            (key,),
-        ).fetchone()
-        if existing and existing[1] != target_text:
-            conn.execute(
-                "UPDATE tm SET overwrite_count = overwrite_count + 1 WHERE id = ?",
-                (existing[0],),
+        existing = {
+            row[0]: (row[1], row[2])
+            for row in _select_in(
+                conn,
+                "SELECT hash, id, target_text FROM tm WHERE hash IN ({})",
+                list(candidates),
             )
-            _record_learning_event(
-                "overwrite",
-                source_text=source_text,
-                target_text=target_text,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                entity_type="tm",
-                entity_id=existing[0],
-                scope_type=scope_type,
-                scope_id=scope_id,
+        }
+        normalized = {
+            key: _normalize_glossary_text(entry[2]) for key, entry in candidates.items()
+        }
+        in_glossary = {
+            row[0]
+            for row in _select_in(
+                conn,
+                "SELECT source_text FROM glossary "
+                "WHERE source_lang = ? AND target_lang = ? AND source_text IN ({})",
+                list(dict.fromkeys(normalized.values())),
+                (source_lang, target_lang),
+            )
+        }
+        known_pairs = set(
+            _select_in(
+                conn,
+                "SELECT source_text, target_text FROM tm WHERE source_text IN ({})",
+                list(dict.fromkeys(entry[2] for entry in candidates.values())),
             )
-        normalized_source = _normalize_glossary_text(source_text)
-        cur = conn.execute(
-            (
-                "SELECT 1 FROM glossary "
-                "WHERE source_lang = ? AND target_lang = ? AND source_text = ? "
-                "LIMIT 1"
-            ),
-            (source_lang, target_lang, normalized_source),
-        )
-        if cur.fetchone():
-            return
-        cur = conn.execute(
-            "SELECT 1 FROM tm WHERE source_text = ? AND target_text = ? LIMIT 1",
-            (source_text, target_text),
-        )
-        if cur.fetchone():
-            return
-        conn.execute(
-            (
-                "INSERT OR REPLACE INTO tm "
-                "(source_lang, target_lang, source_text, target_text, "
-                "domain, category, scope_type, scope_id, hash) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
-            ),
-            (
-                source_lang,
-                target_lang,
-                text,
-                translated,
-                domain,
-                category,
-                scope_type,
-                scope_id,
-                key,
-            ),
         )
+
+        overwrites: list[tuple[int]] = []
+        inserts: list[tuple] = []
+        for key, (text, translated, source_text, target_text) in candidates.items():
+            current = existing.get(key)
+            if current and current[1] != target_text:
+                overwrites.append((current[0],))
+                events.append(
+                    {
+                        **event_base,
+                        "event_type": "overwrite",
+                        "source_text": source_text,
+                        "target_text": target_text,
+                        "entity_id": current[0],
+                    }
+                )
+            if normalized[key] in in_glossary or (source_text, target_text) in known_pairs:
+                continue
+            known_pairs.add((source_text, target_text))
+            inserts.append(
+                (
+                    source_lang,
+                    target_lang,
+                    text,
+                    translated,
+                    domain,
+                    category,
+                    scope_type,
+                    scope_id,
+                    key,
+                )
+            )
+            events.append(
+                {
+                    **event_base,
+                    "event_type": "ingest",
+                    "source_text": source_text,
+                    "target_text": target_text,
+                }
+            )
+        if overwrites:
+            conn.executemany(
+                "UPDATE tm SET overwrite_count = overwrite_count + 1 WHERE id = ?",
+                overwrites,
+            )
+        if inserts:
+            conn.executemany(
+                (
+                    "INSERT OR REPLACE INTO tm "
+                    "(source_lang, target_lang, source_text, target_text, "
+                    "domain, category, scope_type, scope_id, hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                ),
+                inserts,
+            )
         conn.commit()
-    _record_learning_event(
-        "ingest",
-        source_text=source_text,
-        target_text=target_text,
-        source_lang=source_lang,
-        target_lang=target_lang,
-        entity_type="tm",
-        scope_type=scope_type,
-        scope_id=scope_id,
-    )
+    SINK.emit_many(events)
 
 
 def seed_tm(entries: Iterable[tuple[str, str, str, str]]) -> None:
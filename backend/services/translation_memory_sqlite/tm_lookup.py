@@ -1,24 +1,45 @@
 from __future__ import annotations
 
 import sqlite3
-
-from backend.services.tm_matcher import fuzzy_match, normalize_text
+from backend.services.tm_fuzzy_index import FuzzyTMIndex, get_index
 
 from .db import DB_PATH, _ensure_db
-from .learning import _record_learning_event
+from .learning import SINK
 from .utils import _hash_text, _resolve_context_scope
 
+# SQLite caps the number of bound parameters per statement (999 on older builds).
+_MAX_IN_PARAMS = 900
 
-def _record_tm_hit(entry_id: int) -> None:
-    try:
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute(
-                "UPDATE tm SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (entry_id,),
-            )
-            conn.commit()
-    except Exception:
-        return
+_FUZZY_COLUMNS = (
+    "id",
+    "source_text",
+    "target_text",
+    "domain",
+    "category",
+    "scope_type",
+    "scope_id",
+    "hash",
+)
+
+
+def _sync_fuzzy_index(
+    conn: sqlite3.Connection,
+    index: FuzzyTMIndex,
+    source_lang: str,
+    target_lang: str,
+    scope_type: str,
+    scope_id: str | None,
+) -> None:
+    """Feed rows newer than the index high-water mark into the fuzzy index."""
+    cur = conn.execute(
+        "SELECT id, source_text, target_text, domain, category, scope_type, scope_id, hash "
+        "FROM tm WHERE id > ? AND source_lang = ? AND target_lang = ? AND status = 'active' "
+        "AND (scope_type = ? OR scope_type IS NULL) "
+        "AND (scope_id = ? OR scope_id IS NULL) "
+        "ORDER BY id",
+        (index.high_water, source_lang, target_lang, scope_type, scope_id),
+    )
+    index.add_rows(dict(zip(_FUZZY_COLUMNS, row, strict=True)) for row in cur.fetchall())
 
 
 def lookup_tm(
@@ -43,8 +64,8 @@ def lookup_tm(
         )
         row = cur.fetchone()
         if row:
-            _record_tm_hit(row[0])
-            _record_learning_event(
+            SINK.add_hit(row[0])
+            SINK.emit(
                 "lookup_hit_tm",
                 source_text=text,
                 target_text=row[1],
@@ -57,7 +78,7 @@ def lookup_tm(
             )
             return row[1]
         if not use_fuzzy:
-            _record_learning_event(
+            SINK.emit(
                 "lookup_miss",
                 source_text=text,
                 source_lang=source_lang,
@@ -67,65 +88,10 @@ def lookup_tm(
                 scope_id=scope_id,
             )
             return None
-        cur = conn.execute(
-            "SELECT id, source_text, target_text, domain, category, scope_type, scope_id FROM tm "
-            "WHERE source_lang = ? AND target_lang = ? AND status = 'active' "
-            "AND (scope_type = ? OR scope_type IS NULL) "
-            "AND (scope_id = ? OR scope_id IS NULL) "
-            "ORDER BY id DESC LIMIT 500",
-            (source_lang, target_lang, scope_type, scope_id),
-        )
-        rows = cur.fetchall()
-    if not rows:
-        _record_learning_event(
-            "lookup_miss",
-            source_text=text,
-            source_lang=source_lang,
-            target_lang=target_lang,
-            entity_type="tm",
-            scope_type=scope_type,
-            scope_id=scope_id,
-        )
-        return None
-    normalized_query = normalize_text(text)
-    for entry_id, source_text, target_text, _, _, _, _ in rows:
-        if normalize_text(source_text) == normalized_query:
-            _record_tm_hit(entry_id)
-            _record_learning_event(
-                "lookup_hit_tm",
-                source_text=text,
-                target_text=target_text,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                entity_type="tm",
-                entity_id=entry_id,
-                scope_type=scope_type,
-                scope_id=scope_id,
-            )
-            return target_text
-    candidates = [
-        {
-            "id": entry_id,
-            "source_text": source_text,
-            "target_text": target_text,
-            "domain": row_domain,
-            "category": row_category,
-            "scope_type": row_scope_type,
-            "scope_id": row_scope_id,
-        }
-        for (
-            entry_id,
-            source_text,
-            target_text,
-            row_domain,
-            row_category,
-            row_scope_type,
-            row_scope_id,
-        ) in rows
-    ]
-    results = fuzzy_match(
-        query=text,
-        candidates=candidates,
+        index = get_index(source_lang, target_lang, scope_type, scope_id, store=str(DB_PATH))
+        _sync_fuzzy_index(conn, index, source_lang, target_lang, scope_type, scope_id)
+    results = index.search(
+        text,
         scope={"domain": domain, "category": category, "scope_type": scope_type, "scope_id": scope_id},
         min_score=0.78,
         limit=1,
@@ -134,8 +100,8 @@ def lookup_tm(
         best = results[0][1]
         entry_id = best.get("id")
         if entry_id:
-            _record_tm_hit(entry_id)
-        _record_learning_event(
+            SINK.add_hit(entry_id)
+        SINK.emit(
             "lookup_hit_tm",
             source_text=text,
             target_text=best.get("target_text"),
@@ -147,7 +113,7 @@ def lookup_tm(
             scope_id=scope_id,
         )
         return best.get("target_text")
-    _record_learning_event(
+    SINK.emit(
         "lookup_miss",
         source_text=text,
         source_lang=source_lang,
@@ -157,3 +123,78 @@ def lookup_tm(
         scope_id=scope_id,
     )
     return None
+
+
+def lookup_tm_many(
+    source_lang: str,
+    target_lang: str,
+    texts: list[str],
+    context: dict | None = None,
+    use_fuzzy: bool = False,
+) -> list[str | None]:
+    """Batch form of :func:`lookup_tm`; results follow the order of ``texts``.
+
+    Exact hashes are resolved with one ``IN`` query, fuzzy matching runs only
+    on the misses, and hit counts / learning events go to the learning sink.
+    """
+    results: list[str | None] = [None] * len(texts)
+    if not texts:
+        return results
+    _ensure_db()
+    scope_type, scope_id, domain, category = _resolve_context_scope(context)
+    hashes = [_hash_text(source_lang, target_lang, value, context=context) for value in texts]
+    exact: dict[str, tuple[int, str]] = {}
+    index = None
+    with sqlite3.connect(DB_PATH) as conn:
+        unique_hashes = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique_hashes), _MAX_IN_PARAMS):
+            batch = unique_hashes[start:start + _MAX_IN_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            cur = conn.execute(
+                (
+                    "SELECT hash, id, target_text FROM tm "
+                    f"WHERE hash IN ({placeholders}) AND status = 'active' "
+                    "AND (scope_type = ? OR scope_type IS NULL) "
+                    "AND (scope_id = ? OR scope_id IS NULL)"
+                ),
+                (*batch, scope_type, scope_id),
+            )
+            exact.update({row[0]: (row[1], row[2]) for row in cur.fetchall()})
+        if use_fuzzy and any(key not in exact for key in hashes):
+            index = get_index(source_lang, target_lang, scope_type, scope_id, store=str(DB_PATH))
+            _sync_fuzzy_index(conn, index, source_lang, target_lang, scope_type, scope_id)
+
+    scope = {"domain": domain, "category": category, "scope_type": scope_type, "scope_id": scope_id}
+    hit_ids: list[int] = []
+    events: list[dict] = []
+    for i, value in enumerate(texts):
+        entry_id, target_text = exact.get(hashes[i], (None, None))
+        if target_text is None and index is not None:
+            matches = index.search(value, scope=scope, min_score=0.78, limit=1)
+            if matches:
+                entry_id = matches[0][1].get("id")
+                target_text = matches[0][1].get("target_text")
+        event = {
+            "source_text": value,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "entity_type": "tm",
+            "scope_type": scope_type,
+            "scope_id": scope_id,
+        }
+        if target_text is not None:
+            results[i] = target_text
+            hit_ids.append(entry_id)
+            events.append(
+                {
+                    **event,
+                    "event_type": "lookup_hit_tm",
+                    "target_text": target_text,
+                    "entity_id": entry_id,
+                }
+            )
+        else:
+            events.append({**event, "event_type": "lookup_miss"})
+    SINK.add_hits(hit_ids)
+    SINK.emit_many(events)
+    return results
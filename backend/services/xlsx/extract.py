@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import zipfile
 from typing import Any
 
 import openpyxl
@@ -13,12 +12,12 @@ from backend.services.extract_utils import (
     is_technical_terms_only,
     sanitize_extracted_text,
 )
-from backend.services.image_ocr import extract_image_text_blocks
 from backend.services.language_detect import detect_document_languages
 from backend.services.ocr_lang import resolve_ocr_lang_from_doc_lang
+from backend.services.ocr_pool import media_ocr_jobs, run_ocr_jobs
 
 
-def extract_blocks(
+def extract_blocks(  # noqa: C901
     xlsx_path: str,
     preferred_lang: str | None = None,
     layout_params: dict[str, Any] | None = None,
@@ -130,26 +129,12 @@ def extract_blocks(
     ocr_lang = resolve_ocr_lang_from_doc_lang(doc_lang)
 
     # Extract image text from embedded media
-    try:
-        with zipfile.ZipFile(xlsx_path, "r") as zf:
-            media_files = [n for n in zf.namelist() if n.startswith("xl/media/")]
-            for idx, name in enumerate(media_files):
-                try:
-                    image_bytes = zf.read(name)
-                except Exception:
-                    continue
-                blocks.extend(
-                    extract_image_text_blocks(
-                        image_bytes,
-                        slide_index=-1,
-                        shape_id=f"xlsx-image-{idx}",
-                        image_part=name,
-                        source="xlsx",
-                        ocr_lang=ocr_lang,
-                    )
-                )
-    except Exception:
-        pass
+    ocr_jobs = [
+        {**job, "source": "xlsx", "ocr_lang": ocr_lang}
+        for job in media_ocr_jobs(xlsx_path, "xl/media/", "xlsx-image")
+    ]
+    for image_blocks in run_ocr_jobs(ocr_jobs):
+        blocks.extend(image_blocks)
 
     return {
         "blocks": blocks,
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from backend.services.learning_sink import LearningEventSink
+
+
+def _make_sink(**kwargs):
+    written = {"events": [], "hits": []}
+    sink = LearningEventSink(
+        "test",
+        events_writer=written["events"].extend,
+        hits_writer=written["hits"].append,
+        flush_interval=60.0,
+        **kwargs,
+    )
+    return sink, written
+
+
+def test_sink_coalesces_hits_and_batches_events():
+    sink, written = _make_sink(batch_size=1000)
+    sink.add_hits([7, 7, 9, None, 7])
+    sink.emit("lookup_hit_tm", source_text="Hello", entity_id=7)
+    sink.emit_many([{"event_type": "lookup_miss", "source_text": "Bye"}])
+
+    assert written == {"events": [], "hits": []}
+    sink.drain()
+
+    assert written["hits"] == [{7: 3, 9: 1}]
+    assert [event["event_type"] for event in written["events"]] == [
+        "lookup_hit_tm",
+        "lookup_miss",
+    ]
+    stats = sink.stats()
+    assert stats["events_written"] == 2
+    assert stats["hits_written"] == 4
+    assert stats["pending_events"] == 0
+
+
+def test_sink_drops_when_full_without_blocking():
+    sink, written = _make_sink(max_pending=2, batch_size=1000, block_on_full=False)
+    for i in range(5):
+        sink.emit("lookup_miss", source_text=str(i))
+    # A hit on an entry not yet buffered needs a slot of its own.
+    sink.add_hit(1)
+    sink.drain()
+
+    assert len(written["events"]) == 2
+    assert sink.stats()["dropped"] == 4
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.services.translation_memory_sqlite import db as sqlite_db
+from backend.services.translation_memory_sqlite import learning as learning_sqlite
+from backend.services.translation_memory_sqlite import tm_ingest
+
+
+@pytest.fixture(autouse=True)
+def _flush_learning_sink(monkeypatch: pytest.MonkeyPatch):
+    # Flush before monkeypatch restores DB_PATH so events stay in this test's DB.
+    learning_sqlite.SINK.flush()
+    yield
+    learning_sqlite.SINK.flush()
+
+
+def _setup_temp_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    temp_db = tmp_path / "translation_memory.db"
+    monkeypatch.setattr(sqlite_db, "DB_PATH", temp_db)
+    monkeypatch.setattr(sqlite_db, "_DB_INITIALIZED", False)
+    monkeypatch.setattr(learning_sqlite, "DB_PATH", temp_db)
+    monkeypatch.setattr(tm_ingest, "DB_PATH", temp_db)
+    monkeypatch.setattr(tm_ingest, "_get_preserve_terms", lambda: [])
+    sqlite_db._ensure_db()
+    return temp_db
+
+
+def test_save_tm_many_filters_and_upserts_in_one_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    temp_db = _setup_temp_db(tmp_path, monkeypatch)
+    tm_ingest.seed_tm([("en", "zh-TW", "Hello", "哈囉")])
+
+    tm_ingest.save_tm_many(
+        "en",
+        "zh-TW",
+        [
+            ("Hello", "你好"),
+            ("Quarterly sales report", "季度銷售報告"),
+            ("CPU", "cpu"),
+            ("", "空白"),
+            ("Quarterly sales report", "季度銷售報告"),
+        ],
+    )
+    learning_sqlite.SINK.flush()
+
+    with sqlite3.connect(temp_db) as conn:
+        rows = dict(conn.execute("SELECT source_text, target_text FROM tm").fetchall())
+        events = conn.execute(
+            "SELECT event_type, COUNT(*) FROM learning_events GROUP BY event_type"
+        ).fetchall()
+    assert rows == {"Hello": "你好", "Quarterly sales report": "季度銷售報告"}
+    assert dict(events) == {"ingest": 2, "overwrite": 1}
+
+
+def test_save_tm_many_skips_known_pairs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    temp_db = _setup_temp_db(tmp_path, monkeypatch)
+    tm_ingest.save_tm("en", "zh-TW", "Hello", "你好")
+    tm_ingest.save_tm_many("en", "zh-TW", [("Hello", "你好")])
+    learning_sqlite.SINK.flush()
+
+    with sqlite3.connect(temp_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM tm").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM learning_events").fetchone()[0] == 1
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.services.translation_memory_sqlite import db as sqlite_db
+from backend.services.translation_memory_sqlite import learning as learning_sqlite
+from backend.services.translation_memory_sqlite import tm_ingest, tm_lookup
+
+
+@pytest.fixture(autouse=True)
+def _flush_learning_sink(monkeypatch: pytest.MonkeyPatch):
+    # Flush before monkeypatch restores DB_PATH so events stay in this test's DB.
+    learning_sqlite.SINK.flush()
+    yield
+    learning_sqlite.SINK.flush()
+
+
+def _setup_temp_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    temp_db = tmp_path / "translation_memory.db"
+    monkeypatch.setattr(sqlite_db, "DB_PATH", temp_db)
+    monkeypatch.setattr(sqlite_db, "_DB_INITIALIZED", False)
+    monkeypatch.setattr(learning_sqlite, "DB_PATH", temp_db)
+    monkeypatch.setattr(tm_ingest, "DB_PATH", temp_db)
+    monkeypatch.setattr(tm_lookup, "DB_PATH", temp_db)
+    sqlite_db._ensure_db()
+    return temp_db
+
+
+def test_lookup_tm_many_exact_fuzzy_and_miss(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    temp_db = _setup_temp_db(tmp_path, monkeypatch)
+    tm_ingest.seed_tm(
+        [
+            ("en", "zh-TW", "Hello", "你好"),
+            ("en", "zh-TW", "Quarterly sales report", "季度銷售報告"),
+        ]
+    )
+
+    results = tm_lookup.lookup_tm_many(
+        "en",
+        "zh-TW",
+        ["Hello", "Quarterly sales reports", "Unrelated text", "Hello"],
+        use_fuzzy=True,
+    )
+
+    assert results == ["你好", "季度銷售報告", None, "你好"]
+    learning_sqlite.SINK.flush()
+    with sqlite3.connect(temp_db) as conn:
+        hits = dict(conn.execute("SELECT source_text, hit_count FROM tm").fetchall())
+        events = conn.execute(
+            "SELECT event_type, COUNT(*) FROM learning_events GROUP BY event_type"
+        ).fetchall()
+    assert hits == {"Hello": 2, "Quarterly sales report": 1}
+    assert dict(events) == {"lookup_hit_tm": 3, "lookup_miss": 1}
+
+
+def test_lookup_tm_many_without_fuzzy_only_matches_hashes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    _setup_temp_db(tmp_path, monkeypatch)
+    tm_ingest.seed_tm([("en", "zh-TW", "Hello", "你好")])
+
+    assert tm_lookup.lookup_tm_many("en", "zh-TW", ["hello", "Hello"]) == [None, "你好"]
+    assert tm_lookup.lookup_tm_many("en", "zh-TW", []) == []
@@ -36,3 +36,40 @@ def test_fuzzy_match_limit_and_scope():
     scope = {"domain": "auth", "category": "account", "scope_type": "project", "scope_id": "p1"}
     results = fuzzy_match("User profile update", candidates, scope, min_score=0.78, limit=3)
     assert len(results) == 3
+
+
+def test_edit_distance_matches_reference():
+    from backend.services.tm_matcher import edit_distance
+
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("", "abc") == 3
+    assert edit_distance("flaw", "lawn") == 2
+    assert edit_distance("資料庫遷移", "資料遷移") == 1
+
+
+def test_fuzzy_index_exact_and_candidate_search():
+    from backend.services.tm_fuzzy_index import FuzzyTMIndex
+
+    index = FuzzyTMIndex()
+    index.add_rows(
+        [
+            {"id": 1, "source_text": "Database migration plan", "target_text": "A", "hash": "h1"},
+            {"id": 2, "source_text": "Quarterly sales report", "target_text": "B", "hash": "h2"},
+            {"id": 3, "source_text": "Payment gateway", "target_text": "C", "hash": "h3"},
+        ]
+    )
+    scope = {"scope_type": None, "scope_id": None}
+    assert index.search("database  MIGRATION plan", scope)[0][1]["target_text"] == "A"
+    results = index.search("Quarterly sales reports", scope)
+    assert results and results[0][1]["id"] == 2
+    assert index.high_water == 3
+
+
+def test_fuzzy_index_replaces_rows_with_same_hash():
+    from backend.services.tm_fuzzy_index import FuzzyTMIndex
+
+    index = FuzzyTMIndex()
+    index.add_rows([{"id": 1, "source_text": "Hello", "target_text": "old", "hash": "h"}])
+    index.add_rows([{"id": 5, "source_text": "Hello", "target_text": "new", "hash": "h"}])
+    assert len(index) == 1
+    assert index.exact("hello")["target_text"] == "new"
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import date, timedelta
 
 from backend.config import settings
+from backend.services.learning_sink import flush_all
 
 from .postgres import compute_daily_stats_pg
 from .sqlite import compute_daily_stats_sqlite
@@ -11,6 +12,7 @@ from .sqlite import compute_daily_stats_sqlite
 def compute_daily_stats(
     stat_date: date, scope_type: str = "project", scope_id: str | None = "default"
 ):
+    flush_all()
     if (settings.database_url or "").startswith("postgresql"):
         return compute_daily_stats_pg(stat_date, scope_type=scope_type, scope_id=scope_id)
     return compute_daily_stats_sqlite(stat_date, scope_type=scope_type, scope_id=scope_id)
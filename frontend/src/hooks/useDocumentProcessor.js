@@ -88,18 +88,21 @@ export function useDocumentProcessor() {
 
         setBlocks(prev => prev.map(b => pendingBlocks.some(p => p.client_id === b.client_id) ? { ...b, isTranslating: true } : b));
 
-        let completedIds = [], retryCount = 0, maxRetries = 3;
+        let completedIds = [], failedIds = [], retryCount = 0, maxRetries = 3;
         const BATCH_SIZE = 20;
+        // 串流預覽中的區塊仍標記為翻譯中，不計入進度
+        const isDone = b => !b.isTranslating && (b.translated_text || "").trim();
+
         const computeProgress = () => {
             const currentBlocks = useFileStore.getState().blocks || [];
-            const translatedCount = currentBlocks.filter(b => (b.translated_text || "").trim()).length;
+            const translatedCount = currentBlocks.filter(isDone).length;
             const pendingCompleted = completedIds.filter(id => !currentBlocks.some(b => b.client_id === id && (b.translated_text || "").trim())).length;
             const totalDone = translatedCount + pendingCompleted;
             const total = currentBlocks.length || blocks.length;
             return { totalDone, total };
         };
 
-        const finalizeTranslation = (finalBlocks = []) => {
+        const finalizeTranslation = (finalBlocks = [], { partial = false } = {}) => {
             setBlocks(prev => {
                 const next = prev.map((b) => {
                     const match = finalBlocks.find(f => f.client_id === b.client_id || f._uid === b._uid);
@@ -114,11 +117,12 @@ export function useDocumentProcessor() {
                         translated_text: cleanedTranslated,
                         correction_temp: match.correction_temp ?? b.correction_temp,
                         temp_translated_text: match.temp_translated_text ?? b.temp_translated_text,
-                        isTranslating: false,
-                        updatedAt: (hasT && cleanedTranslated) ? new Date().toLocaleTimeString("zh-TW", { hour12: false }) : b.updatedAt
+                        isTranslating: partial ? b.isTranslating : false,
+                        updatedAt: (!partial && hasT && cleanedTranslated) ? new Date().toLocaleTimeString("zh-TW", { hour12: false }) : b.updatedAt
                     };
                 });
-                const translatedCount = next.filter(b => (b.translated_text || "").trim()).length;
+                if (partial) return next;
+                const translatedCount = next.filter(isDone).length;
                 const total = next.length || blocks.length;
                 setProgress(Math.round((translatedCount / total) * 100));
                 setStatus(t("sidebar.translate.translating", { current: translatedCount, total }));
@@ -185,9 +189,20 @@ export function useDocumentProcessor() {
                         const eventType = eventMatch[1], eventData = JSON.parse(dataMatch[1]);
 
                         if (eventType === "progress") {
+                            if (eventData.partial) {
+                                // 串流預覽：只更新譯文，區塊完成前不結束翻譯狀態
+                                finalizeTranslation(eventData.completed_blocks || [], { partial: true });
+                                continue;
+                            }
                             const c_ids = eventData.completed_ids || eventData.completed_indices?.map(idx => batchBlocks[idx]?.client_id);
                             c_ids?.forEach(id => { if (id && !completedIds.includes(id)) completedIds.push(id); });
 
+                            // 逾時放棄的區塊：結束翻譯狀態，完成時提示可重新翻譯
+                            if (eventData.failed_ids?.length) {
+                                eventData.failed_ids.forEach(id => { if (!failedIds.includes(id)) failedIds.push(id); });
+                                setBlocks(prev => prev.map(b => eventData.failed_ids.includes(b.client_id) ? { ...b, isTranslating: false } : b));
+                            }
+
                             if (eventData.completed_blocks?.length) {
                                 finalizeTranslation(eventData.completed_blocks);
                             }
@@ -232,7 +247,10 @@ export function useDocumentProcessor() {
                     await new Promise(r => setTimeout(r, 500));
                 }
             }
-            setProgress(100); setStatus(t("sidebar.translate.completed"));
+            setProgress(100);
+            setStatus(failedIds.length
+                ? t("sidebar.translate.completed_with_failures", { count: failedIds.length })
+                : t("sidebar.translate.completed"));
             setBlocks(prev => prev.map(b => ({ ...b, isTranslating: false })));
             setAppStatus(APP_STATUS.TRANSLATION_COMPLETED); setBusy(false);
         } catch (error) {
@@ -0,0 +1,82 @@
+"""Pages/sec of PDF extraction for different worker counts.
+
+Builds a scanned (image-only) PDF so every page goes through rendering and
+OCR, then times ``extract_blocks`` per worker count:
+
+    python scripts/dev/bench_pdf_extract.py --pages 200 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.services.pdf.extract import extract_blocks  # noqa: E402
+
+
+def _page_image(page_no: int) -> Image.Image:
+    image = Image.new("RGB", (1240, 1754), "white")
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 28)
+    except OSError:
+        font = ImageFont.load_default()
+    for line in range(30):
+        draw.text(
+            (100, 120 + line * 52),
+            f"Page {page_no} line {line}: quarterly revenue grew in every region",
+            fill="black",
+            font=font,
+        )
+    return image
+
+
+def build_scanned_pdf(path: str, pages: int) -> None:
+    doc = fitz.open()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for page_no in range(pages):
+            image_path = os.path.join(temp_dir, f"{page_no % 10}.png")
+            if page_no < 10:
+                _page_image(page_no).save(image_path)
+            page = doc.new_page(width=595, height=842)
+            page.insert_image(page.rect, filename=image_path)
+        doc.save(path)
+    doc.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pdf", help="benchmark an existing PDF instead")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PDF_EXTRACT_PARALLEL_MIN_PAGES", "2")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = args.pdf or os.path.join(temp_dir, "scanned.pdf")
+        if not args.pdf:
+            build_scanned_pdf(pdf_path, args.pages)
+        page_count = len(fitz.open(pdf_path))
+        print(f"{page_count} pages, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8} {'blocks':>7}")
+        baseline = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            result = extract_blocks(pdf_path, workers=workers)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(
+                f"{workers:>8} {elapsed:>9.2f} {page_count / elapsed:>9.2f} "
+                f"{baseline / elapsed:>7.2f}x {len(result['blocks']):>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import os
+
 from backend.services import prompt_store
 
 def test_prompt_store_list_and_get(tmp_path, monkeypatch) -> None:
@@ -7,3 +9,31 @@ def test_prompt_store_list_and_get(tmp_path, monkeypatch) -> None:
     assert "translate_json" in names
     content = prompt_store.get_prompt("translate_json")
     assert "{payload}" in content
+
+
+def test_render_is_single_pass_and_keeps_unknown_fields(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(prompt_store, "PROMPTS_DIR", tmp_path)
+    prompt_store.save_prompt("demo", "{label}: {payload} {unknown} {{ raw }}")
+
+    rendered = prompt_store.render_prompt(
+        "demo", {"payload": "text with {label}"}, static={"label": "zh-TW"}
+    )
+
+    assert rendered == "zh-TW: text with {label} {unknown} {{ raw }}"
+
+
+def test_cached_template_follows_save_and_mtime(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(prompt_store, "PROMPTS_DIR", tmp_path)
+    monkeypatch.setattr(prompt_store, "STAT_INTERVAL", 0.0)
+    prompt_store.save_prompt("demo", "v1 {x}")
+    assert prompt_store.render_prompt("demo", {}, static={"x": "a"}) == "v1 a"
+
+    prompt_store.save_prompt("demo", "v2 {x}")
+    assert prompt_store.render_prompt("demo", {}, static={"x": "a"}) == "v2 a"
+
+    # Edited on disk behind the store's back.
+    path = tmp_path / "demo.md"
+    path.write_text("edited {x}", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert prompt_store.get_prompt("demo") == "edited {x}"
@@ -68,3 +68,30 @@ async def test_translate_blocks_async_parallel():
     assert len(result["blocks"]) == 5
     for i, block in enumerate(result["blocks"]):
         assert block["translated_text"] == f"ParallelTest{i}"
+
+
+@pytest.mark.asyncio
+async def test_translate_blocks_async_dedupes_identical_sources():
+    """Identical source strings are translated once and fanned out."""
+    blocks = [
+        {"source_text": "DedupFooter", "slide_index": 1, "client_id": "a"},
+        {"source_text": "DedupBody", "slide_index": 1, "client_id": "b"},
+        {"source_text": "DedupFooter", "slide_index": 2, "client_id": "c"},
+        {"source_text": "DedupFooter", "slide_index": 3, "client_id": "d"},
+    ]
+    progress_calls = []
+
+    result = await translate_blocks_async(
+        blocks,
+        target_language="zh-TW",
+        provider="mock",
+        on_progress=progress_calls.append,
+        param_overrides={"chunk_size": 1, "single_request": False},
+        use_tm=False,
+    )
+
+    assert len(progress_calls) == 2
+    completed_ids = sorted(cid for call in progress_calls for cid in call["completed_ids"])
+    assert completed_ids == ["a", "b", "c", "d"]
+    texts = [block["translated_text"] for block in result["blocks"]]
+    assert texts == ["DedupFooter", "DedupBody", "DedupFooter", "DedupFooter"]
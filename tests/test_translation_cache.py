@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from backend.services import translate_chunk_cache
+from backend.services.translation_cache import MemoryLRU, cache
+
+
+@pytest.fixture()
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "db_path", tmp_path / "cache.db")
+    monkeypatch.setattr(cache, "_local", threading.local())
+    monkeypatch.setattr(cache, "memory", MemoryLRU(64))
+    cache._init_db()
+    yield cache
+    cache.close()
+
+
+def test_get_many_preserves_order_and_misses(isolated_cache):
+    isolated_cache.set_many(
+        [("Hello", "你好"), ("World", "世界"), ("Empty", "")],
+        "zh-TW",
+        "mock",
+        "m1",
+    )
+    result = isolated_cache.get_many(
+        ["World", "Missing", "Hello", "Empty", "Hello"],
+        "zh-TW",
+        "mock",
+        "m1",
+    )
+    assert result == ["世界", None, "你好", None, "你好"]
+
+
+def test_get_many_keys_include_tone(isolated_cache):
+    isolated_cache.set_many([("Hello", "您好")], "zh-TW", "mock", "m1", tone="formal")
+    assert isolated_cache.get_many(["Hello"], "zh-TW", "mock", "m1") == [None]
+    assert isolated_cache.get("Hello", "zh-TW", "mock", "m1", tone="formal") == "您好"
+
+
+def test_get_from_cache_uses_batched_lookup(isolated_cache):
+    isolated_cache.set("Cached", "zh-TW", "mock", "m1", "已快取")
+    blocks = [{"source_text": "Cached"}, {"source_text": "Fresh"}]
+    final_blocks, uncached = translate_chunk_cache.get_from_cache(
+        blocks, "zh-TW", "mock", "m1"
+    )
+    assert final_blocks[0]["translated_text"] == "已快取"
+    assert final_blocks[1] is None
+    assert uncached == [1]
+
+
+def test_memory_tier_serves_repeat_lookups(isolated_cache, monkeypatch):
+    isolated_cache.set("Confidential", "zh-TW", "mock", "m1", "機密")
+    before = isolated_cache.stats()
+    assert isolated_cache.get("Confidential", "zh-TW", "mock", "m1") == "機密"
+    after = isolated_cache.stats()
+    assert after["memory_hits"] == before["memory_hits"] + 1
+    assert after["db_hits"] == before["db_hits"]
+
+
+def test_evict_enforces_max_rows_oldest_first(isolated_cache, monkeypatch):
+    monkeypatch.setattr(isolated_cache, "max_rows", 2)
+    monkeypatch.setattr(isolated_cache, "max_bytes", 0)
+    monkeypatch.setattr(isolated_cache, "ttl_seconds", 0)
+    for i, text in enumerate(["a", "b", "c"]):
+        isolated_cache.set(text, "zh-TW", "mock", "m1", f"t{i}")
+        conn = isolated_cache._get_conn()
+        with conn:
+            conn.execute(
+                "UPDATE translation_cache SET last_used_at = ? WHERE key = ?",
+                (float(i), isolated_cache._make_key(text, "zh-TW", "mock", "m1")),
+            )
+    isolated_cache.memory.clear()
+
+    assert isolated_cache.evict() == 1
+    assert isolated_cache.get_many(["a", "b", "c"], "zh-TW", "mock", "m1") == [
+        None,
+        "t1",
+        "t2",
+    ]
+
+
+def test_memory_hits_keep_rows_from_eviction(isolated_cache, monkeypatch):
+    monkeypatch.setattr(isolated_cache, "max_rows", 2)
+    monkeypatch.setattr(isolated_cache, "max_bytes", 0)
+    monkeypatch.setattr(isolated_cache, "ttl_seconds", 0)
+    for i, text in enumerate(["hot", "b", "c"]):
+        isolated_cache.set(text, "zh-TW", "mock", "m1", f"t{i}")
+        conn = isolated_cache._get_conn()
+        with conn:
+            conn.execute(
+                "UPDATE translation_cache SET last_used_at = ? WHERE key = ?",
+                (float(i), isolated_cache._make_key(text, "zh-TW", "mock", "m1")),
+            )
+    # Served from the memory tier only; the row is the oldest in SQLite.
+    assert isolated_cache.get("hot", "zh-TW", "mock", "m1") == "t0"
+
+    assert isolated_cache.evict() == 1
+    isolated_cache.memory.clear()
+    assert isolated_cache.get_many(["hot", "b", "c"], "zh-TW", "mock", "m1") == [
+        "t0",
+        None,
+        "t2",
+    ]
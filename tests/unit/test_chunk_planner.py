@@ -0,0 +1,62 @@
+from backend.config import settings
+from backend.services.chunk_planner import plan_chunks, token_budget
+
+
+def _pending(texts_by_slide):
+    pending = []
+    for slide, texts in texts_by_slide:
+        for text in texts:
+            pending.append((len(pending), {"slide_index": slide, "source_text": text}))
+    return pending
+
+
+def _params(**overrides):
+    params = {"max_blocks": 40, "single_request": False, "context_strategy": "none"}
+    params.update(overrides)
+    return params
+
+
+def test_short_blocks_share_a_chunk_and_long_blocks_split(monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_prompt_tokens", 600)
+    monkeypatch.setattr(settings, "llm_chunk_completion_tokens", 800)
+    cells = _pending([(0, ["Q1", "Q2", "Q3", "Total"] * 5)])
+    notes = _pending([(i, ["x" * 800]) for i in range(4)])
+
+    assert [len(chunk) for chunk in plan_chunks(cells, _params(), "openai")] == [20]
+    assert [len(chunk) for chunk in plan_chunks(notes, _params(), "openai")] == [2, 2]
+
+
+def test_slides_are_not_split_when_they_fit(monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_prompt_tokens", 200)
+    monkeypatch.setattr(settings, "llm_chunk_completion_tokens", 400)
+    pending = _pending([(0, ["a" * 200] * 2), (1, ["b" * 200] * 2), (2, ["c" * 200] * 2)])
+
+    chunks = plan_chunks(pending, _params(), "openai")
+
+    assert [[block["slide_index"] for _, block in chunk] for chunk in chunks] == [
+        [0, 0],
+        [1, 1],
+        [2, 2],
+    ]
+    assert [idx for chunk in chunks for idx, _ in chunk] == list(range(6))
+
+
+def test_block_cap_and_oversized_block(monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_prompt_tokens", 100)
+    monkeypatch.setattr(settings, "llm_chunk_completion_tokens", 100)
+    pending = _pending([(None, ["hi"] * 5), (None, ["y" * 2000]), (None, ["ok"])])
+
+    chunks = plan_chunks(pending, _params(max_blocks=2), "openai")
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1, 1, 1]
+    assert chunks[3][0][1]["source_text"] == "y" * 2000
+
+
+def test_budget_defaults_per_model(monkeypatch):
+    monkeypatch.setattr(settings, "llm_chunk_prompt_tokens", 0)
+    monkeypatch.setattr(settings, "llm_chunk_completion_tokens", 0)
+    monkeypatch.setattr(settings, "ollama_num_ctx", 8192)
+
+    assert token_budget("openai", "gpt-4o-mini") == (16_000, 12_000)
+    assert token_budget("gemini", "gemini-1.5-flash") == (24_000, 6_000)
+    assert token_budget("ollama", "qwen2.5:7b") == (3276, 3276)
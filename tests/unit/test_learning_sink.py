@@ -0,0 +1,29 @@
+import sqlite3
+
+import pytest
+
+from backend.services.learning_sink import LearningEventSink
+from backend.services.translation_memory_sqlite import learning
+
+
+def test_writer_failures_are_counted_and_do_not_drop_the_other_table():
+    written = []
+
+    def broken_hits(counts):
+        raise sqlite3.OperationalError("database is locked")
+
+    sink = LearningEventSink("test", written.extend, broken_hits, flush_interval=60)
+    sink.emit("lookup_hit", source_text="hello")
+    sink.add_hit(7)
+    sink.flush()
+
+    stats = sink.stats()
+    assert stats["write_errors"] == 1
+    assert stats["hits_written"] == 0 and stats["events_written"] == 1
+    assert [event["event_type"] for event in written] == ["lookup_hit"]
+
+
+def test_sqlite_batch_writer_raises(monkeypatch, tmp_path):
+    monkeypatch.setattr(learning, "DB_PATH", tmp_path / "missing" / "tm.db")
+    with pytest.raises(sqlite3.Error):
+        learning._record_tm_hits({1: 2})
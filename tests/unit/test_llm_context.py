@@ -0,0 +1,44 @@
+from backend.services.llm_context import DocumentContextIndex, build_context
+
+
+def _blocks():
+    return [
+        {"slide_index": 0, "source_text": "Deck title"},
+        {"slide_index": 0, "source_text": "Subtitle"},
+        {"slide_index": 1, "source_text": "", "block_type": "image_text"},
+        {"slide_index": 1, "source_text": "Agenda"},
+        {"slide_index": 2, "source_text": "Results"},
+        {"slide_index": 3, "source_text": "Thanks " * 40},
+    ]
+
+
+def test_neighbor_context_lists_each_slide_once():
+    blocks = _blocks()
+    index = DocumentContextIndex(blocks)
+
+    context = build_context("neighbor", blocks, [blocks[3], blocks[4]], index=index)
+
+    assert context["current_slides"] == [1, 2]
+    assert context["total_slides"] == 4
+    assert [b["slide_index"] for b in context["context_blocks"]] == [0, 0, 1, 1, 2, 3]
+
+
+def test_title_only_and_deck_use_precomputed_tables():
+    blocks = _blocks()
+    index = DocumentContextIndex(blocks)
+
+    titles = build_context("title-only", blocks, [blocks[2]], index=index)
+    deck = build_context("deck", blocks, [blocks[5]], index=index)
+
+    assert titles["context_blocks"] == [blocks[3]]
+    assert deck["context_blocks"] == blocks[:4]
+    assert build_context("none", blocks, [blocks[0]], index=index) is None
+
+
+def test_token_budget_trims_context_blocks():
+    blocks = _blocks()
+    index = DocumentContextIndex(blocks, token_budget=10)
+
+    context = index.build("neighbor", [blocks[5]])
+
+    assert context["context_blocks"] == [blocks[4]]
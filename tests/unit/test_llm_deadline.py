@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.config import settings
+from backend.services import translate_chunk, translate_chunk_cache
+from backend.services.llm_deadline import Deadline, LatencyTracker, hedged
+from backend.services.llm_limiter import AdaptiveLimiter
+from backend.services.llm_scheduler import FairScheduler
+from backend.services.translate_llm_helpers_impl import async_tasks
+
+
+def test_deadline_caps_attempt_timeout():
+    assert Deadline().timeout(180) == 180
+    assert Deadline.after(0).at is None
+    deadline = Deadline.after(5)
+    assert 4 < deadline.timeout(180) <= 5
+    assert Deadline(time.monotonic() - 1).expired
+
+
+def test_hedge_delay_needs_samples(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 5)
+    monkeypatch.setattr(settings, "llm_hedge_percentile", 0.95)
+    tracker = LatencyTracker("test")
+    for value in (1.0, 2.0, 3.0, 4.0):
+        tracker.record(value)
+    assert tracker.hedge_delay() is None
+    for value in range(5, 21):
+        tracker.record(float(value))
+    assert tracker.hedge_delay() == 19.0
+
+
+def test_slow_primary_loses_to_hedge():
+    cancelled = []
+    tracker = LatencyTracker("test")
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "primary"
+
+    async def fast():
+        return "hedge"
+
+    async def run():
+        result = await hedged(slow, fast, delay=0.01, tracker=tracker)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == ("hedge", True)
+    assert cancelled == [True]
+    assert tracker.stats()["hedge_wins"] == 1
+
+
+def test_failed_primary_falls_back_to_hedge():
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("HTTP 500")
+
+    async def hedge():
+        await asyncio.sleep(0.05)
+        return "hedge"
+
+    assert asyncio.run(hedged(failing, hedge, delay=0.01)) == ("hedge", True)
+    with pytest.raises(ValueError):
+        asyncio.run(hedged(failing, None, delay=None))
+
+
+def _run_chunk(monkeypatch, attempts, requeues):
+    calls = []
+    events = []
+
+    async def fake_translate(*args, deadline=None, **kwargs):
+        calls.append(len(calls))
+        await translate_chunk._within_deadline(asyncio.sleep(attempts.pop(0)), deadline)
+        return {"blocks": [{"translated_text": "done"}]}
+
+    def fake_apply(chunk, maps, result, translated_texts, *args, **kwargs):
+        translated_texts[0] = result["blocks"][0]["translated_text"]
+
+    monkeypatch.setattr(async_tasks, "translate_chunk_async", fake_translate)
+    monkeypatch.setattr(async_tasks, "apply_translation_results", fake_apply)
+    monkeypatch.setattr(settings, "llm_request_timeout", 0.05)
+    monkeypatch.setattr(settings, "llm_chunk_requeues", requeues)
+    monkeypatch.setattr(settings, "llm_stream_responses", False)
+
+    chunk = [(0, {"client_id": "b0", "source_text": "Hello"})]
+    translated_texts = [None]
+
+    async def run():
+        await async_tasks.process_chunk_async(
+            None, "openai", chunk, [dict(chunk[0][1])], [{}], "zh-TW", None, [], [],
+            None, True, {"chunk_delay": 0, "model": "m"}, 1, False, "direct",
+            translated_texts, {}, None, False,
+            on_progress=events.append,
+            blocks_list=[chunk[0][1]],
+            scheduler=FairScheduler("test", 1),
+        )
+
+    return run, calls, events, translated_texts
+
+
+def test_timed_out_chunk_is_requeued(monkeypatch):
+    run, calls, events, translated_texts = _run_chunk(monkeypatch, [1.0, 0.0], requeues=1)
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert translated_texts == ["done"]
+    assert events[-1]["completed_ids"] == ["b0"]
+
+
+def test_chunk_reports_failed_ids_when_requeues_are_spent(monkeypatch):
+    run, calls, events, translated_texts = _run_chunk(monkeypatch, [1.0], requeues=0)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+    assert translated_texts == [None]
+    assert events[-1]["failed_ids"] == ["b0"]
+
+
+def test_request_timeout_starts_once_the_limiter_slot_is_held(monkeypatch):
+    limiter = AdaptiveLimiter("test", initial=1, max_limit=1, adaptive=False)
+    calls = []
+
+    async def dispatch(translator, provider, blocks, *args, **kwargs):
+        calls.append(len(blocks))
+        await asyncio.sleep(0.02)
+        return {"blocks": [{**b, "translated_text": "完成"} for b in blocks]}
+
+    class NoCache:
+        def set_many(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(settings, "llm_request_timeout", 0.05)
+    monkeypatch.setattr(translate_chunk, "get_limiter", lambda *args: limiter)
+    monkeypatch.setattr(translate_chunk, "dispatch_translate_async", dispatch)
+    monkeypatch.setattr(translate_chunk, "has_language_mismatch", lambda *args: False)
+    monkeypatch.setattr(translate_chunk_cache, "cache", NoCache())
+    params = {"model": "m", "refresh": True, "coalesce": False, "max_retries": 0}
+
+    async def hold_slot():
+        async with limiter.slot_async():
+            await asyncio.sleep(0.15)
+
+    async def run():
+        holder = asyncio.create_task(hold_slot())
+        await asyncio.sleep(0)
+        result = await translate_chunk.translate_chunk_async(
+            None, "openai", [{"source_text": "Hello"}], "zh-TW", None, [], [],
+            None, True, params, 1, False, "direct", deadline=Deadline(),
+        )
+        await holder
+        return result
+
+    # Queued three timeouts' worth behind another call, yet not timed out.
+    result = asyncio.run(run())
+    assert calls == [1]
+    assert result["blocks"][0]["translated_text"] == "完成"
@@ -0,0 +1,37 @@
+import asyncio
+
+from backend.services import llm_http
+
+
+def test_sync_clients_are_shared_per_provider_and_base_url():
+    first = llm_http.get_client("openai", "https://api.example.com/v1/")
+    try:
+        assert llm_http.get_client("OpenAI", "https://api.example.com/v1") is first
+        assert llm_http.get_client("gemini", "https://api.example.com/v1") is not first
+    finally:
+        llm_http.close_all()
+
+    assert first.is_closed
+    assert llm_http.get_client("openai", "https://api.example.com/v1") is not first
+    llm_http.close_all()
+
+
+def test_async_clients_are_shared_within_a_loop_and_closed_with_it():
+    async def _run():
+        first = llm_http.get_async_client("ollama", "http://localhost:11434")
+        second = llm_http.get_async_client("ollama", "http://localhost:11434/")
+        await llm_http.aclose_all()
+        return first, second
+
+    first, second = asyncio.run(_run())
+
+    assert first is second
+    assert first.is_closed
+
+
+def test_http2_only_for_tls_providers(monkeypatch):
+    monkeypatch.setattr(llm_http, "_HTTP2_AVAILABLE", True)
+
+    assert llm_http.use_http2("openai", "https://api.openai.com/v1")
+    assert not llm_http.use_http2("ollama", "https://ollama.example.com")
+    assert not llm_http.use_http2("openai", "http://localhost:8000/v1")
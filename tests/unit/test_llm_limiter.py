@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.services.llm_limiter import AdaptiveLimiter, failure_signal
+
+
+def _status_error(status: int, retry_after: str | None = None) -> ValueError:
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    request = httpx.Request("POST", "https://llm.example.com/chat")
+    response = httpx.Response(status, headers=headers, request=request)
+    try:
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            raise ValueError(f"API 錯誤 ({status})") from exc
+    except ValueError as wrapped:
+        return wrapped
+
+
+def test_failure_signal_reads_wrapped_status_and_retry_after():
+    assert failure_signal(_status_error(429, "3")) == (True, 3.0)
+    assert failure_signal(_status_error(503)) == (True, None)
+    assert failure_signal(_status_error(400, "3")) == (False, None)
+    assert failure_signal(httpx.ReadTimeout("slow")) == (True, None)
+    assert failure_signal(ValueError("bad json")) == (False, None)
+
+
+def test_limit_grows_on_healthy_calls_and_halves_on_overload():
+    limiter = AdaptiveLimiter("test", initial=2, max_limit=8)
+    for _ in range(10):
+        slots = int(limiter.limit)
+        for _ in range(slots):
+            limiter.acquire()
+        for _ in range(slots):
+            limiter.release(duration=1.0, cost=1)
+    grown = limiter.limit
+    assert grown > 4
+
+    limiter.acquire()
+    limiter.release(exc=_status_error(429))
+    assert limiter.limit == pytest.approx(grown / 2)
+
+    # A second failure from the same round does not halve again.
+    limiter.acquire()
+    limiter.release(exc=_status_error(500))
+    assert limiter.limit == pytest.approx(grown / 2)
+
+
+def test_idle_limit_does_not_grow():
+    limiter = AdaptiveLimiter("idle", initial=4, max_limit=8)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(duration=1.0)
+    assert limiter.limit == 4
+
+
+def test_fixed_limiter_never_changes():
+    limiter = AdaptiveLimiter("fixed", initial=3, max_limit=3, adaptive=False)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(duration=0.1)
+    limiter.acquire()
+    limiter.release(exc=_status_error(429))
+    assert limiter.limit == 3
+
+
+def test_async_slots_respect_the_shared_limit():
+    limiter = AdaptiveLimiter("async", initial=2, max_limit=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot_async():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.stats()["successes"] == 6
+
+
+def test_retry_after_pauses_new_calls():
+    limiter = AdaptiveLimiter("pause", initial=2, max_limit=2)
+    limiter.acquire()
+    limiter.release(exc=_status_error(429, "0.2"))
+
+    started = time.monotonic()
+    with limiter.slot():
+        pass
+
+    assert time.monotonic() - started >= 0.15
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from backend.services import llm_prompt
+from backend.services.llm_contract import expand_compact_contract
+from backend.services.llm_prompt import build_prompt
+from backend.services.term_matcher import TermMatcher
+from backend.services.token_tracker import get_compaction_stats
+
+BLOCKS = [
+    {
+        "slide_index": 2,
+        "shape_id": 7,
+        "block_type": "textbox",
+        "source_text": "Revenue grew",
+        "client_id": "b-1",
+        "x": 10,
+        "width": 300,
+    },
+    {"slide_index": 2, "shape_id": 8, "block_type": "textbox", "source_text": "Outlook"},
+]
+TERMS = [("Revenue", "營收"), ("Cost", "成本")]
+
+
+def _payload(prompt: str) -> dict:
+    return json.loads(prompt[prompt.index('{"target_language"'):])
+
+
+@pytest.mark.parametrize("terms", [TERMS, TermMatcher(TERMS)])
+def test_compact_prompt_sends_ids_texts_and_matching_terms(terms):
+    before = get_compaction_stats()["prompts"]
+    context = {
+        "strategy": "neighbor",
+        "context_blocks": [BLOCKS[0], {"source_text": "Q3"}, {"source_text": "Q3"}],
+        "current_slides": [2],
+        "total_slides": 4,
+    }
+
+    payload = _payload(build_prompt(BLOCKS, "zh-TW", {}, context, terms, compact=True))
+
+    assert payload["blocks"] == [{"id": 0, "text": "Revenue grew"}, {"id": 1, "text": "Outlook"}]
+    assert payload["preferred_terms"] == [{"source": "Revenue", "target": "營收"}]
+    assert payload["context"]["context_blocks"] == ["Q3"]
+    stats = get_compaction_stats()
+    assert stats["prompts"] == before + 1
+    assert stats["tokens_saved"] > 0
+
+
+def test_legacy_prompt_keeps_full_blocks():
+    payload = _payload(build_prompt(BLOCKS, "zh-TW", {}, None, TERMS, compact=False))
+
+    assert payload["blocks"] == BLOCKS
+    assert len(payload["preferred_terms"]) == 2
+
+
+def test_expand_compact_contract_maps_ids_back_to_blocks():
+    result = {
+        "blocks": [
+            {"id": 1, "translated_text": "展望"},
+            {"id": 0, "translated_text": "營收成長"},
+        ]
+    }
+
+    expanded = expand_compact_contract(result, BLOCKS, "zh-TW")
+
+    assert [b["translated_text"] for b in expanded["blocks"]] == ["營收成長", "展望"]
+    assert expanded["blocks"][0]["client_id"] == "b-1"
+    assert expanded["blocks"][1]["shape_id"] == 8
+
+
+def test_expand_compact_contract_rejects_missing_ids():
+    with pytest.raises(ValueError):
+        expand_compact_contract({"blocks": [{"id": 0, "translated_text": "x"}]}, BLOCKS, "zh-TW")
+
+
+
+def test_legacy_size_matches_legacy_json_and_glossary_is_measured_once(monkeypatch):
+    glossary = TermMatcher(TERMS)
+    context = {"context_blocks": [{"source_text": "Cost"}]}
+    args = (BLOCKS, "zh-TW", {"blocks": []}, context, glossary, ["⟦T0⟧"], "direct")
+
+    legacy = json.dumps(llm_prompt._legacy_payload(*args), ensure_ascii=False)
+    assert llm_prompt._legacy_payload_chars(*args) == len(legacy)
+
+    # Later chunks of the job reuse the glossary size instead of serializing it.
+    serialized = []
+    dumps = json.dumps
+    monkeypatch.setattr(
+        llm_prompt.json, "dumps", lambda obj, **kw: serialized.append(obj) or dumps(obj, **kw)
+    )
+    llm_prompt._legacy_payload_chars(*args)
+    assert all("preferred_terms" not in obj for obj in serialized if isinstance(obj, dict))
+    assert not any(isinstance(obj, list) for obj in serialized)
@@ -0,0 +1,77 @@
+import asyncio
+
+from backend.services.llm_limiter import AdaptiveLimiter
+from backend.services.llm_scheduler import FairScheduler
+
+
+def test_small_job_is_not_starved_by_a_large_one():
+    scheduler = FairScheduler("test", max_in_flight=1, quantum=10)
+    order = []
+
+    async def chunk(flow_id, index):
+        async with scheduler.slot(flow_id, cost=10):
+            order.append((flow_id, index))
+            await asyncio.sleep(0)
+
+    async def run():
+        big = [asyncio.create_task(chunk("big", i)) for i in range(6)]
+        await asyncio.sleep(0)
+        small = [asyncio.create_task(chunk("small", i)) for i in range(2)]
+        await asyncio.gather(*big, *small)
+
+    asyncio.run(run())
+
+    small_positions = [pos for pos, (flow, _) in enumerate(order) if flow == "small"]
+    assert small_positions[-1] <= 4
+    assert [i for flow, i in order if flow == "big"] == list(range(6))
+
+
+def test_in_flight_cap_and_stats():
+    scheduler = FairScheduler("cap", max_in_flight=2, quantum=5)
+    peak = 0
+
+    async def chunk(flow_id):
+        nonlocal peak
+        async with scheduler.slot(flow_id, cost=3):
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(chunk(f"job-{i % 3}") for i in range(9)))
+
+    asyncio.run(run())
+
+    stats = scheduler.stats()
+    assert peak == 2
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["dispatched"] == 9
+    assert stats["max_wait"] > 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = FairScheduler("cancel", max_in_flight=1)
+
+    async def run():
+        await scheduler.acquire("a")
+        waiter = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        scheduler.release()
+
+    asyncio.run(run())
+
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_cap_follows_the_limiter():
+    limiter = AdaptiveLimiter("m", initial=2, max_limit=8)
+    scheduler = FairScheduler("m", limiter=limiter)
+    assert scheduler.max_in_flight == 2
+
+    limiter.limit = 5.7
+    assert scheduler.max_in_flight == 5
+    assert scheduler.stats()["max_in_flight"] == 5
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services import translate_chunk_cache
+from backend.services.llm_singleflight import CoalescedRequestError, SingleFlight, flight_key
+
+
+class FakeCache:
+    def __init__(self):
+        self.writes = []
+
+    def set_many(self, entries, *args, **kwargs):
+        self.writes.append(list(entries))
+
+
+def test_flight_key_normalizes_texts_only():
+    base = flight_key([" Hello "], "zh-TW", "openai", "gpt-4o-mini")
+    assert base == flight_key(["Hello"], "zh-TW", "openai", "gpt-4o-mini")
+    assert base != flight_key(["Hello"], "ja", "openai", "gpt-4o-mini")
+    assert base != flight_key(["Hello"], "zh-TW", "openai", "gpt-4o-mini", tone="formal")
+    assert base != flight_key(["Hello"], "zh-TW", "openai", "gpt-4o-mini", vision_context=False)
+
+
+def test_identical_chunks_share_one_request(monkeypatch):
+    fake_cache = FakeCache()
+    monkeypatch.setattr(translate_chunk_cache, "cache", fake_cache)
+    calls = []
+
+    async def dispatch(translator, provider, blocks, *args, **kwargs):
+        calls.append([b["source_text"] for b in blocks])
+        await asyncio.sleep(0.02)
+        return {"blocks": [{**b, "translated_text": f"T:{b['source_text']}"} for b in blocks]}
+
+    async def translate(client_prefix):
+        blocks = [
+            {"client_id": f"{client_prefix}-{i}", "source_text": text}
+            for i, text in enumerate(["Hello", "World"])
+        ]
+        return await translate_chunk_cache.translate_and_cache_blocks_async(
+            None, "openai", blocks, [0, 1], [None, None], "zh-TW",
+            None, [], [], None, True, {"model": "gpt-4o-mini"}, dispatch,
+        )
+
+    async def run():
+        return await asyncio.gather(translate("a"), translate("b"))
+
+    first, second = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert len(fake_cache.writes) == 1
+    assert [b["translated_text"] for b in second["blocks"]] == ["T:Hello", "T:World"]
+    # Followers keep their own block metadata.
+    assert [b["client_id"] for b in first["blocks"]] == ["a-0", "a-1"]
+    assert [b["client_id"] for b in second["blocks"]] == ["b-0", "b-1"]
+
+
+def test_leader_failure_reaches_followers_and_clears_key():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("HTTP 503")
+
+    async def ok():
+        return "done"
+
+    async def run():
+        results = await asyncio.gather(
+            flights.do_async("k", failing),
+            flights.do_async("k", failing),
+            return_exceptions=True,
+        )
+        return results, await flights.do_async("k", ok)
+
+    (leader_exc, follower_exc), retry = asyncio.run(run())
+
+    assert isinstance(leader_exc, ValueError)
+    assert isinstance(follower_exc, CoalescedRequestError)
+    assert follower_exc.__cause__ is leader_exc
+    assert retry == ("done", True)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_sync_thread_follows_async_leader():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    async def leader():
+        started.set()
+        await asyncio.to_thread(release.wait)
+        return 42
+
+    thread = threading.Thread(target=lambda: asyncio.run(flights.do_async("k", leader)))
+    thread.start()
+    started.wait()
+
+    follower = threading.Thread(target=lambda: results.append(flights.do("k", lambda: 0)))
+    follower.start()
+    while flights.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+    release.set()
+    thread.join()
+    follower.join()
+
+    assert results == [(42, False)]
+    with pytest.raises(ValueError):
+        flights.do("x", lambda: (_ for _ in ()).throw(ValueError("boom")))
@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import httpx
+
+from backend.services import llm_client_openai
+from backend.services.llm_client_base import TranslationConfig
+from backend.services.llm_client_ollama import OllamaTranslator
+from backend.services.llm_client_openai import OpenAITranslator
+from backend.services.llm_stream import (
+    BatchBlockStreamParser,
+    JsonBlockStreamParser,
+    block_delta_handler,
+)
+from backend.services.translate_chunk_dispatch import dispatch_translate_async
+
+
+def _pieces(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _feed_all(parser, text):
+    found = []
+    for piece in _pieces(text):
+        found.extend(parser.feed(piece))
+    return found
+
+
+def test_batch_parser_emits_blocks_as_they_close():
+    parser = BatchBlockStreamParser(2)
+    text = "<<<BLOCK:0>>>\n你好\n<<<END>>>\n\n<<<BLOCK:1>>>\n世界\n<<<END>>>"
+
+    split = text.index("<<<END>>>") + len("<<<END>>>")
+
+    assert parser.feed(text[: split - 1]) == []
+    assert parser.feed(text[split - 1 : split + 10]) == [(0, "你好")]
+    assert parser.feed(text[split + 10 :]) == [(1, "世界")]
+
+
+def test_json_parser_handles_compact_and_full_items():
+    compact = (
+        '{"blocks": [{"id": 1, "translated_text": "b {x}"}, '
+        '{"id": 0, "translated_text": "a\\"q"}]}'
+    )
+    full = (
+        '```json\n{"blocks":[{"slide_index":0,"translated_text":"one"},'
+        '{"translated_text":"two"}]}'
+    )
+
+    assert _feed_all(JsonBlockStreamParser(2), compact) == [(1, "b {x}"), (0, 'a"q')]
+    assert _feed_all(JsonBlockStreamParser(2), full) == [(0, "one"), (1, "two")]
+
+
+def _blocks(count):
+    return [
+        {
+            "slide_index": 0,
+            "shape_id": i,
+            "block_type": "textbox",
+            "source_text": f"text {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_ollama_batch_stream_reports_blocks_before_completion():
+    lines = [
+        {"response": "<<<BLOCK:0>>>\n第一\n<<<END>>>\n"},
+        {"response": "<<<BLOCK:1>>>\n第二\n<<<END>>>"},
+        {"response": "", "done": True, "prompt_eval_count": 5, "eval_count": 7},
+    ]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        body = "\n".join(json.dumps(line) for line in lines)
+        return httpx.Response(200, text=body)
+
+    async def run():
+        translator = OllamaTranslator("test-model", "http://ollama.test")
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        translator.set_async_client(client)
+        seen = []
+        result = await dispatch_translate_async(
+            translator,
+            "ollama",
+            _blocks(2),
+            "zh-TW",
+            None,
+            [],
+            [],
+            None,
+            True,
+            on_block=lambda idx, text: seen.append((idx, text)),
+        )
+        await client.aclose()
+        return seen, result
+
+    seen, result = asyncio.run(run())
+
+    assert seen == [(0, "第一"), (1, "第二")]
+    assert [b["translated_text"] for b in result["blocks"]] == ["第一", "第二"]
+
+
+def test_openai_sse_stream_feeds_deltas(monkeypatch):
+    content = json.dumps({"blocks": [{"id": 0, "translated_text": "Xin chào"}]})
+    events = [
+        {"choices": [{"delta": {"content": piece}}]} for piece in _pieces(content, 7)
+    ] + [{"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 4}}]
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+        return httpx.Response(200, text=body + "data: [DONE]\n\n")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_client_openai, "get_async_client", lambda *args: client)
+    monkeypatch.setattr(llm_client_openai, "record_usage", lambda **kwargs: None)
+
+    async def run():
+        translator = OpenAITranslator(
+            TranslationConfig(model="gpt-4o-mini", api_key="k", base_url="http://openai.test")
+        )
+        seen = []
+        on_delta = block_delta_handler(
+            JsonBlockStreamParser(1), lambda idx, text: seen.append((idx, text))
+        )
+        result = await translator.translate_async(_blocks(1), "vi", on_delta=on_delta)
+        await client.aclose()
+        return seen, result
+
+    seen, result = asyncio.run(run())
+
+    assert seen == [(0, "Xin chào")]
+    assert result["blocks"][0]["translated_text"] == "Xin chào"
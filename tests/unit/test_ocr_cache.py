@@ -0,0 +1,109 @@
+import threading
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from backend.services import image_ocr
+from backend.services.ocr_cache import ocr_cache
+from backend.services.pptx import extract as pptx_extract
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr_cache, "db_path", tmp_path / "cache.db")
+    monkeypatch.setattr(ocr_cache, "_local", threading.local())
+    monkeypatch.setenv("IMAGE_OCR_CACHE", "1")
+    # The test images are blank, which the text-presence gate would skip.
+    monkeypatch.setenv("IMAGE_OCR_GATE", "0")
+    ocr_cache._init_db()
+    return ocr_cache
+
+
+def _png(color="white", size=(120, 40)):
+    buf = BytesIO()
+    Image.new("RGB", size, color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_identical_images_are_ocrd_once(cache, monkeypatch):
+    calls = []
+
+    def fake_ocr(image, lang, cfg, engine=None):
+        calls.append(lang)
+        line = {"text": "Quarterly revenue", "left": 1, "top": 2, "right": 90, "bottom": 20}
+        return [{**line, "engine": engine}], engine
+
+    monkeypatch.setattr(image_ocr, "_ocr_pil_image", fake_ocr)
+    monkeypatch.setattr(image_ocr, "_resolve_engine", lambda cfg: "tesseract")
+    monkeypatch.setenv("IMAGE_OCR_LANG", "eng")
+    first = image_ocr.extract_image_text_blocks(_png(), 0, 1, "/ppt/media/image1.png")
+    again = image_ocr.extract_image_text_blocks(_png(), 3, 7, "/ppt/media/image2.png")
+    image_ocr.extract_image_text_blocks(_png(), 0, 1, "x.png", ocr_lang="chi_tra")
+    image_ocr.extract_image_text_blocks_from_pil(Image.open(BytesIO(_png())), 0, 60, 20)
+    image_ocr.extract_image_text_blocks_from_pil(Image.open(BytesIO(_png())), 1, 60, 20)
+
+    # Same bytes hit the cache; a new language or a decoded PIL image are new keys.
+    assert calls == ["eng", "chi_tra", "eng"]
+    assert [b["source_text"] for b in again] == [b["source_text"] for b in first]
+    assert again[0]["shape_id"] == 7 and again[0]["image_part"] == "ppt/media/image2.png"
+    assert cache.stats()["rows"] == 3
+
+
+def test_eviction_drops_least_recently_used(cache, monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_CACHE_MAX_MB", "1")
+    line = [{"text": "x" * 200_000}]
+    for name in ("a", "b", "c", "d", "e", "f"):
+        cache.set(name, line, "tesseract", "eng")
+    cache.get("a")
+
+    assert cache.evict() > 0
+    stats = cache.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert cache.get("a") is not None and cache.get("b") is None
+
+
+def test_disabled_cache_is_bypassed(cache, monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_CACHE", "0")
+    cache.set("k", [{"text": "hi"}], "tesseract", "eng")
+    monkeypatch.setenv("IMAGE_OCR_CACHE", "1")
+    assert cache.get("k") is None
+
+
+def test_pptx_media_scan_skips_pictures_already_ocrd(tmp_path, monkeypatch):
+    path = tmp_path / "deck.pptx"
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_picture(BytesIO(_png("white")), Inches(1), Inches(1))
+    prs.save(path)
+    seen = []
+
+    def fake_run(jobs):
+        seen.extend(job["image_part"] for job in jobs)
+        return [[] for _ in jobs]
+
+    monkeypatch.setattr(pptx_extract, "run_ocr_jobs", fake_run)
+    pptx_extract.extract_blocks(str(path))
+
+    assert seen == ["/ppt/media/image1.png"]
+
+
+def test_fallback_results_are_not_cached(cache, monkeypatch):
+    calls = []
+
+    def failing_paddle(image, lang):
+        calls.append(lang)
+        raise RuntimeError("paddle crashed")
+
+    monkeypatch.setattr(image_ocr, "_resolve_engine", lambda cfg: "paddle")
+    monkeypatch.setattr(image_ocr, "paddle_ocr_image", failing_paddle)
+    monkeypatch.setattr(image_ocr, "enhance_image_for_ocr", lambda image: image)
+    monkeypatch.setattr(image_ocr.pytesseract, "image_to_data", lambda *a, **k: {"text": []})
+    for _ in range(2):
+        assert image_ocr.extract_image_text_blocks(_png(), 0, 1, "p.png", ocr_lang="eng") == []
+
+    # The empty Tesseract fallback was not stored under the paddle key.
+    assert calls == ["eng", "eng"]
+    assert cache.stats()["rows"] == 0
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from backend.services import image_ocr, ocr_gate
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats(monkeypatch):
+    for name in ("IMAGE_OCR_GATE", "IMAGE_OCR_GATE_MIN_ENTROPY", "IMAGE_OCR_GATE_EDGE_THRESHOLD"):
+        monkeypatch.delenv(name, raising=False)
+    ocr_gate.reset_gate_stats()
+
+
+def _text_image(size=(1920, 1080)):
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).text((10, max(0, size[1] // 2 - 6)), "Quarterly revenue", fill="black")
+    return image
+
+
+def test_text_passes_and_textless_images_are_skipped():
+    gradient = Image.fromarray(np.tile(np.linspace(0, 255, 800, dtype=np.uint8), (600, 1)))
+    noise = (np.random.default_rng(0).random((600, 800)) * 255).astype(np.uint8)
+    blurred = Image.fromarray(noise).filter(ImageFilter.GaussianBlur(8))
+
+    assert ocr_gate.should_ocr(_text_image())
+    assert ocr_gate.should_ocr(_text_image((300, 40)))
+    assert not ocr_gate.should_ocr(Image.new("RGB", (800, 600), "white"))
+    assert not ocr_gate.should_ocr(gradient)
+    assert not ocr_gate.should_ocr(blurred)
+    assert not ocr_gate.should_ocr(_text_image((400, 8)))
+
+    stats = ocr_gate.ocr_gate_stats()
+    assert (stats["checked"], stats["skipped"]) == (6, 4)
+
+
+def test_threshold_and_switch(monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_GATE_EDGE_THRESHOLD", "0.9")
+    assert not ocr_gate.should_ocr(_text_image())
+    monkeypatch.setenv("IMAGE_OCR_GATE", "0")
+    assert ocr_gate.should_ocr(Image.new("RGB", (800, 600), "white"))
+
+
+def test_skipped_images_never_reach_ocr(monkeypatch):
+    calls = []
+
+    def fake_ocr(image, lang, cfg, engine=None):
+        calls.append(image.size)
+        return [], engine
+
+    monkeypatch.setenv("IMAGE_OCR_CACHE", "0")
+    monkeypatch.setattr(image_ocr, "_ocr_pil_image", fake_ocr)
+    monkeypatch.setattr(image_ocr, "_resolve_engine", lambda cfg: "tesseract")
+    image_ocr.extract_image_text_blocks_from_pil(Image.new("RGB", (800, 600), "white"), 0, 80, 60)
+    image_ocr.extract_image_text_blocks_from_pil(_text_image(), 0, 192, 108)
+
+    assert calls == [(1920, 1080)]
+    stats = ocr_gate.ocr_gate_stats()
+    assert stats["skipped"] == 1 and stats["ocr_images"] == 1
+    assert stats["skipped_megapixels"] == pytest.approx(0.48)
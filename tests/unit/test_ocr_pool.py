@@ -0,0 +1,116 @@
+import pytest
+
+from backend.services import ocr_pool
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    ocr_pool.reset_ocr_pool()
+    yield
+    ocr_pool.reset_ocr_pool(wait_for_jobs=True)
+
+
+def _jobs(count):
+    return [
+        {
+            "image_bytes": b"not an image",
+            "slide_index": -1,
+            "shape_id": f"img-{i}",
+            "image_part": f"p{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_in_process_results_keep_job_order(monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_WORKERS", "0")
+
+    def fake_ocr(image_bytes, shape_id, **kwargs):
+        if shape_id == "img-1":
+            raise RuntimeError("bad image")
+        return [{"shape_id": shape_id}]
+
+    monkeypatch.setattr(ocr_pool, "extract_image_text_blocks", fake_ocr)
+    results = ocr_pool.run_ocr_jobs(_jobs(3))
+
+    assert results == [[{"shape_id": "img-0"}], [], [{"shape_id": "img-2"}]]
+    assert ocr_pool.ocr_pool_stats()["running"] is False
+
+
+def test_config(monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_WORKERS", "3")
+    monkeypatch.setenv("IMAGE_OCR_MAX_PER_DOCUMENT", "0")
+    monkeypatch.delenv("IMAGE_OCR_QUEUE_SIZE", raising=False)
+    assert ocr_pool.get_ocr_pool_config() == {"workers": 3, "per_document": 1, "queue_size": 12}
+
+    monkeypatch.setenv("IMAGE_OCR_WORKERS", "auto")
+    assert 1 <= ocr_pool.get_ocr_pool_config()["workers"] <= 4
+
+
+def test_pooled_jobs_run_in_workers(monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_WORKERS", "2")
+    results = ocr_pool.run_ocr_jobs(_jobs(3))
+
+    # Undecodable images yield no blocks rather than failing the document.
+    assert results == [[], [], []]
+    assert ocr_pool.ocr_pool_stats()["running"] is True
+
+
+def test_broken_pool_finishes_in_process(monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_WORKERS", "2")
+
+    def broken_pool(config):
+        raise ocr_pool.BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(ocr_pool, "_get_pool", broken_pool)
+    monkeypatch.setattr(
+        ocr_pool, "extract_image_text_blocks", lambda shape_id, **kwargs: [{"shape_id": shape_id}]
+    )
+    results = ocr_pool.run_ocr_jobs(_jobs(2))
+
+    assert results == [[{"shape_id": "img-0"}], [{"shape_id": "img-1"}]]
+
+
+def test_cancelled_jobs_finish_in_process(monkeypatch):
+    monkeypatch.setenv("IMAGE_OCR_WORKERS", "2")
+    shutdowns = []
+
+    class CancellingPool:
+        # Stands in for a pool another document reset with cancel_futures.
+        def submit(self, fn, *args):
+            future = ocr_pool.Future()
+            future.cancel()
+            return future
+
+        def shutdown(self, **kwargs):
+            shutdowns.append(kwargs)
+
+    monkeypatch.setattr(
+        ocr_pool, "_get_pool", lambda config: (CancellingPool(), ocr_pool.threading.Semaphore(4))
+    )
+    monkeypatch.setattr(
+        ocr_pool, "extract_image_text_blocks", lambda shape_id, **kwargs: [{"shape_id": shape_id}]
+    )
+    results = ocr_pool.run_ocr_jobs(_jobs(2))
+
+    assert results == [[{"shape_id": "img-0"}], [{"shape_id": "img-1"}]]
+    assert ocr_pool.ocr_pool_stats()["failed"] == 0 or results
+    # Not the shared pool, so it is not shut down from under other documents.
+    assert shutdowns == []
+
+
+def test_worker_counters_are_returned_and_merged(monkeypatch):
+    from backend.services.ocr_cache import ocr_cache
+
+    def fake_ocr(**job):
+        ocr_cache._bump("hits")
+        return [{"shape_id": job["shape_id"]}]
+
+    monkeypatch.setattr(ocr_pool, "extract_image_text_blocks", fake_ocr)
+    blocks, counters = ocr_pool._run_job(_jobs(1)[0], {})
+
+    assert blocks == [{"shape_id": "img-0"}]
+    assert counters["cache"]["hits"] == 1 and counters["cache"]["misses"] == 0
+    before = ocr_cache.counters()["hits"]
+    ocr_cache.merge_counters(counters["cache"])
+    assert ocr_cache.counters()["hits"] == before + 1
@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.config import settings
+from backend.services import ollama_manager
+from backend.services.llm_client_ollama import OllamaTranslator
+from backend.services.ollama_manager import OllamaManager, get_ollama_manager
+
+
+class FakeOllama:
+    """Minimal stand-in for an Ollama server's /api/generate."""
+
+    def __init__(self, delay=0.0):
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with lock:
+                    fake.requests.append(body)
+                    fake.active += 1
+                    fake.peak = max(fake.peak, fake.active)
+                time.sleep(delay)
+                with lock:
+                    fake.active -= 1
+                payload = json.dumps({"response": f"ok:{body['model']}", "done": True}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    fakes = [FakeOllama(delay=0.05), FakeOllama(delay=0.05)]
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    monkeypatch.setattr(settings, "ollama_endpoints", ",".join(f.url for f in fakes))
+    monkeypatch.setattr(settings, "ollama_model", "qwen2.5:7b")
+    monkeypatch.setattr(settings, "ollama_endpoint_max_in_flight", 2)
+    ollama_manager.reset_managers()
+    yield fakes
+    ollama_manager.reset_managers()
+    for fake in fakes:
+        fake.close()
+
+
+def test_requests_spread_over_endpoints_with_keep_alive(servers):
+    translator = OllamaTranslator(model="qwen2.5:7b", base_url=servers[0].url)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(translator.translate_plain, ["a", "b", "c", "d"]))
+
+    assert results == ["ok:qwen2.5:7b"] * 4
+    assert [len(fake.requests) for fake in servers] == [2, 2]
+    assert all(fake.peak <= 2 for fake in servers)
+    # The translation model is pinned.
+    assert {req["keep_alive"] for fake in servers for req in fake.requests} == {-1}
+
+    other = OllamaTranslator(model="llama3.1", base_url=servers[0].url)
+    other.translate_plain("glossary")
+    last = [fake.requests[-1] for fake in servers if fake.requests[-1]["model"] == "llama3.1"]
+    assert last[0]["keep_alive"] == "10m"
+
+
+def test_unreachable_endpoint_is_skipped(servers, monkeypatch):
+    dead = "http://127.0.0.1:9"
+    monkeypatch.setattr(settings, "ollama_endpoints", f"{dead},{servers[0].url}")
+    ollama_manager.reset_managers()
+    translator = OllamaTranslator(model="qwen2.5:7b", base_url=dead)
+
+    outcomes = []
+    for _ in range(3):
+        try:
+            outcomes.append(translator.translate_plain("x"))
+        except ValueError:
+            outcomes.append("error")
+
+    assert outcomes.count("ok:qwen2.5:7b") >= 2
+    endpoints = get_ollama_manager(dead).stats()["endpoints"]
+    assert endpoints[0]["healthy"] is False
+
+
+def test_models_are_batched_per_endpoint():
+    manager = OllamaManager(["http://one"], max_in_flight=4, exclusive=True, max_batch=2)
+    first = manager.acquire("translate")
+    second = manager.acquire("translate")
+    granted = []
+
+    def glossary():
+        endpoint = manager.acquire("glossary")
+        granted.append(endpoint.model)
+        manager.release(endpoint)
+
+    waiter = threading.Thread(target=glossary)
+    waiter.start()
+    time.sleep(0.05)
+    # Batch spent and another model waits: the endpoint stops admitting "translate".
+    assert manager._choose("translate") is None
+    assert granted == []
+
+    manager.release(first)
+    manager.release(second)
+    waiter.join(2)
+
+    assert granted == ["glossary"]
+    assert manager.stats()["endpoints"][0]["model_switches"] == 1
@@ -0,0 +1,77 @@
+import fitz
+
+from backend.services.pdf import parallel
+from backend.services.pdf.extract import extract_blocks
+
+
+def _text_pdf(path, pages=6):
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page(width=400, height=300)
+        page.insert_text((40, 60), f"Heading of page {page_no}", fontsize=14)
+        page.insert_text((40, 120), f"Body text on page {page_no}", fontsize=11)
+    doc.save(path)
+    doc.close()
+
+
+def test_parallel_extraction_matches_sequential(tmp_path, monkeypatch):
+    path = str(tmp_path / "doc.pdf")
+    _text_pdf(path)
+    monkeypatch.setenv("IMAGE_OCR_PDF", "0")
+    monkeypatch.setenv("PDF_EXTRACT_PARALLEL_MIN_PAGES", "2")
+
+    sequential = extract_blocks(path, workers=0)
+    sharded = extract_blocks(path, workers=2)
+
+    assert sharded == sequential
+    assert [b["source_text"] for b in sharded["blocks"]][:2] == [
+        "Heading of page 0",
+        "Body text on page 0",
+    ]
+
+
+def test_parallel_config(monkeypatch):
+    monkeypatch.setenv("PDF_EXTRACT_WORKERS", "auto")
+    monkeypatch.setenv("PDF_EXTRACT_PARALLEL_MIN_PAGES", "10")
+    config = parallel.get_parallel_config()
+    assert config["workers"] >= 1
+    assert not parallel.should_parallelize(9, 4)
+    assert parallel.should_parallelize(10, 4)
+    assert not parallel.should_parallelize(100, 1)
+
+
+def test_failed_pages_are_redone_in_process(tmp_path, monkeypatch):
+    path = str(tmp_path / "doc.pdf")
+    _text_pdf(path, pages=3)
+    monkeypatch.setenv("IMAGE_OCR_PDF", "0")
+
+    def broken_pool(**kwargs):
+        raise OSError("no processes")
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", broken_pool)
+    pages = parallel.extract_pages_parallel(path, 3, {"dpi": 72}, None, "en", 2)
+
+    assert [page[0]["source_text"] for page in pages] == [
+        "Heading of page 0",
+        "Heading of page 1",
+        "Heading of page 2",
+    ]
+
+
+def test_capped_pages_are_never_redone_in_process(tmp_path, monkeypatch):
+    path = str(tmp_path / "doc.pdf")
+    _text_pdf(path, pages=2)
+    monkeypatch.setenv("IMAGE_OCR_PDF", "0")
+    monkeypatch.setenv("PDF_EXTRACT_WORKER_MEMORY_MB", "512")
+
+    def broken_pool(**kwargs):
+        raise OSError("no processes")
+
+    def in_process(*args):
+        raise AssertionError("redone without the memory cap")
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", broken_pool)
+    monkeypatch.setattr(parallel, "_extract_in_process", in_process)
+    pages = parallel.extract_pages_parallel(path, 2, {"dpi": 72}, None, "en", 2)
+
+    assert pages == [[], []]
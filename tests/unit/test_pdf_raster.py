@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import fitz
+import numpy as np
+
+from backend.services.pdf import extract as pdf_extract
+from backend.services.pdf.raster import PageRasters
+
+
+def _image_only_pdf(path, pages=2):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=300, height=200)
+        page.draw_rect(fitz.Rect(20, 20, 120, 60), color=(0, 0, 0), fill=(0, 0, 0))
+    doc.save(path)
+    doc.close()
+
+
+def test_page_is_rendered_once_per_dpi(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    _image_only_pdf(path)
+    doc = fitz.open(path)
+    rasters = PageRasters(doc, path)
+
+    first = rasters.array(0, 144)
+    again = rasters.array(0, 144)
+    image = rasters.image(0, 144)
+
+    assert rasters.renders == 1
+    assert first.shape == (400, 600, 3)
+    assert np.shares_memory(first, again)
+    assert not first.flags.writeable
+    assert image.size == (600, 400) and rasters.image(0, 144) is image
+    # Filled rectangle is black, the background white.
+    assert first[80, 80].tolist() == [0, 0, 0] and first[300, 500].tolist() == [255, 255, 255]
+
+    rasters.array(0, 72)
+    assert rasters.renders == 2
+    doc.close()
+
+
+def test_extract_blocks_shares_one_render_per_page(tmp_path, monkeypatch):
+    path = str(tmp_path / "scan.pdf")
+    _image_only_pdf(path)
+    monkeypatch.setenv("IMAGE_OCR_PDF", "1")
+    seen = []
+    cfg = {"dpi": 72, "engine": "tesseract"}
+
+    def fake_image_ocr(image, page_index, **kwargs):
+        seen.append(("image", page_index, image.size))
+        return []
+
+    def fake_page_ocr(pdf_path, page_index, cfg, rasters=None):
+        seen.append(("fallback", page_index, rasters.array(page_index, cfg["dpi"]).shape))
+        return [{"source_text": f"page {page_index}", "slide_index": page_index}]
+
+    with (
+        patch.object(pdf_extract, "convert_from_path", side_effect=AssertionError("poppler")),
+        patch.object(pdf_extract, "extract_image_text_blocks_from_pil", fake_image_ocr),
+        patch.object(pdf_extract, "perform_ocr_on_page", fake_page_ocr),
+        patch.object(pdf_extract, "get_ocr_config", return_value=cfg),
+        patch.object(pdf_extract.PageRasters, "_render", autospec=True,
+                     side_effect=PageRasters._render) as render,
+    ):
+        result = pdf_extract.extract_blocks(path)
+
+    assert render.call_count == 2
+    assert [kind for kind, _, _ in seen] == ["image", "fallback", "image", "fallback"]
+    assert {text["source_text"] for text in result["blocks"]} == {"page 0", "page 1"}
@@ -0,0 +1,123 @@
+import json
+
+import httpx
+import pytest
+
+from backend.config import settings
+from backend.services import llm_client_gemini, llm_client_openai
+from backend.services.llm_client_base import TranslationConfig
+from backend.services.llm_client_gemini import GeminiTranslator
+from backend.services.llm_client_openai import OpenAITranslator
+from backend.services.llm_prompt import build_prompt, build_prompt_parts
+from backend.services.token_tracker import estimate_cost
+
+CHUNK_A = [{"client_id": "a", "source_text": "Hello"}]
+CHUNK_B = [{"client_id": "b", "source_text": "Quarterly revenue"}]
+
+
+def _reply(text="你好"):
+    return {
+        "candidates": [
+            {"content": {"parts": [{"text": json.dumps(
+                {"blocks": [{"id": 0, "translated_text": text}]}, ensure_ascii=False
+            )}]}}
+        ],
+        "usageMetadata": {
+            "promptTokenCount": 900,
+            "candidatesTokenCount": 10,
+            "cachedContentTokenCount": 800,
+        },
+    }
+
+
+@pytest.mark.parametrize("compact", [True, False])
+def test_prompt_prefix_is_shared_by_every_chunk(compact):
+    prefix_a, suffix_a = build_prompt_parts(CHUNK_A, "zh-TW", {}, None, compact=compact)
+    prefix_b, suffix_b = build_prompt_parts(CHUNK_B, "zh-TW", {}, None, compact=compact)
+
+    assert prefix_a == prefix_b
+    assert suffix_a != suffix_b
+    assert "contract_schema_example" in prefix_a
+    assert "Hello" in suffix_a and "Hello" not in prefix_a
+    assert prefix_a + suffix_a == build_prompt(CHUNK_A, "zh-TW", {}, None, compact=compact)
+    payload = json.loads((prefix_a + suffix_a)[(prefix_a + suffix_a).index('{"target_language"'):])
+    assert list(payload)[:3] == ["target_language", "mode", "contract_schema_example"]
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    requests = []
+    usage = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        if request.url.path.endswith("/cachedContents"):
+            return httpx.Response(200, json={"name": "cachedContents/abc"})
+        return httpx.Response(200, json=_reply())
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_client_gemini, "get_client", lambda *args: client)
+    monkeypatch.setattr(llm_client_gemini, "record_usage", lambda **kw: usage.append(kw))
+    monkeypatch.setattr(settings, "gemini_context_cache", True)
+    llm_client_gemini.reset_content_caches()
+    yield requests, usage
+    llm_client_gemini.reset_content_caches()
+
+
+def test_gemini_reuses_cached_prefix(gemini):
+    requests, usage = gemini
+    translator = GeminiTranslator("key", "https://gemini.test/v1beta", "gemini-1.5-flash")
+
+    first = translator.translate(CHUNK_A, "zh-TW")
+    translator.translate(CHUNK_B, "zh-TW")
+
+    paths = [path for path, _ in requests]
+    assert paths.count("/v1beta/cachedContents") == 1
+    cache_body = requests[0][1]
+    generate = [body for path, body in requests if path.endswith(":generateContent")]
+    assert all(body["cachedContent"] == "cachedContents/abc" for body in generate)
+    # Only the chunk's part of the prompt is sent with each request.
+    cached_text = cache_body["contents"][0]["parts"][0]["text"]
+    sent = generate[1]["contents"][0]["parts"][0]["text"]
+    assert "Quarterly revenue" in sent and "Quarterly revenue" not in cached_text
+    assert "contract_schema_example" not in sent
+    assert first["blocks"][0]["translated_text"] == "你好"
+    assert usage[0]["cached_tokens"] == 800
+
+
+def test_gemini_falls_back_when_prefix_cannot_be_cached(gemini, monkeypatch):
+    requests, _ = gemini
+
+    def handler(request):
+        requests.append((request.url.path, json.loads(request.content)))
+        if request.url.path.endswith("/cachedContents"):
+            return httpx.Response(400, json={"error": {"message": "too small"}})
+        return httpx.Response(200, json=_reply())
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_client_gemini, "get_client", lambda *args: client)
+    translator = GeminiTranslator("key", "https://gemini.test/v1beta", "gemini-1.5-flash")
+
+    translator.translate(CHUNK_A, "zh-TW")
+    translator.translate(CHUNK_B, "zh-TW")
+
+    paths = [path for path, _ in requests]
+    assert paths.count("/v1beta/cachedContents") == 1
+    generate = [body for path, body in requests if path.endswith(":generateContent")]
+    assert all("cachedContent" not in body for body in generate)
+    assert "contract_schema_example" in generate[1]["contents"][0]["parts"][0]["text"]
+
+
+def test_openai_records_cached_prompt_tokens(monkeypatch):
+    usage = []
+    monkeypatch.setattr(llm_client_openai, "record_usage", lambda **kw: usage.append(kw))
+    translator = OpenAITranslator(TranslationConfig(api_key="k", base_url="u", model="gpt-4o"))
+
+    translator._record_usage(
+        {"prompt_tokens": 2000, "completion_tokens": 50,
+         "prompt_tokens_details": {"cached_tokens": 1536}}
+    )
+
+    assert usage[0]["cached_tokens"] == 1536
+    assert estimate_cost("gpt-4o", 2000, 0, 2000) == estimate_cost("gpt-4o", 1000, 0)
@@ -0,0 +1,45 @@
+from backend.services.llm_glossary import apply_glossary
+from backend.services.llm_placeholders import apply_placeholders, restore_placeholders
+from backend.services.llm_utils import tm_respects_terms
+from backend.services.term_matcher import TermMatcher
+
+TERMS = [
+    ("AI", "人工智慧"),
+    ("Generative AI", "生成式人工智慧"),
+    ("he", "他"),
+    ("hers", "她的"),
+]
+
+
+def test_placeholders_prefer_longest_term_case_insensitively():
+    matcher = TermMatcher(TERMS)
+    text, mapping = apply_placeholders("generative ai and AI", matcher)
+
+    assert text == "__TERM_0__ and __TERM_2__"
+    assert mapping == {"__TERM_0__": "生成式人工智慧", "__TERM_2__": "人工智慧"}
+    assert restore_placeholders(text, mapping) == "生成式人工智慧 and 人工智慧"
+
+
+def test_overlapping_terms_longest_wins():
+    text, mapping = apply_placeholders("ushers", TERMS)
+
+    assert text == "us__TERM_1__"
+    assert mapping == {"__TERM_1__": "她的"}
+
+
+def test_restore_placeholders_leaves_unknown_tokens():
+    assert restore_placeholders("__TERM_1__ __TERM_10__", {"__TERM_1__": "x"}) == "x __TERM_10__"
+
+
+def test_glossary_is_case_sensitive_single_pass():
+    glossary = [("Hello", "World"), ("World", "世界")]
+
+    assert apply_glossary("Hello World hello", glossary) == "World 世界 hello"
+
+
+def test_tm_respects_terms_checks_every_target_for_a_source():
+    terms = [("AI", "人工智慧"), ("ai", "AI")]
+
+    assert tm_respects_terms("use AI", "使用 AI 人工智慧", terms)
+    assert not tm_respects_terms("use AI", "使用 人工智慧", terms)
+    assert tm_respects_terms("nothing here", "沒有", terms)
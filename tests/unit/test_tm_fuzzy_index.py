@@ -0,0 +1,49 @@
+import pytest
+
+from backend.services import tm_fuzzy_index
+from backend.services.tm_fuzzy_index import get_index, refresh_rows
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry():
+    tm_fuzzy_index.invalidate()
+    yield
+    tm_fuzzy_index.invalidate()
+
+
+def _row(entry_id, target, scope_id="a", source="quarterly revenue report"):
+    return {
+        "id": entry_id,
+        "source_text": source,
+        "target_text": target,
+        "scope_type": "project",
+        "scope_id": scope_id,
+        "hash": f"h{entry_id}",
+    }
+
+
+def test_overwritten_rows_are_refreshed_in_place():
+    index_a = get_index("en", "zh-TW", "project", "a", store="postgres")
+    index_b = get_index("en", "zh-TW", "project", "b", store="postgres")
+    index_a.add_rows([_row(1, "old"), _row(2, "other", source="annual budget")])
+
+    refresh_rows([_row(1, "new")], "en", "zh-TW", store="postgres")
+    assert index_a.exact("quarterly revenue report")["target_text"] == "new"
+    assert len(index_a) == 2 and index_a.high_water == 2
+
+    # A row whose scope changed moves to the partition it now belongs to.
+    index_b.add_rows([_row(5, "b-row", scope_id="b", source="headcount")])
+    refresh_rows([_row(1, "moved", scope_id="b")], "en", "zh-TW", store="postgres")
+    assert index_a.exact("quarterly revenue report") is None
+    assert index_b.exact("quarterly revenue report")["target_text"] == "moved"
+
+
+def test_unloaded_or_newer_rows_are_left_to_the_next_sync():
+    index = get_index("en", "ja", "project", "a", store="postgres")
+    index.add_rows([_row(3, "x")])
+
+    refresh_rows([_row(9, "later", source="new text")], "en", "ja", store="postgres")
+    refresh_rows([_row(1, "other pair")], "en", "ko", store="postgres")
+
+    assert index.high_water == 3 and index.exact("new text") is None
+    assert len(get_index("en", "ko", "project", "a", store="postgres")) == 0